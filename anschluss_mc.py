@@ -0,0 +1,64 @@
+"""Monte-Carlo-Risiko der Anschlussfinanzierung nach Ende der Zinsbindung.
+
+Der Zins folgt einem Vasicek-Prozess (Rückkehr zum langfristigen Mittel
+``theta``). Er wird jährlich mit der exakten Übergangsverteilung
+simuliert, also ohne Diskretisierungsfehler. Die Pfade laufen in Blöcken,
+deshalb hängt der Speicherbedarf nur von der Blockgröße ab. Für den Fächer über die Jahre
+werden feste Histogramme gesammelt (blockweise addierbar); die Anschlussrate
+am Ende der Zinsbindung bleibt pro Pfad erhalten (ein Float je Pfad).
+"""
+import numpy as np
+
+PERZENTILE = (5, 25, 50, 75, 95)
+# Feste Histogramm-Klassen für den Zinsfächer (in %)
+ZINS_KLASSEN = np.arange(0.0, 15.0 + 1e-9, 0.05)
+
+
+def _perzentile_aus_histogramm(counts, klassen, perzentile):
+    # counts: (jahre, klassen) -> (jahre, perzentile), Klassenmitte als Wert
+    kum = np.cumsum(counts, axis=1)
+    mitten = (klassen[:-1] + klassen[1:]) / 2
+    spalten = [np.argmax(kum >= p / 100 * kum[:, -1:], axis=1) for p in perzentile]
+    return mitten[np.stack(spalten, axis=1)]
+
+
+def simuliere(restschuld, zins, tilgung, zinsbindung_jahre, frei, frei_bank,
+              n_pfade=100_000, seed=42, theta=3.5, kappa=0.15, sigma=0.9, zins_min=0.0, block=25_000):
+    """Simuliert den Anschlusszins und die daraus folgende Monatsrate.
+
+    Die Anschlussrate ist ``Restschuld * (Anschlusszins + Tilgung) / 100 / 12``,
+    also dieselbe Formel wie im Finanzierungscheck mit neuem Zins.
+    """
+    rng = np.random.default_rng(seed)
+    jahre = max(int(zinsbindung_jahre), 1)
+    a = np.exp(-kappa)
+    schritt_sd = sigma * np.sqrt((1 - a * a) / (2 * kappa)) if kappa > 0 else sigma
+
+    zins_hist = np.zeros((jahre, len(ZINS_KLASSEN) - 1), dtype=np.int64)
+    anschluss_zins = np.empty(n_pfade)
+
+    for start in range(0, n_pfade, block):
+        n = min(block, n_pfade - start)
+        r = np.full(n, float(zins))
+        for j in range(jahre):
+            r = theta + (r - theta) * a + schritt_sd * rng.standard_normal(n)
+            zins_hist[j] += np.histogram(np.clip(r, ZINS_KLASSEN[0], ZINS_KLASSEN[-1] - 1e-9), ZINS_KLASSEN)[0]
+        anschluss_zins[start:start + n] = np.maximum(r, zins_min)
+
+    rate = restschuld * (anschluss_zins + tilgung) / 100 / 12
+    rate_heute = restschuld * (zins + tilgung) / 100 / 12
+
+    return {
+        "n_pfade": n_pfade,
+        "restschuld": float(restschuld),
+        "rate_heute": float(rate_heute),
+        "anschluss_zins": anschluss_zins,
+        "anschluss_rate": rate,
+        "zins_perzentile": dict(zip(PERZENTILE, np.percentile(anschluss_zins, PERZENTILE).tolist())),
+        "rate_perzentile": dict(zip(PERZENTILE, np.percentile(rate, PERZENTILE).tolist())),
+        "p_ueber_frei": float(np.mean(rate > frei)),
+        "p_ueber_frei_bank": float(np.mean(rate > frei_bank)),
+        # Fächer: Zins-Perzentile je Jahr (Zeilen = Jahre, Spalten = PERZENTILE)
+        "faecher_jahre": np.arange(1, jahre + 1),
+        "faecher": _perzentile_aus_histogramm(zins_hist, ZINS_KLASSEN, PERZENTILE),
+    }
@@ -0,0 +1,300 @@
+"""HTTP-API (asyncio) für Haushaltscheck und maximalen Kaufpreis.
+
+Für CRM und Partner-Portale: dieselben Zahlen wie die Streamlit-Seite, ohne
+Session und ohne UI. Läuft auf Starlette/uvicorn; beides bringt Streamlit
+ohnehin mit.
+
+Endpunkte:
+
+* ``POST /v1/check``    ein Profil -> Kennzahlen (``engine.berechne``)
+* ``POST /v1/batch``    ``{"profile": [...], "format": "zeilen"|"spalten"}`` ->
+  Kennzahlen je Profil, vektorisiert in einem Aufruf von ``batch_engine``
+* ``GET  /v1/metriken`` Latenz (p50/p95/p99/max) und Durchsatz je Endpunkt
+* ``GET  /health``
+
+Ein Profil hat entweder die Feldnamen von ``engine.Eingaben`` oder ist ein
+Dict wie beim JSON-Export der App (``sb_*``/``exp_*``/``renovierung``).
+Ist ``IMMO_API_TOKEN`` gesetzt, verlangen alle ``/v1``-Endpunkte (auch
+``/v1/metriken``) ``Authorization: Bearer <token>``.
+
+Start::
+
+    python api.py --port 8601
+"""
+import argparse
+import hmac
+import json
+import math
+import os
+import time
+from collections import deque
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from batch_engine import OPTIONALE_FELDER, ZAHL_FELDER, berechne_batch, spalten_aus_eingaben
+from engine import OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben, berechne
+
+API_FELDER = ("einnahmen", "ausgaben", "frei", "frei_bank", "sozial_summe", "max_kredit", "max_preis",
+              "wunsch_darlehen", "wunsch_rate")
+MAX_BATCH = int(os.environ.get("IMMO_API_MAX_BATCH", "50000"))
+MAX_BYTES = int(os.environ.get("IMMO_API_MAX_BYTES", str(64 * 1024 * 1024)))
+TOKEN = os.environ.get("IMMO_API_TOKEN")
+
+
+class Fehler(Exception):
+    """Fehler mit HTTP-Status (wird als ``{"fehler": ...}`` beantwortet)."""
+
+    def __init__(self, status, text):
+        super().__init__(text)
+        self.status = status
+
+
+# ==========================================
+# 📥 PROFILE
+# ==========================================
+_FELDER = frozenset(Eingaben.__slots__)
+
+
+def _keine_zahl(werte):
+    """Erstes Zahlenfeld, das keine endliche Zahl ist (sonst None)."""
+    for feld in ZAHL_FELDER:
+        wert = werte.get(feld, 0)
+        # type() statt isinstance: bool zählt hier nicht als Zahl
+        if type(wert) not in (int, float) or not math.isfinite(wert):
+            if wert is None and feld in OPTIONALE_FELDER:
+                continue
+            return feld
+    return None
+
+
+def profil(d, nummer=None):
+    """JSON-Dict (Eingaben-Felder oder Export-Format) -> geprüfte ``Eingaben``."""
+    wo = "" if nummer is None else f"Profil {nummer}: "
+    if not isinstance(d, dict):
+        raise Fehler(400, f"{wo}Objekt erwartet.")
+    try:
+        if d.keys() <= _FELDER:
+            falsch = _keine_zahl(d)
+            e = Eingaben(**d) if falsch is None else None
+        else:
+            unbekannt = [k for k in d if not k.startswith(("sb_", "exp_")) and k != "renovierung"]
+            if unbekannt:
+                raise Fehler(400, f"{wo}unbekannte Felder {', '.join(sorted(unbekannt))}")
+            e = Eingaben.from_state(d)
+            falsch = _keine_zahl(e.as_dict())
+    except (TypeError, ValueError, KeyError) as ex:
+        raise Fehler(400, f"{wo}{ex}") from None
+
+    if falsch is not None:
+        raise Fehler(400, f"{wo}{falsch} muss eine Zahl sein.")
+    if e.nutzung not in OPTIONS_NUTZUNG:
+        raise Fehler(400, f"{wo}nutzung muss einer von {OPTIONS_NUTZUNG} sein.")
+    if e.erwachsene not in OPTIONS_ERWACHSENE:
+        raise Fehler(400, f"{wo}erwachsene muss einer von {OPTIONS_ERWACHSENE} sein.")
+    return e
+
+
+def _machbar(wunsch_preis, frei, ok):
+    # Wie in der App: Urteil nur mit Wunsch-Objekt und ohne Unterdeckung
+    return bool(ok) if wunsch_preis > 0 and frei >= 0 else None
+
+
+def check(e):
+    r = berechne(e)
+    antwort = {"name": e.name, **{k: round(getattr(r, k), 2) for k in API_FELDER}}
+    antwort["machbar"] = _machbar(e.wunsch_preis, r.frei, r.machbar)
+    antwort["machbar_bank"] = _machbar(e.wunsch_preis, r.frei, r.wunsch_rate <= r.frei_bank)
+    return antwort
+
+
+def batch(roh, format="zeilen"):
+    """Rohes JSON (Bytes) einer Batch-Anfrage -> Antwort-Dict. Läuft im Thread-Pool."""
+    try:
+        daten = json.loads(roh)
+    except ValueError as ex:
+        raise Fehler(400, f"Ungültiges JSON: {ex}") from None
+    liste = daten.get("profile") if isinstance(daten, dict) else None
+    if not isinstance(liste, list):
+        raise Fehler(400, 'Erwartet: {"profile": [...]}')
+    if len(liste) > MAX_BATCH:
+        raise Fehler(413, f"Höchstens {MAX_BATCH} Profile pro Anfrage.")
+    format = daten.get("format", format)
+    if format not in ("zeilen", "spalten"):
+        raise Fehler(400, 'format muss "zeilen" oder "spalten" sein.')
+
+    eingaben = [profil(d, i) for i, d in enumerate(liste)]
+    if not eingaben:
+        return {"anzahl": 0, "ergebnisse": [] if format == "zeilen" else {}}
+    res = berechne_batch(spalten_aus_eingaben(eingaben))
+
+    # Spaltenweise nach Python-Listen wandeln (viel schneller als Element für Element)
+    spalten = {"name": [e.name for e in eingaben]}
+    spalten.update({k: res[k].round(2).tolist() for k in API_FELDER})
+    wunsch = [e.wunsch_preis for e in eingaben]
+    # Ungerundetes frei wie in check(): -0.0000001 ist Unterdeckung, gerundet aber -0.0 >= 0
+    frei = res["frei"].tolist()
+    spalten["machbar"] = [_machbar(w, f, m) for w, f, m in zip(wunsch, frei, res["machbar"].tolist())]
+    spalten["machbar_bank"] = [_machbar(w, f, m) for w, f, m in
+                               zip(wunsch, frei, (res["wunsch_rate"] <= res["frei_bank"]).tolist())]
+    if format == "spalten":
+        return {"anzahl": len(eingaben), "ergebnisse": spalten}
+    return {"anzahl": len(eingaben), "ergebnisse": [dict(zip(spalten, z)) for z in zip(*spalten.values())]}
+
+
+# ==========================================
+# ⏱ METRIKEN
+# ==========================================
+class Metriken:
+    """Latenzen je Endpunkt (letzte ``fenster`` Anfragen) und Durchsatz der letzten 60 s."""
+
+    __slots__ = ("start", "_daten", "_fenster")
+
+    def __init__(self, fenster=10_000):
+        self.start = time.monotonic()
+        self._daten = {}
+        self._fenster = fenster
+
+    def erfasse(self, endpunkt, sekunden, profile, fehler):
+        d = self._daten.get(endpunkt)
+        if d is None:
+            d = self._daten[endpunkt] = {"anfragen": 0, "fehler": 0, "profile": 0,
+                                         "letzte": deque(maxlen=self._fenster)}
+        d["anfragen"] += 1
+        d["fehler"] += fehler
+        d["profile"] += profile
+        d["letzte"].append((time.monotonic(), sekunden * 1000, profile))
+
+    def als_dict(self):
+        jetzt = time.monotonic()
+        aus = {"laufzeit_s": round(jetzt - self.start, 1), "endpunkte": {}}
+        for endpunkt, d in self._daten.items():
+            ms = sorted(x[1] for x in d["letzte"])
+            minute = [x for x in d["letzte"] if x[0] >= jetzt - 60]
+            spanne = min(60.0, jetzt - self.start) or 1.0
+
+            def p(q):
+                return round(ms[min(int(q * len(ms)), len(ms) - 1)], 2) if ms else None
+
+            aus["endpunkte"][endpunkt] = {
+                "anfragen": d["anfragen"], "fehler": d["fehler"], "profile": d["profile"],
+                "p50_ms": p(0.50), "p95_ms": p(0.95), "p99_ms": p(0.99), "max_ms": round(ms[-1], 2) if ms else None,
+                "anfragen_pro_s": round(len(minute) / spanne, 1),
+                "profile_pro_s": round(sum(x[2] for x in minute) / spanne, 1),
+            }
+        return aus
+
+
+# ==========================================
+# 🌐 ENDPUNKTE
+# ==========================================
+METRIKEN = Metriken()
+
+
+def _pruefe_token(request):
+    if not TOKEN:
+        return
+    # Vergleich in konstanter Zeit: keine Rückschlüsse aus der Antwortzeit
+    gesendet = request.headers.get("authorization", "").encode("utf-8", "replace")
+    if not hmac.compare_digest(gesendet, f"Bearer {TOKEN}".encode()):
+        raise Fehler(401, "Token fehlt oder ist falsch.")
+
+
+def _gemessen(endpunkt):
+    """Zeit, Profilzahl und Fehler je Anfrage erfassen; ``Fehler`` -> JSON-Antwort.
+
+    Unerwartete Ausnahmen werden ebenfalls als Fehler gezählt und dann
+    weitergereicht (500 mit Traceback im Server-Log).
+    """
+    def deko(handler):
+        async def wrapper(request):
+            t0 = time.perf_counter()
+            anzahl, fehler = 0, 0
+            try:
+                _pruefe_token(request)
+                antwort, anzahl = await handler(request)
+                response = JSONResponse(antwort)
+            except Fehler as ex:
+                fehler = 1
+                response = JSONResponse({"fehler": str(ex)}, status_code=ex.status)
+            except Exception:
+                METRIKEN.erfasse(endpunkt, time.perf_counter() - t0, anzahl, 1)
+                # Traceback ins Server-Log, Starlette antwortet mit 500
+                raise
+            sekunden = time.perf_counter() - t0
+            METRIKEN.erfasse(endpunkt, sekunden, anzahl, fehler)
+            response.headers["Server-Timing"] = f"app;dur={sekunden * 1000:.2f}"
+            return response
+        return wrapper
+    return deko
+
+
+async def _body(request):
+    laenge = request.headers.get("content-length")
+    if laenge is not None:
+        if not laenge.strip().isdigit():
+            raise Fehler(400, "Content-Length ist keine gültige Länge.")
+        if int(laenge) > MAX_BYTES:
+            raise Fehler(413, f"Anfrage größer als {MAX_BYTES} Bytes.")
+    # Chunked ohne Content-Length: beim Lesen mitzählen und früh abbrechen
+    teile, groesse = [], 0
+    async for teil in request.stream():
+        groesse += len(teil)
+        if groesse > MAX_BYTES:
+            raise Fehler(413, f"Anfrage größer als {MAX_BYTES} Bytes.")
+        teile.append(teil)
+    return b"".join(teile)
+
+
+@_gemessen("check")
+async def check_endpunkt(request):
+    try:
+        d = json.loads(await _body(request))
+    except ValueError as ex:
+        raise Fehler(400, f"Ungültiges JSON: {ex}") from None
+    # Ein Profil rechnet in Mikrosekunden: direkt im Event-Loop
+    return check(profil(d)), 1
+
+
+@_gemessen("batch")
+async def batch_endpunkt(request):
+    roh = await _body(request)
+    # Parsen + Rechnen tausender Profile im Thread-Pool, der Event-Loop bleibt frei
+    antwort = await run_in_threadpool(batch, roh, request.query_params.get("format", "zeilen"))
+    return antwort, antwort["anzahl"]
+
+
+async def metriken_endpunkt(request):
+    try:
+        _pruefe_token(request)
+    except Fehler as ex:
+        return JSONResponse({"fehler": str(ex)}, status_code=ex.status)
+    return JSONResponse(METRIKEN.als_dict())
+
+
+async def health(request):
+    return Response("ok", media_type="text/plain")
+
+
+app = Starlette(routes=[
+    Route("/v1/check", check_endpunkt, methods=["POST"]),
+    Route("/v1/batch", batch_endpunkt, methods=["POST"]),
+    Route("/v1/metriken", metriken_endpunkt, methods=["GET"]),
+    Route("/health", health, methods=["GET"]),
+])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP-API für den Finanzierungscheck.")
+    parser.add_argument("--host", default="127.0.0.1", help="Standard: nur lokal (127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8601)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
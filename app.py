@@ -1,21 +1,45 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import json
-from fpdf import FPDF
+import functools
+import os
+from engine import OPTIONS_NUTZUNG, OPTIONS_ERWACHSENE, OPTIONS_BESTAND, KINDERGELD, Eingaben, bewirtschaftung, get_bank_richtwert
+from format_de import eur, zahl_de
+from messung import Messung
+from pdf_cache import PDF_CACHE, PDF_JOBS, stable_hash
+from rechengraph import Rechengraph
+from sicherung import FELD_NAMEN, Schnappschuss
+
+# Schwere Module (NumPy, Plotly, FPDF) werden erst in den Abschnitten
+# importiert, die sie brauchen -- Passwort-Maske und Kaltstart bleiben schnell.
 
 # --- KONFIGURATION ---
 st.set_page_config(page_title="Immo-Finanz Master Pro", layout="wide")
+# Phasen-Timing dieses Reruns (nur mit IMMO_PROFILING=1, sonst praktisch kostenlos)
+messung = Messung()
+
+
+def gemessen(fragment):
+    """Fragment-Reruns bekommen eine eigene Messung (``lauf="fragment:<name>"``).
+
+    Im vollen Rerun zählen die Phasen zur Messung des Reruns. Läuft nur das
+    Fragment, ist die Messung des letzten vollen Reruns schon geschrieben --
+    dann wird für diesen Lauf eine neue angelegt und am Ende geschrieben.
+    """
+    @functools.wraps(fragment)
+    def lauf(*args, **kwargs):
+        global messung
+        if not messung.geschrieben:
+            return fragment(*args, **kwargs)
+        voll, messung = messung, Messung(lauf=f"fragment:{fragment.__name__}")
+        try:
+            return fragment(*args, **kwargs)
+        finally:
+            messung.schreibe()
+            messung = voll
+    return lauf
 
 # ==========================================
 # 🛠 HELFER & CALLBACKS
 # ==========================================
-def eur(wert):
-    return f"{wert:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") + " €"
-
-def pdf_eur(wert):
-    return f"{wert:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") + " EUR"
-
 def update_lebenshaltung():
     erw = st.session_state.sb_erwachsene
     kind = st.session_state.sb_kinder
@@ -23,29 +47,117 @@ def update_lebenshaltung():
     # Einkommens-Logik holen
     h = st.session_state.get("sb_gehalt_h", 0)
     p = st.session_state.get("sb_gehalt_p", 0)
-    k = st.session_state.get("sb_kinder", 0) * 250
+    k = st.session_state.get("sb_kinder", 0) * KINDERGELD
     kz = st.session_state.get("sb_kinderzuschlag", 0)
     wg = st.session_state.get("sb_wohngeld", 0)
     n = st.session_state.get("sb_neben", 0)
     s = st.session_state.get("sb_sonst", 0)
     
     total_netto = h + p + k + kz + wg + n + s
-
-    # 1. Basis
-    basis = 1000.0 if erw == "Alleinstehend" else 1700.0
-    basis += (kind * 350.0)
-
-    # 2. Lifestyle-Zuschlag
-    zuschlag = 0.0
-    if total_netto > 4000: zuschlag += 200 
-    if total_netto > 6000: zuschlag += 300 
-    if total_netto > 8000: zuschlag += 400 
-    
-    st.session_state.exp_p_lebenshaltung = float(basis + zuschlag)
+    st.session_state.exp_p_lebenshaltung = float(get_bank_richtwert(total_netto, erw, kind))
 
 def update_bewirtschaftung():
-    qm = st.session_state.sb_wohnflaeche
-    st.session_state.exp_bewirt = float(qm * 4.0)
+    st.session_state.exp_bewirt = bewirtschaftung(st.session_state.sb_wohnflaeche)
+
+def portfolio_laden_callback():
+    datei = st.session_state.get("portfolio_datei")
+    if datei is None:
+        return
+    from portfolio import Portfolio
+    try:
+        st.session_state.sb_portfolio = Portfolio.from_csv(datei.getvalue()).as_dict()
+        st.toast(f"✅ {len(st.session_state.sb_portfolio['miete'])} Einheiten geladen!", icon="🏢")
+    except (ValueError, UnicodeDecodeError) as e:
+        st.error(f"Fehler: {e}")
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def sensitivitaet_gitter(profil, ek_achse):
+    # Pro Haushaltsprofil einmal rechnen; Wechsel von Kennzahl/EK-Stufe kostet nichts
+    from sensitivitaet import gitter
+    return gitter(profil, ek_achse=ek_achse)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def anschluss_risiko(restschuld, zins, tilgung, zinsbindung, frei, frei_bank):
+    from anschluss_mc import simuliere
+    return simuliere(restschuld, zins, tilgung, zinsbindung, frei, frei_bank)
+
+@st.cache_data(max_entries=8, show_spinner="Angebote werden bewertet …")
+def screener_ergebnis(csv_daten, profil):
+    # Pro CSV und Haushalt einmal rechnen; Sortieren/Blättern nutzt die fertigen Arrays
+    from screener import bewerte, lese_angebote
+    return bewerte(Eingaben(**profil), lese_angebote(csv_daten))
+
+@st.cache_data(max_entries=32, show_spinner="Pläne werden gesucht …")
+def finanzierungs_plaene(investition, ek, zins, zinsbindung, budget, ziel, ek_reserve):
+    from optimierer import optimiere
+    return optimiere(investition, ek, zins, zinsbindung, budget, ziel=ziel, ek_reserve=ek_reserve)
+
+@st.cache_resource
+def bank_profile():
+    # Profile einmal pro Prozess laden und kompilieren
+    from banken import kompiliere, lade_profile
+    return kompiliere(lade_profile())
+
+@st.cache_resource
+def zertifikat_vorlage():
+    # Feste Texte und Layout des Zertifikats einmal pro Prozess, für alle Sessions
+    from zertifikat import Vorlage
+    return Vorlage()
+
+def pdf_rendern(auftrag, vorlage=None):
+    # Läuft im PDF-Worker (pdf_cache.PDF_JOBS), nicht im Script-Thread -> Vorlage dort binden
+    from zertifikat import render_pdf
+    e, mit_tilgungsplan = auftrag
+    m = Messung(lauf="download")
+    with m.phase("create_pdf"):
+        daten = render_pdf(e, mit_tilgungsplan, vorlage)
+    m.schreibe()
+    return daten
+
+def xlsx_bytes(e, res):
+    from xlsx_export import tilgungsplan_xlsx
+    m = Messung(lauf="download")
+    with m.phase("xlsx"):
+        daten = tilgungsplan_xlsx(e, res)
+    m.schreibe()
+    return daten
+
+def vergleich_pdf_rendern(szenarien, vorlage=None):
+    from zertifikat import render_vergleich_pdf
+    return render_vergleich_pdf(szenarien, vorlage)
+
+@st.fragment(run_every=0.5)
+def zeige_pdf_fortschritt(job, label):
+    status = PDF_JOBS.status(job)
+    if status in ("wartet", "läuft"):
+        st.caption(f"⏳ {label}: {'wird erstellt' if status == 'läuft' else 'in Warteschlange'} …")
+        return
+    # Fertig (oder Fehler): ganze Seite neu, damit der Download-Button erscheint und das Polling endet
+    st.rerun()
+
+def pdf_download(label, daten, render, file_name, **kwargs):
+    """Download-Button für ein im Hintergrund gerendertes PDF (Start per Klick, danach Fortschritt)."""
+    job = stable_hash(daten)
+    status = PDF_JOBS.status(job)
+    if status == "fertig" and job in PDF_CACHE:
+        # Bytes erst beim Klick holen: nur ein echter Download zählt als Cache-Treffer,
+        # nicht jeder Rerun (ist das PDF inzwischen verdrängt, wird es neu gerendert)
+        st.download_button(label, data=lambda: PDF_CACHE.get_or_render(daten, render), file_name=file_name,
+                           mime="application/pdf", on_click="ignore", key=f"pdf_dl_{job[:16]}", **kwargs)
+        return
+    if status in ("wartet", "läuft"):
+        zeige_pdf_fortschritt(job, label)
+        return
+    if status == "fehler":
+        st.error(f"PDF konnte nicht erstellt werden: {PDF_JOBS.fehler(job)}")
+    st.button(f"{label} erstellen", on_click=PDF_JOBS.submit, args=(daten, render), key=f"pdf_start_{job[:16]}", **kwargs)
+
+def sicherung_bytes(snap, archiv=False):
+    m = Messung(lauf="download")
+    with m.phase("archiv" if archiv else "json"):
+        daten = snap.archiv() if archiv else snap.json()
+    m.schreibe()
+    return daten
 
 # ==========================================
 # 🔒 PASSWORD
@@ -57,8 +169,10 @@ def check_password():
         return True
     
     def password_entered():
-        if st.session_state["password_input"] == st.secrets["password"]:
+        admin = st.secrets.get("admin_password")
+        if st.session_state["password_input"] in (st.secrets["password"], admin):
             st.session_state.password_correct = True
+            st.session_state.is_admin = bool(admin) and st.session_state["password_input"] == admin
             del st.session_state["password_input"]
         else:
             st.session_state.password_correct = False
@@ -71,248 +185,6 @@ def check_password():
 if not check_password():
     st.stop()
 
-# ==========================================
-# 📄 PDF GENERATOR
-# ==========================================
-class PDF(FPDF):
-    def header(self):
-        self.set_fill_color(28, 58, 106)
-        self.rect(0, 0, 210, 25, 'F')
-        self.set_font('Arial', 'B', 16)
-        self.set_text_color(255, 255, 255)
-        self.cell(0, 15, 'Finanzierungs-Zertifikat', 0, 1, 'C')
-        self.ln(10)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.set_text_color(128, 128, 128)
-        self.cell(0, 10, f'Seite {self.page_no()}', 0, 0, 'C')
-        self.set_x(-40)
-        self.cell(30, 10, 'WA | 2026', 0, 0, 'R')
-
-def create_pdf(data):
-    pdf = PDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    
-    col_header = (44, 62, 80)
-    col_text = (0, 0, 0)
-    col_fill = (240, 240, 240)
-
-    def txt(text):
-        return text.encode('latin-1', 'replace').decode('latin-1')
-
-    # KOPF
-    pdf.set_text_color(*col_header)
-    pdf.set_font("Arial", "B", 14)
-    pdf.cell(0, 10, txt(f"Analyse für: {data['name']}"), ln=True)
-    pdf.set_text_color(*col_text)
-    pdf.set_font("Arial", "", 11)
-    pdf.cell(0, 6, txt(f"Szenario: {data['scenario']}"), ln=True)
-    pdf.ln(5)
-
-    # 1. HAUSHALT
-    pdf.set_fill_color(*col_fill)
-    pdf.set_font("Arial", "B", 12)
-    pdf.set_text_color(*col_header)
-    pdf.cell(0, 8, txt("1. Monatliche Haushaltsrechnung"), 0, 1, 'L', True)
-    pdf.ln(4)
-
-    # EINNAHMEN
-    pdf.set_font("Arial", "B", 10)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(100, 6, txt("Gesamteinnahmen (Netto):"))
-    pdf.set_text_color(0, 100, 0)
-    pdf.cell(30, 6, txt(f"+ {pdf_eur(data['ein_total'])}"), 0, 1, 'R')
-    
-    details_list = []
-    if data['ein_haupt'] > 0: details_list.append(f"Gehalt Haupt: {pdf_eur(data['ein_haupt'])}")
-    if data['ein_partner'] > 0: details_list.append(f"Gehalt Partner: {pdf_eur(data['ein_partner'])}")
-    if data['ein_kinder'] > 0: details_list.append(f"Kindergeld: {pdf_eur(data['ein_kinder'])}")
-    
-    # Sozialleistungen markieren
-    if data['ein_kinderzuschlag'] > 0: details_list.append(f"Kinderzuschlag*: {pdf_eur(data['ein_kinderzuschlag'])}")
-    if data['ein_wohngeld'] > 0: details_list.append(f"Wohngeld*: {pdf_eur(data['ein_wohngeld'])}")
-    
-    if data['ein_neben'] > 0: details_list.append(f"Nebeneinkunft: {pdf_eur(data['ein_neben'])}")
-    if data['ein_sonst'] > 0: details_list.append(f"Sonstiges: {pdf_eur(data['ein_sonst'])}")
-    if data['ein_miete_bestand'] > 0: details_list.append(f"Miete Bestand: {pdf_eur(data['ein_miete_bestand'])}")
-    if data['ein_miete_neu'] > 0: details_list.append(f"Miete Neu (Kalk.): {pdf_eur(data['ein_miete_neu'])}")
-    
-    details_str = ", ".join(details_list)
-    pdf.set_font("Arial", "I", 8)
-    pdf.set_text_color(100, 100, 100)
-    pdf.multi_cell(0, 5, txt(f"(Zusammensetzung: {details_str})"))
-    
-    # HINWEIS SOZIALLEISTUNGEN IM PDF
-    if data['sozial_summe'] > 0:
-        pdf.ln(2)
-        pdf.set_text_color(180, 100, 0) # Dunkelorange
-        pdf.set_font("Arial", "B", 9)
-        warn_txt = f"* HINWEIS: In den Einnahmen sind {pdf_eur(data['sozial_summe'])} Sozialleistungen (Wohngeld/Kinderzuschlag) enthalten. Diese werden von Banken oft NICHT als nachhaltiges Einkommen für den Kredit gewertet!"
-        pdf.multi_cell(0, 5, txt(warn_txt))
-    
-    pdf.ln(2)
-
-    # AUSGABEN
-    pdf.set_text_color(*col_text)
-    pdf.set_font("Arial", "B", 10)
-    pdf.cell(0, 6, txt("Ausgaben (Detailliert):"), 0, 1)
-    
-    def row(label, val, note=""):
-        pdf.set_font("Arial", "", 10)
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(100, 6, txt(label))
-        pdf.cell(30, 6, txt(pdf_eur(val)), 0, 0, 'R')
-        if note:
-            pdf.set_font("Arial", "I", 8)
-            pdf.set_text_color(100, 100, 100)
-            pdf.cell(60, 6, txt(f"  ({note})"), 0, 0, 'L')
-        pdf.ln()
-
-    pdf.cell(100, 0, "", "T")
-    pdf.cell(30, 0, "", "T")
-    pdf.ln(2)
-
-    row("Lebenshaltung (Pauschale)", data['aus_leben'], "Nahrung, Kleidung, Gesundheit")
-    row("Bewirtschaftung (Hauskosten)", data['aus_bewirt'], f"Heizung, Wasser ({data['qm']} qm)")
-    if data['aus_miete'] > 0: row("Aktuelle Kaltmiete", data['aus_miete'], "Bleibt bestehen")
-    if data['aus_bestand'] > 0: row("Rate Bestandskredit", data['aus_bestand'])
-    if data['aus_bauspar'] > 0: row("Sparrate (Pflicht)", data['aus_bauspar'], "Tilgungsaussetzung")
-    if data['aus_konsum'] > 0: row("Konsumkredite", data['aus_konsum'])
-    row("Puffer / Rücklagen", data['aus_puffer'])
-
-    pdf.ln(1)
-    pdf.set_font("Arial", "B", 10)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(100, 6, txt("Summe Ausgaben:"))
-    pdf.set_text_color(180, 0, 0)
-    pdf.cell(30, 6, txt(f"- {pdf_eur(data['aus_total'])}"), 0, 1, 'R')
-
-    # ERGEBNIS HAUSHALT
-    pdf.ln(4)
-    pdf.set_fill_color(230, 240, 255)
-    pdf.set_font("Arial", "B", 12)
-    pdf.set_text_color(*col_header)
-    pdf.cell(120, 10, txt("Verfügbarer Betrag (Freie Rate):"), 0, 0, 'L', True)
-    pdf.cell(70, 10, txt(f"{pdf_eur(data['frei'])}"), 0, 1, 'R', True)
-    pdf.ln(8)
-
-    # 2. VERGLEICH
-    if data['diff_miete'] is not None:
-         pdf.set_fill_color(*col_fill)
-         pdf.set_font("Arial", "B", 12)
-         pdf.set_text_color(*col_header)
-         pdf.cell(0, 8, txt("2. Vergleich: Miete vs. Eigentum"), 0, 1, 'L', True)
-         pdf.ln(2)
-         
-         pdf.set_text_color(0,0,0)
-         pdf.set_font("Arial", "", 10)
-         pdf.cell(100, 6, txt("Bisherige Warmmiete:"))
-         pdf.cell(30, 6, txt(pdf_eur(data['alt_warm'])), 0, 1, 'R')
-         pdf.cell(100, 6, txt("Neue Belastung (Rate + NK + Puffer):"))
-         pdf.cell(30, 6, txt(pdf_eur(data['neu_last'])), 0, 1, 'R')
-         
-         diff = data['diff_miete']
-         if diff > 0:
-             pdf.set_text_color(180, 0, 0)
-             pdf.set_font("Arial", "B", 10)
-             pdf.cell(0, 8, txt(f"-> Mehrbelastung: {pdf_eur(diff)}"), 0, 1)
-         else:
-             pdf.set_text_color(0, 100, 0)
-             pdf.set_font("Arial", "B", 10)
-             pdf.cell(0, 8, txt(f"-> Ersparnis: {pdf_eur(abs(diff))}"), 0, 1)
-         pdf.ln(5)
-
-    # 3. WUNSCH OBJEKT
-    next_section_num = 3
-    if data['wunsch_preis'] > 0:
-        pdf.set_fill_color(*col_fill)
-        pdf.set_font("Arial", "B", 12)
-        pdf.set_text_color(*col_header)
-        pdf.cell(0, 8, txt(f"{next_section_num}. Finanzierungsplan Wunsch-Objekt"), 0, 1, 'L', True)
-        pdf.ln(2)
-        next_section_num += 1
-        
-        pdf.set_text_color(0,0,0)
-        pdf.set_font("Arial", "", 10)
-        
-        pdf.cell(100, 6, txt("Kaufpreis:"))
-        pdf.cell(30, 6, txt(pdf_eur(data['wunsch_preis'])), 0, 1, 'R')
-        pdf.cell(100, 6, txt(f"Kaufnebenkosten ({data['nk_prozent']:.2f} %):"))
-        pdf.cell(30, 6, txt(f"+ {pdf_eur(data['wunsch_nk'])}"), 0, 1, 'R')
-        
-        if data['renovierung'] > 0:
-            pdf.cell(100, 6, txt("Modernisierung / Renovierung:"))
-            pdf.cell(30, 6, txt(f"+ {pdf_eur(data['renovierung'])}"), 0, 1, 'R')
-            
-        pdf.set_font("Arial", "B", 10)
-        pdf.cell(100, 6, txt("Gesamtkosten (Investition):"), "T")
-        pdf.cell(30, 6, txt(f"= {pdf_eur(data['wunsch_invest'])}"), "T", 1, 'R')
-        pdf.set_font("Arial", "", 10)
-        pdf.cell(100, 6, txt("Eigenkapital:"))
-        pdf.cell(30, 6, txt(f"- {pdf_eur(data['ek'])}"), 0, 1, 'R')
-        
-        pdf.set_font("Arial", "B", 11)
-        pdf.set_fill_color(220, 220, 220)
-        pdf.cell(100, 8, txt("Zu finanzierendes Darlehen:"), 0, 0, 'L', True)
-        pdf.cell(30, 8, txt(f"{pdf_eur(data['wunsch_darlehen'])}"), 0, 1, 'R', True)
-        
-        pdf.ln(4)
-        
-        pdf.set_font("Arial", "", 11)
-        pdf.cell(120, 8, txt(f"Notwendige Rate ({data['zins']}% Zins + {data['tilg']}% Tilgung):"), 0)
-        pdf.cell(70, 8, txt(f"{pdf_eur(data['wunsch_rate'])}"), 0, 1, 'R')
-        
-        pdf.ln(2)
-        diff_wunsch = data['wunsch_rate'] - data['frei']
-        
-        if data['wunsch_rate'] <= data['frei']:
-            pdf.set_fill_color(200, 255, 200)
-            pdf.set_text_color(0, 100, 0)
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 10, txt("Ergebnis: MACHBAR (Im Budget)"), 1, 1, 'C', True)
-        else:
-            pdf.set_fill_color(255, 200, 200)
-            pdf.set_text_color(180, 0, 0)
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(0, 10, txt(f"Ergebnis: ÜBERSTEIGT BUDGET (Fehlt: {pdf_eur(diff_wunsch)})"), 1, 1, 'C', True)
-        
-        pdf.ln(5)
-
-    # 4. MAXIMALER PREIS
-    pdf.set_fill_color(*col_fill)
-    pdf.set_font("Arial", "B", 12)
-    pdf.set_text_color(*col_header)
-    
-    titel_max = f"{next_section_num}. Maximaler Kaufpreis (Kalkulation)"
-    if data['wunsch_preis'] > 0:
-        titel_max = f"{next_section_num}. Dein maximal mögliches Budget (Theoretisch)"
-        
-    pdf.cell(0, 8, txt(titel_max), 0, 1, 'L', True)
-    pdf.ln(2)
-    
-    pdf.set_text_color(0,0,0)
-    pdf.set_font("Arial", "", 10)
-    pdf.cell(120, 10, txt("Max. Kaufpreis der Immobilie:"), 1)
-    pdf.cell(70, 10, txt(f"{pdf_eur(data['kaufpreis'])}"), 1, 1, 'R')
-    pdf.cell(120, 8, txt("dazu Kaufnebenkosten:"), 1)
-    pdf.cell(70, 8, txt(f"+ {pdf_eur(data['nk'])}"), 1, 1, 'R')
-    pdf.cell(120, 8, txt("abzüglich Eigenkapital:"), 1)
-    pdf.cell(70, 8, txt(f"- {pdf_eur(data['ek'])}"), 1, 1, 'R')
-    
-    pdf.set_font("Arial", "B", 11)
-    pdf.set_fill_color(220, 220, 220)
-    pdf.cell(120, 10, txt("Notwendiges Bankdarlehen:"), 1, 0, 'L', True)
-    pdf.cell(70, 10, txt(f"{pdf_eur(data['kredit'])}"), 1, 1, 'R', True)
-
-    pdf.ln(10)
-    pdf.set_text_color(100, 100, 100)
-    pdf.set_font("Arial", "I", 8)
-    pdf.multi_cell(0, 5, txt("Hinweis: Dies ist eine unverbindliche Modellrechnung."))
-    return pdf.output(dest='S').encode('latin-1')
-
 # ==========================================
 # 💾 SPEICHERN & LADEN
 # ==========================================
@@ -323,19 +195,96 @@ defaults = {
     "sb_grunderwerb": 6.5, "sb_notar": 2.0, "sb_makler": 3.57, "renovierung": 0
 }
 
+def schnappschuss():
+    # Nur lesen und vergleichen; geprüft und kodiert wird erst beim Download/Speichern
+    # (ein to_dict ist billiger als 34 Einzelzugriffe über den Session-State-Proxy)
+    state = st.session_state.to_dict()
+    roh = {k: state[k] for k in FELD_NAMEN if k in state}
+    snap = state.get("_schnappschuss")
+    if snap is None or snap.roh != roh:
+        snap = st.session_state._schnappschuss = Schnappschuss(roh)
+    return snap
+
+def in_session_laden(data):
+    from sicherung import voll
+    # Erst komplett prüfen, dann schreiben: ein fehlerhafter Stand ändert nichts
+    daten = voll(data)
+    if "sb_portfolio" not in daten:
+        st.session_state.pop("sb_portfolio", None)
+    for key, value in daten.items():
+        st.session_state[key] = value
+    update_lebenshaltung()
+    update_bewirtschaftung()
+
 def load_data_callback():
     uploaded = st.session_state.get('json_loader')
     if uploaded is not None:
+        from sicherung import lade
         try:
-            data = json.load(uploaded)
-            for key, value in data.items():
-                st.session_state[key] = value
-            update_lebenshaltung()
-            update_bewirtschaftung()
+            in_session_laden(lade(uploaded.getvalue()))
             st.toast("✅ Daten geladen & neu berechnet!", icon="🎉")
-        except Exception as e:
+        except ValueError as e:
             st.error(f"Fehler: {e}")
 
+@st.cache_resource
+def kunden_db():
+    # Eine Verbindung pro Prozess, über alle Reruns und Sessions hinweg
+    from kunden_db import KundenDB
+    return KundenDB(os.environ.get("IMMO_DB", "kunden.sqlite"))
+
+def db_speichern_callback():
+    kunden_db().speichere(st.session_state.get("sb_name", "Kunde"), schnappschuss().daten, st.session_state.get("db_titel"))
+    st.session_state.db_titel = ""
+    st.toast("✅ Szenario gespeichert!", icon="🗂")
+
+def db_laden_callback(szenario_id):
+    data = kunden_db().lade(szenario_id)
+    if data is None:
+        st.error("Szenario nicht gefunden.")
+        return
+    try:
+        in_session_laden(data)
+    except ValueError as e:
+        st.error(f"Fehler: {e}")
+        return
+    st.toast("✅ Szenario geladen & neu berechnet!", icon="🎉")
+
+@st.fragment
+@gemessen
+def zeige_kundendatenbank():
+    from kunden_db import SORTIERUNGEN
+    st.markdown("#### 🗂 Kundendatenbank")
+    col_t, col_s = st.columns([3, 1], vertical_alignment="bottom")
+    col_t.text_input("Titel des Szenarios", key="db_titel", placeholder="z.B. Angebot Hausbank")
+    col_s.button("In Datenbank speichern", on_click=db_speichern_callback, use_container_width=True)
+
+    col_n, col_d, col_o, col_m = st.columns([2, 2, 1, 1], vertical_alignment="bottom")
+    name = col_n.text_input("Kunde suchen (Namensanfang)", key="db_suche")
+    zeitraum = col_d.date_input("Gespeichert im Zeitraum", value=[], format="DD.MM.YYYY", key="db_zeitraum")
+    sortierung = col_o.selectbox("Sortierung", list(SORTIERUNGEN), key="db_sortierung")
+    nur_machbar = col_m.checkbox("Nur machbar", key="db_nur_machbar")
+
+    seit = zeitraum[0] if len(zeitraum) > 0 else None
+    bis = zeitraum[1] if len(zeitraum) > 1 else seit
+    treffer = kunden_db().suche(name, seit, bis, nur_machbar, sortierung, limit=50)
+    if not treffer:
+        st.caption("Keine gespeicherten Szenarien gefunden.")
+        return
+
+    st.dataframe([{
+        "Kunde": t["name"], "Szenario": t["titel"], "Gespeichert": t["erstellt"].replace("T", " "),
+        "Freie Rate": eur(t["frei"]), "Max. Kaufpreis": eur(t["max_preis"]),
+        "Wunsch-Objekt": eur(t["wunsch_preis"]) if t["wunsch_preis"] > 0 else "–",
+        "Machbar": {1: "✅", 0: "❌"}.get(t["machbar"], "–"),
+    } for t in treffer], hide_index=True, use_container_width=True)
+
+    namen = {t["id"]: f"{t['name']} – {t['titel']}" for t in treffer}
+    col_a, col_l = st.columns([3, 1], vertical_alignment="bottom")
+    auswahl = col_a.selectbox("Szenario", list(namen), format_func=namen.get, key="db_auswahl")
+    # Laden ändert Sidebar-Werte -> ganze Seite neu aufbauen
+    if col_l.button("Laden", on_click=db_laden_callback, args=(auswahl,), use_container_width=True):
+        st.rerun()
+
 # ==========================================
 # UI & INPUTS
 # ==========================================
@@ -344,16 +293,17 @@ st.title("🏡 Profi-Finanzierungscheck")
 with st.expander("📂 Speichern / Laden", expanded=False):
     col_dl, col_ul = st.columns(2)
     with col_ul:
-        st.file_uploader("JSON laden", type=["json"], key="json_loader", on_change=load_data_callback)
+        st.file_uploader("Sicherung laden (JSON/Archiv)", type=["json", "immo"], key="json_loader", on_change=load_data_callback)
     with col_dl:
         st.info("Download unten!")
+    zeige_kundendatenbank()
 
+messung.start("eingaben")
 # --- SIDEBAR: 1. PROJEKT ---
 st.sidebar.header("1. Projekt & Nutzung")
 if "sb_name" not in st.session_state: st.session_state.sb_name = defaults["kunde"]
 kunden_name = st.sidebar.text_input("Name", key="sb_name")
 
-OPTIONS_NUTZUNG = ["Eigenheim (Nur Selbstbezug)", "Eigenheim mit Vermietung (Einliegerw./MFH)", "Kapitalanlage (Reine Vermietung)"]
 if "sb_nutzung" not in st.session_state: st.session_state.sb_nutzung = OPTIONS_NUTZUNG[0]
 nutzungsart = st.sidebar.radio("Zweck", OPTIONS_NUTZUNG, key="sb_nutzung")
 
@@ -385,17 +335,17 @@ st.sidebar.header("2. Einkommen (Netto)")
 if "sb_gehalt_h" not in st.session_state: st.session_state.sb_gehalt_h = defaults["gehalt_h"]
 gehalt_haupt = st.sidebar.number_input("Gehalt Haupt", step=50, min_value=0, key="sb_gehalt_h", on_change=update_lebenshaltung)
 
-if "sb_erwachsene" not in st.session_state: st.session_state.sb_erwachsene = "Paar (2 Personen)"
-anzahl_erwachsene = st.sidebar.radio("Personen", ["Alleinstehend", "Paar (2 Personen)"], key="sb_erwachsene", on_change=update_lebenshaltung)
+if "sb_erwachsene" not in st.session_state: st.session_state.sb_erwachsene = OPTIONS_ERWACHSENE[1]
+anzahl_erwachsene = st.sidebar.radio("Personen", OPTIONS_ERWACHSENE, key="sb_erwachsene", on_change=update_lebenshaltung)
 
 gehalt_partner = 0
-if anzahl_erwachsene == "Paar (2 Personen)":
+if anzahl_erwachsene == OPTIONS_ERWACHSENE[1]:
     if "sb_gehalt_p" not in st.session_state: st.session_state.sb_gehalt_p = defaults["gehalt_p"]
     gehalt_partner = st.sidebar.number_input("Gehalt Partner", step=50, min_value=0, key="sb_gehalt_p", on_change=update_lebenshaltung)
 
 if "sb_kinder" not in st.session_state: st.session_state.sb_kinder = defaults["kinder"]
 anzahl_kinder = st.sidebar.number_input("Kinder", step=1, min_value=0, key="sb_kinder", on_change=update_lebenshaltung)
-kindergeld = anzahl_kinder * 250
+kindergeld = anzahl_kinder * KINDERGELD
 
 # SOZIALLEISTUNGEN
 if "sb_kinderzuschlag" not in st.session_state: st.session_state.sb_kinderzuschlag = 0
@@ -414,16 +364,7 @@ st.sidebar.markdown("---")
 st.sidebar.header("3. Ausgaben (Bank-Logik)")
 
 aktuelles_gesamt_netto = gehalt_haupt + gehalt_partner + kindergeld + kinderzuschlag + wohngeld + nebeneinkommen + sonstiges
-def get_bank_richtwert_local(netto, erw, kind):
-    basis = 1000.0 if erw == "Alleinstehend" else 1700.0
-    basis += (kind * 350.0)
-    zuschlag = 0.0
-    if netto > 4000: zuschlag += 200 
-    if netto > 6000: zuschlag += 300 
-    if netto > 8000: zuschlag += 400 
-    return basis + zuschlag
-
-bank_richtwert = get_bank_richtwert_local(aktuelles_gesamt_netto, anzahl_erwachsene, anzahl_kinder)
+bank_richtwert = get_bank_richtwert(aktuelles_gesamt_netto, anzahl_erwachsene, anzahl_kinder)
 
 if "exp_p_lebenshaltung" not in st.session_state: update_lebenshaltung()
 if "exp_bewirt" not in st.session_state: update_bewirtschaftung()
@@ -441,7 +382,8 @@ var_bewirtschaftung = st.sidebar.number_input(
 )
 st.sidebar.markdown("[📊 Quelle Mieterbund](https://www.mieterbund.de/service/betriebskostenspiegel.html)")
 
-var_puffer = st.sidebar.number_input("Instandhaltungs-Puffer", value=250, step=50, min_value=0, help="Rücklagen.")
+if "sb_puffer" not in st.session_state: st.session_state.sb_puffer = 250
+var_puffer = st.sidebar.number_input("Instandhaltungs-Puffer", step=50, min_value=0, key="sb_puffer", help="Rücklagen.")
 
 if "sb_konsum" not in st.session_state: st.session_state.sb_konsum = 0
 konsum = st.sidebar.number_input("Konsumkredite (Rate)", step=50, min_value=0, key="sb_konsum")
@@ -454,13 +396,27 @@ if "sb_ek" not in st.session_state: st.session_state.sb_ek = defaults["ek"]
 eigenkapital = st.sidebar.number_input("Eigenkapital", step=1000, min_value=0, key="sb_ek")
 zins = st.sidebar.number_input("Zins (%)", value=3.8, step=0.1, min_value=0.1, key="sb_zins")
 tilgung = st.sidebar.number_input("Tilgung (%)", value=2.0, step=0.1, min_value=0.0, key="sb_tilgung")
+zinsbindung = st.sidebar.number_input("Zinsbindung (Jahre)", value=10, step=1, min_value=1, max_value=40, key="sb_zinsbindung")
+sondertilgung = st.sidebar.number_input("Sondertilgung p.a.", value=0, step=1000, min_value=0, key="sb_sondertilgung", help="Jährlich zum Jahresende, während der Zinsbindung.")
 
-miete_bestand_anrechenbar = 0.0
-rate_bestand = 0.0
+miete_bestand_raw = 0
+rate_bestand = 0
 if st.sidebar.checkbox("Immobilienbestand?", key="sb_hat_bestand"):
-    miete_raw = st.sidebar.number_input("Mieteinnahmen Bestand", value=0, min_value=0)
-    rate_bestand = st.sidebar.number_input("Rate Bestand", value=0, min_value=0)
-    miete_bestand_anrechenbar = miete_raw * 0.75 
+    if "sb_bestand_modus" not in st.session_state: st.session_state.sb_bestand_modus = OPTIONS_BESTAND[0]
+    bestand_modus = st.sidebar.radio("Erfassung", OPTIONS_BESTAND, key="sb_bestand_modus", horizontal=True)
+    if bestand_modus == OPTIONS_BESTAND[0]:
+        if "sb_miete_bestand" not in st.session_state: st.session_state.sb_miete_bestand = 0
+        miete_bestand_raw = st.sidebar.number_input("Mieteinnahmen Bestand", min_value=0, key="sb_miete_bestand")
+        if "sb_rate_bestand" not in st.session_state: st.session_state.sb_rate_bestand = 0
+        rate_bestand = st.sidebar.number_input("Rate Bestand", min_value=0, key="sb_rate_bestand")
+    else:
+        st.sidebar.file_uploader("Einheiten (CSV: Objekt, Kaltmiete, Restschuld, Rate, Zins, Zinsbindung)", type=["csv"],
+                                 key="portfolio_datei", on_change=portfolio_laden_callback)
+        if st.session_state.get("sb_portfolio"):
+            from portfolio import Portfolio
+            bestand = Portfolio.from_dict(st.session_state.sb_portfolio).aggregat()
+            miete_bestand_raw, rate_bestand = bestand["miete"], bestand["rate"]
+            st.sidebar.caption(f"{bestand['einheiten']} Einheiten · Miete {eur(bestand['miete'])} · Rate {eur(bestand['rate'])}")
 
 # --- SIDEBAR: 5. KAUFNEBENKOSTEN ---
 st.sidebar.header("5. Kaufnebenkosten (Variabel)")
@@ -483,157 +439,497 @@ renovierung = st.sidebar.number_input("Renovierung / Modernisierung", step=1000,
 # ==========================================
 # RECHNUNG
 # ==========================================
-miete_neu_calc = 0.0
-if nutzungsart != OPTIONS_NUTZUNG[0]:
-    miete_neu_calc = neue_miete_einnahme * 0.80 
-belastung_alte_miete = aktuelle_warmmiete if nutzungsart == OPTIONS_NUTZUNG[2] else 0.0
-
-einnahmen = gehalt_haupt + gehalt_partner + kindergeld + kinderzuschlag + wohngeld + nebeneinkommen + sonstiges + miete_bestand_anrechenbar + miete_neu_calc
-ausgaben = var_lebenshaltung + var_bewirtschaftung + var_puffer + konsum + bauspar + rate_bestand + belastung_alte_miete
-frei = einnahmen - ausgaben
-annuitaet = zins + tilgung
-
-# Sozialleistungs-Check (Bank-Sicht)
-sozial_summe = kinderzuschlag + wohngeld
-frei_bank = frei - sozial_summe
-
-# Max Kaufpreis
-max_kredit = (frei * 12 * 100) / annuitaet if (frei > 0 and annuitaet > 0) else 0
-max_preis = (max_kredit + eigenkapital) / (1 + (nk_prozent_gesamt/100))
-max_nk_euro = max_preis * (nk_prozent_gesamt / 100)
-
-# Wunsch Objekt
-wunsch_rate = 0.0
-wunsch_nk_euro = 0.0
-wunsch_invest = 0.0
-wunsch_darlehen = 0.0
-
-if wunsch_preis > 0:
-    wunsch_nk_euro = wunsch_preis * (nk_prozent_gesamt/100)
-    wunsch_invest = wunsch_preis + wunsch_nk_euro + renovierung
-    wunsch_darlehen = wunsch_invest - eigenkapital
-    
-    if wunsch_darlehen > 0:
-        wunsch_rate = (wunsch_darlehen * annuitaet) / 100 / 12
-    else:
-        wunsch_rate = 0
+eingaben = Eingaben(
+    name=kunden_name, nutzung=nutzungsart, wohnflaeche=wohnflaeche,
+    akt_miete=aktuelle_warmmiete, neue_miete=neue_miete_einnahme,
+    gehalt_h=gehalt_haupt, erwachsene=anzahl_erwachsene, gehalt_p=gehalt_partner, kinder=anzahl_kinder,
+    kinderzuschlag=kinderzuschlag, wohngeld=wohngeld, neben=nebeneinkommen, sonst=sonstiges,
+    lebenshaltung=var_lebenshaltung, bewirt=var_bewirtschaftung, puffer=var_puffer, konsum=konsum, bauspar=bauspar,
+    ek=eigenkapital, zins=zins, tilgung=tilgung, zinsbindung=zinsbindung, sondertilgung=sondertilgung, miete_bestand=miete_bestand_raw, rate_bestand=rate_bestand,
+    grunderwerb=grunderwerb, notar=notar, makler=makler, wunsch_preis=wunsch_preis, renovierung=renovierung,
+)
+messung.stop("eingaben")
+# Rechengraph pro Session: nur von geänderten Eingaben abhängige Größen neu rechnen
+if "_rechengraph" not in st.session_state: st.session_state._rechengraph = Rechengraph()
+rechengraph = st.session_state._rechengraph
+with messung.phase("rechnung"):
+    rechengraph.setze(eingaben.as_dict())
+    res = rechengraph.ergebnis()
+
+# ==========================================
+# 🧩 FRAGMENTE (laufen bei eigenen Widgets einzeln neu)
+# ==========================================
+@st.fragment
+@gemessen
+def zeige_haushalt(e, res):
+    st.markdown(f"### 🎯 Analyse für: {e.name}")
+    st.subheader("💰 Haushaltsrechnung")
+
+    with messung.phase("tabellen"):
+        ein_liste = []
+        if e.gehalt_h > 0: ein_liste.append(["Gehalt Haupt", e.gehalt_h])
+        if e.gehalt_p > 0: ein_liste.append(["Gehalt Partner", e.gehalt_p])
+        if res.kindergeld > 0: ein_liste.append(["Kindergeld", res.kindergeld])
+        if e.kinderzuschlag > 0: ein_liste.append(["Kinderzuschlag*", e.kinderzuschlag])
+        if e.wohngeld > 0: ein_liste.append(["Wohngeld*", e.wohngeld])
+        if e.neben > 0: ein_liste.append(["Nebentätigkeit", e.neben])
+        if e.sonst > 0: ein_liste.append(["Sonstiges", e.sonst])
+        if res.miete_bestand_anrechenbar > 0: ein_liste.append(["Miete Bestand (Netto)", res.miete_bestand_anrechenbar])
+        if res.miete_neu_calc > 0: ein_liste.append(["Miete Neu (Kalk.)", res.miete_neu_calc])
+
+        st.dataframe([{"Posten": p, "Betrag": b} for p, b in ein_liste], hide_index=True, use_container_width=True)
+    st.success(f"Einnahmen: **{eur(res.einnahmen)}**")
 
-diff_miete = None
-if aktuelle_warmmiete > 0 and nutzungsart != OPTIONS_NUTZUNG[2]:
-    neue_wohnkosten = frei + var_bewirtschaftung + var_puffer
-    diff_miete = neue_wohnkosten - aktuelle_warmmiete
+    # WARNUNG WENN SOZIALLEISTUNGEN
+    if res.sozial_summe > 0:
+        st.warning(f"⚠️ Hinweis: {eur(res.sozial_summe)} sind Sozialleistungen. Banken setzen oft nur {eur(res.einnahmen - res.sozial_summe)} an.")
+
+    st.markdown("---")
+    aus_liste = zip(
+        ["Lebenshaltung", "Bewirtschaftung", "Puffer", "Kredite/Spar", "Bestand", "Alte Miete"],
+        [e.lebenshaltung, e.bewirt, e.puffer, e.konsum + e.bauspar, e.rate_bestand, res.belastung_alte_miete]
+    )
+    with messung.phase("tabellen"):
+        st.dataframe([{"Posten": p, "Betrag": b} for p, b in aus_liste if b > 0], hide_index=True, use_container_width=True)
+    st.error(f"Ausgaben: **{eur(res.ausgaben)}**")
+
+@st.fragment
+@gemessen
+def zeige_ergebnis(e, res):
+    st.subheader("🏠 Ergebnis")
+    if res.frei < 0:
+        st.error(f"⚠️ **Unterdeckung: {eur(abs(res.frei))}**")
+        return
+    st.info(f"🏦 Verfügbare Rate (Haushalt): **{eur(res.frei)}**")
+
+    # WARNUNG BANK-SICHT
+    if res.sozial_summe > 0 and res.frei_bank < 0:
+        st.error(f"❌ Bank-Sicht (ohne Soziall.): Unterdeckung {eur(abs(res.frei_bank))}")
+    elif res.sozial_summe > 0:
+        st.warning(f"⚠️ Bank-Sicht (ohne Soziall.): nur {eur(res.frei_bank)} verfügbar.")
+
+    if res.diff_miete is not None:
+        st.markdown("#### Miete vs. Eigentum")
+        if res.diff_miete > 0:
+            st.warning(f"Mehrbelastung: **{eur(res.diff_miete)}**")
+        else:
+            st.success(f"Ersparnis: **{eur(abs(res.diff_miete))}**")
+        st.caption("Vergleich: Alte Miete vs. Rate + Nebenkosten + Puffer")
+        st.markdown("---")
+
+@st.fragment
+@gemessen
+def zeige_wunsch_check(e, res):
+    st.write(f"**Check {eur(e.wunsch_preis)} Objekt:**")
+    col_a, col_b = st.columns(2)
+    col_a.metric("Nötige Rate", eur(res.wunsch_rate))
+    if res.machbar:
+        col_b.success("✅ MACHBAR")
+        # Zusatzcheck Bank
+        if res.sozial_summe > 0 and res.wunsch_rate > res.frei_bank:
+            st.caption("⚠️ Aber kritisch bei Bank ohne Sozialleistungen.")
+    else:
+        col_b.error("❌ ZU TEUER")
+        st.caption(f"Fehlt: {eur(res.wunsch_rate - res.frei)}")
+
+    with st.expander("Details Investition"):
+        st.write(f"Kaufpreis: {eur(e.wunsch_preis)}")
+        st.write(f"+ Nebenkosten ({res.nk_prozent_gesamt:.2f}%): {eur(res.wunsch_nk_euro)}")
+        if e.renovierung > 0:
+            st.write(f"+ Renovierung: {eur(e.renovierung)}")
+        st.write(f"- Eigenkapital: {eur(e.ek)}")
+        st.write(f"**= Darlehen: {eur(res.wunsch_darlehen)}**")
+
+    if res.wunsch_darlehen <= 0:
+        return
+
+    import plotly.express as px
+    from tilgung import tilgungsplan
+
+    with st.expander("📉 Tilgungsplan"):
+        plan = tilgungsplan(res.wunsch_darlehen, e.zins, e.tilgung, e.zinsbindung,
+                            {j: e.sondertilgung for j in range(1, e.zinsbindung + 1)})
+        col_r, col_z, col_l = st.columns(3)
+        col_r.metric(f"Restschuld nach {e.zinsbindung} J.", eur(plan.restschuld_zinsbindung))
+        col_z.metric("Zinsen (Zinsbindung)", eur(plan.zinsen_zinsbindung))
+        if plan.laufzeit_monate:
+            col_l.metric("Schuldenfrei nach", f"{plan.laufzeit_monate / 12:.1f}".replace(".", ",") + " J.")
+            st.caption(f"Zinsen über die gesamte Laufzeit: {eur(plan.zinsen_gesamt)} (bei gleichem Zins nach der Zinsbindung)")
+        else:
+            col_l.metric("Schuldenfrei nach", "> 50 J.")
+
+        with messung.phase("tabellen"):
+            jahre = plan.jahresuebersicht()
+            df_plan = {
+                "Jahr": jahre["jahr"].tolist(), "Zinsen": jahre["zinsen"].round(2).tolist(), "Tilgung": jahre["tilgung"].round(2).tolist(),
+                "Sondertilgung": jahre["sondertilgung"].round(2).tolist(), "Restschuld": jahre["restschuld"].round(2).tolist(),
+            }
+        fig_plan = px.area(df_plan, x="Jahr", y="Restschuld", title="Restschuld-Verlauf")
+        fig_plan.add_vline(x=e.zinsbindung, line_dash="dot", annotation_text="Ende Zinsbindung", line_color="orange")
+        st.plotly_chart(fig_plan, use_container_width=True, config={'staticPlot': True})
+        st.dataframe(df_plan, hide_index=True, use_container_width=True)
+
+    if plan.restschuld_zinsbindung <= 0:
+        return
+
+    with st.expander("🎲 Anschlussfinanzierung (Monte Carlo)"):
+        mc = anschluss_risiko(plan.restschuld_zinsbindung, e.zins, e.tilgung, e.zinsbindung, res.frei, res.frei_bank)
+        col_m, col_h, col_b = st.columns(3)
+        col_m.metric("Anschlussrate (Median)", eur(mc["rate_perzentile"][50]), delta=eur(mc["rate_perzentile"][50] - mc["rate_heute"]), delta_color="inverse")
+        col_h.metric("Risiko > Haushalt", f"{mc['p_ueber_frei'] * 100:.1f} %".replace(".", ","))
+        col_b.metric("Risiko > Bank-Sicht", f"{mc['p_ueber_frei_bank'] * 100:.1f} %".replace(".", ","))
+
+        fig_mc = px.histogram(x=mc["anschluss_rate"], nbins=80, title=f"Anschlussrate nach {e.zinsbindung} J. ({mc['n_pfade']:,} Zinspfade)".replace(",", "."))
+        fig_mc.add_vline(x=res.frei, line_dash="dot", annotation_text="Verfügbar", line_color="green")
+        if res.sozial_summe > 0:
+            fig_mc.add_vline(x=res.frei_bank, line_dash="dot", annotation_text="Bank-Sicht", line_color="red")
+        fig_mc.update_layout(showlegend=False, xaxis_title="€ / Monat", yaxis_title="Pfade")
+        st.plotly_chart(fig_mc, use_container_width=True, config={'staticPlot': True})
+
+        perz = [f"P{p}" for p in mc["zins_perzentile"]]
+        df_faecher = {"Jahr": mc["faecher_jahre"].tolist(), **{p: mc["faecher"][:, i].tolist() for i, p in enumerate(perz)}}
+        fig_faecher = px.line(df_faecher, x="Jahr", y=perz, title="Zins-Perzentilbänder bis zur Anschlussfinanzierung")
+        fig_faecher.update_layout(yaxis_title="Zins (%)", legend_title=None)
+        st.plotly_chart(fig_faecher, use_container_width=True, config={'staticPlot': True})
+
+        st.dataframe({
+            "Perzentil": perz,
+            "Anschlusszins (%)": [round(z, 2) for z in mc["zins_perzentile"].values()],
+            "Anschlussrate": [eur(r) for r in mc["rate_perzentile"].values()],
+        }, hide_index=True, use_container_width=True)
+        st.caption("Modell: Vasicek-Zinsprozess (langfristig 3,5 %), gleiche Tilgung nach der Zinsbindung. Keine Prognose.")
+
+@st.fragment
+@gemessen
+def zeige_export(e, res, snap):
+    safe_name = e.name.replace(" ", "_")
+    hat_plan = e.wunsch_preis > 0 and res.wunsch_darlehen > 0
+    mit_plan = hat_plan and st.checkbox("Tilgungsplan als Anhang (Monat für Monat)", key="pdf_tilgungsplan")
+
+    # PDF rendert im Hintergrund-Pool; JSON/Excel erst beim Klick (Klick löst keinen Rerun aus)
+    pdf_download("📄 PDF Zertifikat", (e, mit_plan), functools.partial(pdf_rendern, vorlage=zertifikat_vorlage()),
+                 f"{safe_name}_Finanzcheck.pdf")
+    if hat_plan:
+        st.download_button("📊 Tilgungsplan (Excel)", data=lambda: xlsx_bytes(e, res), file_name=f"{safe_name}_Tilgungsplan.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", on_click="ignore")
+    st.download_button("💾 Daten sichern (JSON)", data=lambda: sicherung_bytes(snap), file_name=f"{safe_name}_Daten.json", mime="application/json", on_click="ignore")
+    st.download_button("🗜 Archiv (kompakt)", data=lambda: sicherung_bytes(snap, archiv=True), file_name=f"{safe_name}.immo",
+                       mime="application/octet-stream", on_click="ignore", help="Nur Abweichungen von den Vorgaben, binär. Lässt sich oben wieder laden.")
+
+@st.fragment
+@gemessen
+def zeige_chart(e, res):
+    with messung.phase("chart"):
+        import plotly.express as px
+        fig = px.bar(
+            x=["Einnahmen", "Ausgaben", "Budget"],
+            y=[res.einnahmen, res.ausgaben, max(res.frei, 0)],
+            color=["1", "2", "3"],
+            color_discrete_sequence=["green", "red", "blue"],
+            title=f"Liquiditäts-Check: {e.name}"
+        )
+        if e.wunsch_preis > 0:
+            fig.add_hline(y=res.wunsch_rate, line_dash="dot", annotation_text="Nötige Rate (Wunsch)", line_color="orange")
+        fig.update_layout(showlegend=False)
+    st.plotly_chart(fig, use_container_width=True, config={'staticPlot': True})
+
+@st.fragment
+@gemessen
+def zeige_sensitivitaet(e):
+    with st.expander("🎛 Sensitivität: Zins × Tilgung × Eigenkapital"):
+        import plotly.express as px
+        from sensitivitaet import ek_stufen, profil_schluessel
+        stufen = tuple(ek_stufen(e.ek).tolist())
+        grid = sensitivitaet_gitter(profil_schluessel(e), stufen)
+
+        col_k, col_e = st.columns(2)
+        kennzahlen = ["Max. Kaufpreis"] + (["Nötige Rate (Wunsch)"] if e.wunsch_preis > 0 else [])
+        kennzahl = col_k.radio("Kennzahl", kennzahlen, horizontal=True)
+        ek_wahl = col_e.select_slider("Eigenkapital", options=stufen, value=float(e.ek), format_func=eur)
+        i_ek = stufen.index(ek_wahl)
+
+        werte = grid["max_preis"][i_ek] if kennzahl == kennzahlen[0] else grid["wunsch_rate"][i_ek]
+        fig_sens = px.imshow(
+            werte, x=[f"{z:.1f}" for z in grid["zins"]], y=[f"{t:.2f}" for t in grid["tilgung"]],
+            origin="lower", aspect="auto", color_continuous_scale="RdYlGn" if kennzahl == kennzahlen[0] else "RdYlGn_r",
+            labels={"x": "Zins (%)", "y": "Tilgung (%)", "color": "€"}, title=f"{kennzahl} bei EK {eur(ek_wahl)}",
+        )
+        st.plotly_chart(fig_sens, use_container_width=True)
+        if kennzahl != kennzahlen[0]:
+            anteil = grid["machbar"][i_ek].mean() * 100
+            st.caption(f"Verfügbare Rate: {eur(grid['frei'])} – machbar in {anteil:.0f} % der Kombinationen.")
+
+def vergleich_anheften_callback(eingaben_dict, vorschlag):
+    st.session_state._vergleich.append({"titel": st.session_state.get("vgl_titel") or vorschlag, "eingaben": eingaben_dict})
+    st.session_state.vgl_titel = ""
+
+def vergleich_entfernen_callback(weg):
+    st.session_state._vergleich = [s for i, s in enumerate(st.session_state._vergleich) if i not in weg]
+    st.session_state.vgl_entfernen = []
+
+@st.fragment
+@gemessen
+def zeige_vergleich(e):
+    with st.expander("⚖️ Szenario-Vergleich"):
+        if "_vergleich" not in st.session_state: st.session_state._vergleich = []
+        angeheftet = st.session_state._vergleich
+
+        vorschlag = f"{e.name} – {e.nutzung.split(' (')[0]}" + (f" – {eur(e.wunsch_preis)}" if e.wunsch_preis > 0 else "")
+        col_t, col_p = st.columns([3, 1], vertical_alignment="bottom")
+        col_t.text_input("Titel", key="vgl_titel", placeholder=vorschlag)
+        col_p.button("📌 Aktuelles Szenario anheften", on_click=vergleich_anheften_callback, args=(e.as_dict(), vorschlag), use_container_width=True)
+
+        if not angeheftet:
+            st.caption("Noch keine Szenarien angeheftet. Eingaben ändern und jeweils anheften.")
+            return
+
+        # Alle angehefteten Szenarien in einem Batch-Durchlauf
+        from batch_engine import berechne_viele
+        szenarien = [(s["titel"], Eingaben(**s["eingaben"])) for s in angeheftet]
+        ergebnisse = berechne_viele([se for _, se in szenarien])
+
+        def urteil(se, r):
+            if r.frei < 0: return "⚠️ Unterdeckung"
+            if se.wunsch_preis <= 0: return "–"
+            return "✅ MACHBAR" if r.machbar else "❌ ZU TEUER"
+
+        zeilen = {
+            "Nutzung": [se.nutzung.split(" (")[0] for _, se in szenarien],
+            "Einnahmen": [eur(r.einnahmen) for r in ergebnisse],
+            "Ausgaben": [eur(r.ausgaben) for r in ergebnisse],
+            "Freie Rate": [eur(r.frei) for r in ergebnisse],
+            "Freie Rate (Bank)": [eur(r.frei_bank) for r in ergebnisse],
+            "Max. Kaufpreis": [eur(r.max_preis) for r in ergebnisse],
+            "Wunsch-Objekt": [eur(se.wunsch_preis) if se.wunsch_preis > 0 else "–" for _, se in szenarien],
+            "Nötige Rate": [eur(r.wunsch_rate) if se.wunsch_preis > 0 else "–" for (_, se), r in zip(szenarien, ergebnisse)],
+            "Ergebnis": [urteil(se, r) for (_, se), r in zip(szenarien, ergebnisse)],
+        }
+        namen = [f"{i}. {t}" for i, (t, _) in enumerate(szenarien, 1)]
+        st.dataframe([{"Kennzahl": k, **dict(zip(namen, v))} for k, v in zeilen.items()], hide_index=True, use_container_width=True)
+
+        import plotly.express as px
+        fig_vgl = px.bar(
+            {"Szenario": namen * 2, "Betrag": [r.frei for r in ergebnisse] + [r.wunsch_rate for r in ergebnisse],
+             "Kennzahl": ["Freie Rate"] * len(namen) + ["Nötige Rate"] * len(namen)},
+            x="Szenario", y="Betrag", color="Kennzahl", barmode="group",
+            color_discrete_sequence=["blue", "orange"], title="Freie Rate vs. nötige Rate",
+        )
+        fig_vgl.update_layout(legend_title=None, yaxis_title="€ / Monat")
+        st.plotly_chart(fig_vgl, use_container_width=True, config={'staticPlot': True})
+
+        col_x, col_d = st.columns([3, 1], vertical_alignment="bottom")
+        weg = col_x.multiselect("Entfernen", range(len(namen)), format_func=lambda i: namen[i], key="vgl_entfernen")
+        if weg:
+            col_x.button("Ausgewählte entfernen", on_click=vergleich_entfernen_callback, args=(weg,))
+        with col_d:
+            pdf_download("📄 Vergleich als PDF", szenarien, functools.partial(vergleich_pdf_rendern, vorlage=zertifikat_vorlage()),
+                         "Szenario_Vergleich.pdf", use_container_width=True)
+
+@st.fragment
+@gemessen
+def zeige_screener(e):
+    with st.expander("🏘 Angebots-Screener (CSV)"):
+        from screener import SORTIERBAR, seite
+        datei = st.file_uploader("Angebote (CSV mit Kaufpreis, Wohnfläche, optional Kaltmiete)", type=["csv"], key="scr_datei")
+        if datei is None:
+            st.caption("Spalten werden am Namen erkannt, z.B. `Objekt;Kaufpreis;Wohnfläche;Kaltmiete`. Haushalt = aktuelle Eingaben.")
+            return
+        try:
+            erg = screener_ergebnis(datei.getvalue(), e.as_dict())
+        except ValueError as fehler:
+            st.error(f"Fehler: {fehler}")
+            return
+        n = len(erg["preis"])
+        if n == 0:
+            st.warning("Keine Angebote mit gültigem Kaufpreis gefunden.")
+            return
+
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Angebote", f"{n:,}".replace(",", "."))
+        col_b.metric("Machbar (Haushalt)", f"{int(erg['machbar'].sum()):,}".replace(",", "."))
+        col_c.metric("Machbar (Bank-Sicht)", f"{int(erg['machbar_bank'].sum()):,}".replace(",", "."))
+
+        col_s, col_r, col_f, col_p = st.columns([2, 1, 1, 1], vertical_alignment="bottom")
+        sortierung = col_s.selectbox("Sortieren nach", list(SORTIERBAR), key="scr_sortierung")
+        absteigend = col_r.toggle("Absteigend", value=True, key="scr_absteigend")
+        nur_machbar = col_f.checkbox("Nur machbar", key="scr_nur_machbar")
+        pro_seite = 50
+        treffer_max = int(erg["machbar"].sum()) if nur_machbar else n
+        seiten = max((treffer_max + pro_seite - 1) // pro_seite, 1)
+        nummer = col_p.number_input(f"Seite (von {seiten})", min_value=1, max_value=seiten, value=1, key="scr_seite")
+
+        idx, treffer = seite(erg, SORTIERBAR[sortierung], absteigend, nur_machbar, min(nummer, seiten), pro_seite)
+        # Nur die sichtbare Seite formatieren
+        st.dataframe([{
+            "Objekt": erg["titel"][i],
+            "Kaufpreis": eur(erg["preis"][i]),
+            "m²": "–" if erg["wohnflaeche"][i] != erg["wohnflaeche"][i] else f"{erg['wohnflaeche'][i]:.0f}",
+            "Nebenkosten": eur(erg["nk"][i]),
+            "Bewirtschaftung": eur(erg["bewirt"][i]),
+            "Nötige Rate": eur(erg["rate"][i]),
+            "Lücke (Haushalt)": eur(erg["luecke"][i]),
+            "Lücke (Bank)": eur(erg["luecke_bank"][i]),
+            "Ergebnis": "✅" if erg["machbar"][i] else "❌",
+        } for i in idx.tolist()], hide_index=True, use_container_width=True)
+        st.caption(f"{treffer:,} Treffer, Seite {min(nummer, seiten)} von {seiten}. Lücke = freie Rate − nötige Rate (negativ = fehlt).".replace(",", "."))
+
+@st.fragment
+@gemessen
+def zeige_optimierer(e, res):
+    with st.expander("🧭 Finanzierungs-Optimierer"):
+        from optimierer import ZIELE
+        col_z, col_b, col_r = st.columns(3)
+        ziel = col_z.radio("Ziel", list(ZIELE), format_func=ZIELE.get, key="opt_ziel")
+        sicht = col_b.radio("Budget", ["Haushalt (frei)", "Bank-Sicht (frei_bank)"], key="opt_budget")
+        ek_reserve = col_r.number_input("EK-Reserve behalten", 0.0, float(max(e.ek, 0.0)), 0.0, step=1000.0, key="opt_reserve")
+        budget = res.frei if sicht.startswith("Haushalt") else res.frei_bank
+        if budget <= 0:
+            st.info("Kein freies Budget für eine Rate.")
+            return
+
+        investition = e.wunsch_preis + res.wunsch_nk_euro + e.renovierung
+        plaene, stat = finanzierungs_plaene(investition, e.ek, e.zins, e.zinsbindung, budget, ziel, ek_reserve)
+        if not plaene:
+            st.warning("Kein Plan passt ins Budget.")
+            return
+        st.dataframe([{
+            "Tilgung": f"{p['tilgung']:.1f} %".replace(".", ","),
+            "Sondertilgung p.a.": eur(p["sondertilgung"]),
+            "EK-Einsatz": eur(p["ek_einsatz"]),
+            "Darlehen": eur(p["darlehen"]),
+            "Rate": eur(p["rate"]),
+            "Luft im Budget": eur(p["budget_rest"]),
+            f"Zinsen {e.zinsbindung} J.": eur(p["zinsen_zinsbindung"]),
+            f"Restschuld nach {e.zinsbindung} J.": eur(p["restschuld_zinsbindung"]),
+            "Zinsen gesamt": eur(p["zinsen_gesamt"]),
+        } for p in plaene], hide_index=True, use_container_width=True)
+        st.caption(f"{stat['kandidaten_grob'] + stat['kandidaten_fein']:,} Kandidaten in {stat['sekunden'] * 1000:.0f} ms geprüft. "
+                   "Rate + Sondertilgung/12 ≤ Budget; Sondertilgung höchstens 5 % des Darlehens p.a.".replace(",", "."))
+
+@st.fragment
+@gemessen
+def zeige_banken(e):
+    with st.expander("🏦 Bank-Vergleich (Richtwerte je Bank)"):
+        from banken import vergleiche_banken
+        bk = bank_profile()
+        r = vergleiche_banken(e, bk)
+
+        def urteil(i):
+            if r["frei_bank"][i] < 0: return "⚠️ Unterdeckung"
+            if e.wunsch_preis <= 0: return "–"
+            return "✅ MACHBAR" if r["machbar"][i] else "❌ ZU TEUER"
+
+        st.dataframe([{
+            "Bank": bk.namen[i],
+            "Lebenshaltung": eur(r["lebenshaltung"][i]),
+            "Bewirtschaftung": eur(r["bewirt"][i]),
+            "Einnahmen (anrechenbar)": eur(r["einnahmen"][i]),
+            "Freie Rate (Bank)": eur(r["frei_bank"][i]),
+            "Zins": f"{r['zins'][i]:.2f} %".replace(".", ","),
+            "Max. Kaufpreis": eur(r["max_preis"][i]),
+            "Nötige Rate": eur(r["wunsch_rate"][i]) if e.wunsch_preis > 0 else "–",
+            "Ergebnis": urteil(i),
+        } for i in range(len(bk))], hide_index=True, use_container_width=True)
+        st.caption("Lebenshaltung und Bewirtschaftung nach den Pauschalen der jeweiligen Bank (nicht nach den Eingaben). "
+                   "Max. Kaufpreis aus der Freien Rate der Bank.")
+
+@st.fragment
+@gemessen
+def zeige_portfolio(daten):
+    with st.expander("🏢 Bestandsportfolio"):
+        import plotly.express as px
+        from portfolio import Portfolio
+        p = Portfolio.from_dict(daten)
+        agg = p.aggregat()
+
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Einheiten", agg["einheiten"])
+        c2.metric("Kaltmiete / Monat", eur(agg["miete"]), help=f"Davon angerechnet: {eur(agg['miete_anrechenbar'])}")
+        c3.metric("Raten / Monat", eur(agg["rate"]))
+        c4.metric("Restschuld", eur(agg["restschuld"]), help=f"Ø Zins (gewichtet): {agg['zins_mittel']:.2f} %".replace(".", ","))
+
+        auslauf = p.zinsbindung_auslauf()
+        if len(auslauf["jahr"]):
+            st.markdown("##### Auslaufende Zinsbindungen")
+            st.dataframe({"Jahr": auslauf["jahr"].tolist(), "Einheiten": auslauf["einheiten"].tolist(),
+                          "Restschuld heute": [eur(x) for x in auslauf["restschuld"]]}, hide_index=True, use_container_width=True)
+
+        st.markdown("##### Cashflow-Projektion")
+        col_j, col_z, col_m = st.columns(3)
+        jahre = col_j.slider("Jahre", 5, 40, 20, key="pf_jahre")
+        anschluss = col_z.number_input("Anschlusszins (%)", value=round(max(agg["zins_mittel"], 4.0), 2), step=0.1, min_value=0.0, key="pf_anschluss")
+        steigerung = col_m.number_input("Mietsteigerung p.a. (%)", value=1.5, step=0.5, min_value=0.0, key="pf_miete")
+        cf = p.cashflow(jahre, anschluss, steigerung)
+        df_cf = {
+            "Jahr": cf["jahr"].tolist(), "Cashflow": cf["cashflow"].round(2).tolist(), "Miete": cf["miete"].round(2).tolist(),
+            "Zinsen": cf["zinsen"].round(2).tolist(), "Tilgung": cf["tilgung"].round(2).tolist(), "Restschuld": cf["restschuld"].round(2).tolist(),
+        }
+        fig_cf = px.bar(df_cf, x="Jahr", y="Cashflow", title="Jährlicher Cashflow (Kaltmiete − Raten)")
+        fig_cf.update_layout(yaxis_title="€ / Jahr")
+        st.plotly_chart(fig_cf, use_container_width=True, config={'staticPlot': True})
+        fig_rs = px.line(df_cf, x="Jahr", y="Restschuld", title="Restschuld Portfolio (Jahresende)")
+        st.plotly_chart(fig_rs, use_container_width=True, config={'staticPlot': True})
+        st.caption("Vereinfachung: Raten bleiben nach der Zinsbindung gleich, nur der Zins wechselt. Keine Kosten/Leerstand.")
+        with st.expander("Einheiten"):
+            st.dataframe(daten, use_container_width=True)
+
+def _zahl(wert):
+    if isinstance(wert, bool) or not isinstance(wert, (int, float)):
+        return str(wert)
+    return zahl_de(wert)
+
+def _rechenweg_md(knoten, ebene=0):
+    neu = " 🔄" if knoten.get("neu") else ""
+    formel = f" — _{knoten['formel']}_" if knoten.get("formel") else ""
+    zeilen = [f"{'  ' * ebene}- **{knoten['name']}** = {_zahl(knoten['wert'])}{formel}{neu}"]
+    for d in knoten["deps"]:
+        zeilen += _rechenweg_md(d, ebene + 1)
+    return zeilen
+
+@st.fragment
+@gemessen
+def zeige_rechenweg(graph):
+    with st.expander("🔍 Rechenweg (Audit)"):
+        ziel = st.selectbox("Warum hat dieser Wert diese Höhe?", graph.reihenfolge, index=graph.reihenfolge.index("max_preis"))
+        st.markdown("\n".join(_rechenweg_md(graph.erklaere(ziel))))
+        st.caption(f"🔄 = in diesem Durchlauf neu berechnet ({len(graph.zuletzt_berechnet)} von {len(graph.reihenfolge)} Knoten)")
+        st.dataframe([{**z, "Wert": _zahl(z["Wert"])} for z in graph.als_zeilen()], hide_index=True, use_container_width=True)
 
 # UI ANZEIGE
 col1, col2 = st.columns(2)
 with col1:
-    st.markdown(f"### 🎯 Analyse für: {kunden_name}")
-    st.subheader("💰 Haushaltsrechnung")
-    
-    ein_liste = []
-    if gehalt_haupt > 0: ein_liste.append(["Gehalt Haupt", gehalt_haupt])
-    if gehalt_partner > 0: ein_liste.append(["Gehalt Partner", gehalt_partner])
-    if kindergeld > 0: ein_liste.append(["Kindergeld", kindergeld])
-    if kinderzuschlag > 0: ein_liste.append(["Kinderzuschlag*", kinderzuschlag])
-    if wohngeld > 0: ein_liste.append(["Wohngeld*", wohngeld])
-    if nebeneinkommen > 0: ein_liste.append(["Nebentätigkeit", nebeneinkommen])
-    if sonstiges > 0: ein_liste.append(["Sonstiges", sonstiges])
-    if miete_bestand_anrechenbar > 0: ein_liste.append(["Miete Bestand (Netto)", miete_bestand_anrechenbar])
-    if miete_neu_calc > 0: ein_liste.append(["Miete Neu (Kalk.)", miete_neu_calc])
-    
-    df_in = pd.DataFrame(ein_liste, columns=["Posten", "Betrag"])
-    st.dataframe(df_in, hide_index=True, use_container_width=True)
-    st.success(f"Einnahmen: **{eur(einnahmen)}**")
-    
-    # WARNUNG WENN SOZIALLEISTUNGEN
-    if sozial_summe > 0:
-        st.warning(f"⚠️ Hinweis: {eur(sozial_summe)} sind Sozialleistungen. Banken setzen oft nur {eur(einnahmen - sozial_summe)} an.")
-    
-    st.markdown("---")
-    df_out = pd.DataFrame({
-        "Posten": ["Lebenshaltung", "Bewirtschaftung", "Puffer", "Kredite/Spar", "Bestand", "Alte Miete"],
-        "Betrag": [var_lebenshaltung, var_bewirtschaftung, var_puffer, konsum+bauspar, rate_bestand, belastung_alte_miete]
-    })
-    st.dataframe(df_out[df_out["Betrag"] > 0], hide_index=True, use_container_width=True)
-    st.error(f"Ausgaben: **{eur(ausgaben)}**")
+    zeige_haushalt(eingaben, res)
 
 with col2:
-    st.subheader("🏠 Ergebnis")
-    if frei < 0:
-        st.error(f"⚠️ **Unterdeckung: {eur(abs(frei))}**")
-    else:
-        st.info(f"🏦 Verfügbare Rate (Haushalt): **{eur(frei)}**")
-        
-        # WARNUNG BANK-SICHT
-        if sozial_summe > 0 and frei_bank < 0:
-            st.error(f"❌ Bank-Sicht (ohne Soziall.): Unterdeckung {eur(abs(frei_bank))}")
-        elif sozial_summe > 0:
-            st.warning(f"⚠️ Bank-Sicht (ohne Soziall.): nur {eur(frei_bank)} verfügbar.")
-
-        if diff_miete is not None:
-            st.markdown("#### Miete vs. Eigentum")
-            if diff_miete > 0:
-                st.warning(f"Mehrbelastung: **{eur(diff_miete)}**")
-            else:
-                st.success(f"Ersparnis: **{eur(abs(diff_miete))}**")
-            st.caption("Vergleich: Alte Miete vs. Rate + Nebenkosten + Puffer")
-            st.markdown("---")
-
-        if wunsch_preis > 0:
-            st.write(f"**Check {eur(wunsch_preis)} Objekt:**")
-            col_a, col_b = st.columns(2)
-            col_a.metric("Nötige Rate", eur(wunsch_rate))
-            if wunsch_rate <= frei:
-                col_b.success("✅ MACHBAR")
-                # Zusatzcheck Bank
-                if sozial_summe > 0 and wunsch_rate > frei_bank:
-                    st.caption("⚠️ Aber kritisch bei Bank ohne Sozialleistungen.")
-            else:
-                col_b.error("❌ ZU TEUER")
-                st.caption(f"Fehlt: {eur(wunsch_rate - frei)}")
-            
-            with st.expander("Details Investition"):
-                st.write(f"Kaufpreis: {eur(wunsch_preis)}")
-                st.write(f"+ Nebenkosten ({nk_prozent_gesamt:.2f}%): {eur(wunsch_nk_euro)}")
-                if renovierung > 0:
-                    st.write(f"+ Renovierung: {eur(renovierung)}")
-                st.write(f"- Eigenkapital: {eur(eigenkapital)}")
-                st.write(f"**= Darlehen: {eur(wunsch_darlehen)}**")
+    zeige_ergebnis(eingaben, res)
+    if res.frei >= 0 and eingaben.wunsch_preis > 0:
+        zeige_wunsch_check(eingaben, res)
 
     # PDF & SAVE BUTTONS
-    safe_name = kunden_name.replace(" ", "_")
-    
-    pdf_data = {
-        "name": kunden_name, "scenario": nutzungsart, "ein_total": einnahmen, "aus_total": ausgaben, 
-        "frei": frei, "zins": zins, "tilg": tilgung, "kaufpreis": max_preis, 
-        "nk": max_nk_euro, "ek": eigenkapital, "kredit": max_kredit,
-        "wunsch_preis": wunsch_preis, "wunsch_rate": wunsch_rate, "wunsch_nk": wunsch_nk_euro, "wunsch_invest": wunsch_invest, "wunsch_darlehen": wunsch_darlehen,
-        "nk_prozent": nk_prozent_gesamt, "renovierung": renovierung,
-        "ein_haupt": gehalt_haupt, "ein_partner": gehalt_partner, "ein_kinder": kindergeld,
-        "ein_kinderzuschlag": kinderzuschlag, "ein_wohngeld": wohngeld, "sozial_summe": sozial_summe,
-        "ein_neben": nebeneinkommen, "ein_sonst": sonstiges, 
-        "ein_miete_bestand": miete_bestand_anrechenbar, "ein_miete_neu": miete_neu_calc,
-        "aus_leben": var_lebenshaltung, "aus_bewirt": var_bewirtschaftung, "qm": wohnflaeche,
-        "aus_puffer": var_puffer, "aus_konsum": konsum, "aus_bauspar": bauspar,
-        "aus_bestand": rate_bestand, "aus_miete": belastung_alte_miete,
-        "diff_miete": diff_miete, "alt_warm": aktuelle_warmmiete, "neu_last": (frei + var_bewirtschaftung + var_puffer) if frei > 0 else 0
-    }
-    
-    pdf_bytes = create_pdf(pdf_data)
-    st.download_button("📄 PDF Zertifikat", data=pdf_bytes, file_name=f"{safe_name}_Finanzcheck.pdf", mime="application/pdf")
-
-    save_data = st.session_state.to_dict()
-    json_str = json.dumps({k: v for k,v in save_data.items() if k.startswith(("sb_", "exp_", "renovierung"))})
-    st.download_button("💾 Daten sichern (JSON)", json_str, f"{safe_name}_Daten.json", "application/json")
+    with messung.phase("session_state"):
+        snap = schnappschuss()
+    zeige_export(eingaben, res, snap)
 
 st.divider()
-fig = px.bar(
-    x=["Einnahmen", "Ausgaben", "Budget"],
-    y=[einnahmen, ausgaben, max(frei, 0)],
-    color=["1", "2", "3"], 
-    color_discrete_sequence=["green", "red", "blue"],
-    title=f"Liquiditäts-Check: {kunden_name}"
-)
-if wunsch_preis > 0:
-    fig.add_hline(y=wunsch_rate, line_dash="dot", annotation_text="Nötige Rate (Wunsch)", line_color="orange")
-fig.update_layout(showlegend=False)
-st.plotly_chart(fig, use_container_width=True, config={'staticPlot': True})
+zeige_chart(eingaben, res)
+if st.session_state.get("sb_hat_bestand") and st.session_state.get("sb_bestand_modus") == OPTIONS_BESTAND[1] and st.session_state.get("sb_portfolio"):
+    zeige_portfolio(st.session_state.sb_portfolio)
+zeige_vergleich(eingaben)
+if eingaben.wunsch_preis > 0:
+    zeige_optimierer(eingaben, res)
+zeige_banken(eingaben)
+zeige_screener(eingaben)
+zeige_sensitivitaet(eingaben)
+zeige_rechenweg(rechengraph)
+
+# DEBUG (nur Admin, nur bei aktiver Messung)
+if messung.aktiv:
+    zeile = messung.schreibe()
+    if st.session_state.get("is_admin"):
+        from messung import auswerten
+        with st.expander("⏱ Profiling (Admin)"):
+            import format_de
+            st.caption(f"Dieser Rerun: {zeile['gesamt_ms']:.1f} ms gesamt · PDF-Cache {PDF_CACHE.stats()} · PDF-Jobs {PDF_JOBS.stats()}"
+                       f" · Formate {format_de.stats()['eur']}")
+            st.dataframe([{"Phase": k, "ms": v} for k, v in zeile["phasen"].items()], hide_index=True, use_container_width=True)
+            st.dataframe(auswerten(), hide_index=True, use_container_width=True)
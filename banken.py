@@ -0,0 +1,169 @@
+"""Deklarative Bank-Profile für die Haushaltsrechnung.
+
+Jede Bank rechnet mit eigenen Pauschalen: Lebenshaltung (Basis Single/Paar,
+pro Kind, Einkommens-Zuschläge), Anrechnung von Mieteinnahmen,
+Bewirtschaftung pro m² und ob Sozialleistungen als Einkommen zählen. Die
+Profile stehen in ``banken.json``. Sie werden einmal geladen und zu Arrays
+kompiliert. ``berechne_banken`` rechnet danach einen oder viele Haushalte
+gegen alle Banken gleichzeitig, als Broadcasting über (Haushalte × Banken).
+
+Das Profil ``STANDARD`` entspricht exakt den Konstanten aus ``engine``.
+"""
+import json
+import os
+
+import numpy as np
+
+from engine import (
+    ANRECHNUNG_MIETE_BESTAND, ANRECHNUNG_MIETE_NEU, BEWIRT_PRO_QM, EINKOMMENS_ZUSCHLAEGE, KINDERGELD,
+    LEBENSHALTUNG_PAAR, LEBENSHALTUNG_PRO_KIND, LEBENSHALTUNG_SINGLE,
+)
+from batch_engine import erwachsene_code, nutzung_code, spalten_aus_eingaben
+
+PFAD = os.environ.get("IMMO_BANKEN", os.path.join(os.path.dirname(os.path.abspath(__file__)), "banken.json"))
+
+
+class BankProfil:
+    __slots__ = (
+        "name", "basis_single", "basis_paar", "pro_kind", "zuschlaege",
+        "anrechnung_miete_bestand", "anrechnung_miete_neu", "bewirt_pro_qm",
+        "sozialleistungen_anrechnen", "zins",
+    )
+
+    def __init__(self, name, basis_single=LEBENSHALTUNG_SINGLE, basis_paar=LEBENSHALTUNG_PAAR,
+                 pro_kind=LEBENSHALTUNG_PRO_KIND, zuschlaege=EINKOMMENS_ZUSCHLAEGE,
+                 anrechnung_miete_bestand=ANRECHNUNG_MIETE_BESTAND, anrechnung_miete_neu=ANRECHNUNG_MIETE_NEU,
+                 bewirt_pro_qm=BEWIRT_PRO_QM, sozialleistungen_anrechnen=False, zins=None):
+        self.name = name
+        self.basis_single = float(basis_single)
+        self.basis_paar = float(basis_paar)
+        self.pro_kind = float(pro_kind)
+        # (Netto-Schwelle, Zuschlag): Zuschlag gilt, wenn Netto > Schwelle
+        self.zuschlaege = tuple((float(s), float(b)) for s, b in zuschlaege)
+        self.anrechnung_miete_bestand = float(anrechnung_miete_bestand)
+        self.anrechnung_miete_neu = float(anrechnung_miete_neu)
+        self.bewirt_pro_qm = float(bewirt_pro_qm)
+        self.sozialleistungen_anrechnen = bool(sozialleistungen_anrechnen)
+        # Optionaler Konditionszins der Bank (None = Zins aus den Eingaben)
+        self.zins = None if zins is None else float(zins)
+
+    def as_dict(self):
+        d = {k: getattr(self, k) for k in self.__slots__}
+        d["zuschlaege"] = [list(z) for z in self.zuschlaege]
+        return d
+
+    def __repr__(self):
+        return f"BankProfil({self.name!r})"
+
+
+STANDARD = BankProfil("Standard (Richtwerte)")
+
+
+def lade_profile(pfad=None):
+    """Liest die Bank-Profile aus JSON (Liste von Dicts; fehlende Felder = Standard)."""
+    with open(pfad or PFAD, encoding="utf-8") as f:
+        roh = json.load(f)
+    profile = []
+    for eintrag in roh:
+        unbekannt = set(eintrag) - set(BankProfil.__slots__)
+        if unbekannt:
+            raise ValueError(f"Bank {eintrag.get('name', '?')}: unbekannte Felder {', '.join(sorted(unbekannt))}")
+        profile.append(BankProfil(**eintrag))
+    return profile
+
+
+# ==========================================
+# ⚙️ KOMPILIEREN
+# ==========================================
+class KompilierteBanken:
+    """Alle Profile als Arrays der Form (Banken,); Zuschläge als (Banken, Stufen)."""
+
+    __slots__ = ("namen", "basis_single", "basis_paar", "pro_kind", "schwellen", "betraege",
+                 "anrechnung_miete_bestand", "anrechnung_miete_neu", "bewirt_pro_qm", "sozial", "zins")
+
+    def __init__(self, profile):
+        stufen = max((len(p.zuschlaege) for p in profile), default=0)
+        # Fehlende Stufen: Schwelle unendlich, Zuschlag 0 -> greifen nie
+        self.schwellen = np.full((len(profile), stufen), np.inf)
+        self.betraege = np.zeros((len(profile), stufen))
+        for i, p in enumerate(profile):
+            for k, (schwelle, betrag) in enumerate(p.zuschlaege):
+                self.schwellen[i, k] = schwelle
+                self.betraege[i, k] = betrag
+        self.namen = [p.name for p in profile]
+        for feld in ("basis_single", "basis_paar", "pro_kind", "anrechnung_miete_bestand",
+                     "anrechnung_miete_neu", "bewirt_pro_qm"):
+            setattr(self, feld, np.array([getattr(p, feld) for p in profile]))
+        self.sozial = np.array([p.sozialleistungen_anrechnen for p in profile])
+        self.zins = np.array([np.nan if p.zins is None else p.zins for p in profile])
+
+    def __len__(self):
+        return len(self.namen)
+
+
+def kompiliere(profile):
+    return KompilierteBanken(profile)
+
+
+# ==========================================
+# 🧮 RECHNUNG (HAUSHALTE × BANKEN)
+# ==========================================
+def berechne_banken(sp, bk):
+    """Rechnet ein Spalten-Dict (wie ``batch_engine``) gegen alle Banken.
+
+    Lebenshaltung und Bewirtschaftung kommen aus den Bank-Pauschalen (nicht
+    aus den Eingaben). Alle Ergebnis-Arrays haben die Form (Haushalte, Banken).
+    """
+    f = {k: np.asarray(sp[k], dtype=np.float64)[:, None] for k in (
+        "gehalt_h", "gehalt_p", "kinder", "kinderzuschlag", "wohngeld", "neben", "sonst",
+        "miete_bestand", "neue_miete", "akt_miete", "wohnflaeche", "puffer", "konsum", "bauspar",
+        "rate_bestand", "ek", "zins", "tilgung", "grunderwerb", "notar", "makler", "wunsch_preis", "renovierung")}
+    nutzung = nutzung_code(sp["nutzung"])[:, None]
+    erwachsene = erwachsene_code(sp["erwachsene"])[:, None]
+
+    kindergeld = f["kinder"] * KINDERGELD
+    netto = (f["gehalt_h"] + f["gehalt_p"] + kindergeld + f["kinderzuschlag"] + f["wohngeld"]
+             + f["neben"] + f["sonst"])
+    basis = np.where(erwachsene == 0, bk.basis_single, bk.basis_paar)
+    basis = basis + (f["kinder"] * bk.pro_kind)
+    zuschlag = np.zeros(np.broadcast_shapes(netto.shape, basis.shape))
+    for k in range(bk.schwellen.shape[1]):
+        zuschlag = zuschlag + np.where(netto > bk.schwellen[:, k], bk.betraege[:, k], 0.0)
+    lebenshaltung = basis + zuschlag
+    bewirt = f["wohnflaeche"] * bk.bewirt_pro_qm
+
+    miete_bestand_anrechenbar = f["miete_bestand"] * bk.anrechnung_miete_bestand
+    miete_neu_calc = np.where(nutzung != 0, f["neue_miete"] * bk.anrechnung_miete_neu, 0.0)
+    belastung_alte_miete = np.where(nutzung == 2, f["akt_miete"], 0.0)
+
+    einnahmen = (f["gehalt_h"] + f["gehalt_p"] + kindergeld + f["kinderzuschlag"] + f["wohngeld"] + f["neben"]
+                 + f["sonst"] + miete_bestand_anrechenbar + miete_neu_calc)
+    ausgaben = (lebenshaltung + bewirt + f["puffer"] + f["konsum"] + f["bauspar"] + f["rate_bestand"]
+                + belastung_alte_miete)
+    frei = einnahmen - ausgaben
+    sozial_summe = f["kinderzuschlag"] + f["wohngeld"]
+    frei_bank = np.where(bk.sozial, frei, frei - sozial_summe)
+
+    zins = np.where(np.isnan(bk.zins), f["zins"], bk.zins)
+    annuitaet = zins + f["tilgung"]
+    nk_prozent_gesamt = f["grunderwerb"] + f["notar"] + f["makler"]
+    ok = (frei_bank > 0) & (annuitaet > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_kredit = np.where(ok, (frei_bank * 12 * 100) / annuitaet, 0.0)
+    max_preis = (max_kredit + f["ek"]) / (1 + (nk_prozent_gesamt / 100))
+
+    hat_wunsch = f["wunsch_preis"] > 0
+    wunsch_nk_euro = np.where(hat_wunsch, f["wunsch_preis"] * (nk_prozent_gesamt / 100), 0.0)
+    wunsch_darlehen = np.where(hat_wunsch, f["wunsch_preis"] + wunsch_nk_euro + f["renovierung"] - f["ek"], 0.0)
+    wunsch_rate = np.where(wunsch_darlehen > 0, (wunsch_darlehen * annuitaet) / 100 / 12, 0.0)
+
+    return {
+        "lebenshaltung": lebenshaltung, "bewirt": bewirt, "einnahmen": einnahmen, "ausgaben": ausgaben,
+        "frei": frei, "frei_bank": frei_bank, "zins": zins, "max_kredit": max_kredit, "max_preis": max_preis,
+        "wunsch_rate": wunsch_rate, "machbar": (wunsch_rate <= frei_bank) & (frei_bank >= 0),
+    }
+
+
+def vergleiche_banken(e, bk):
+    """Ein Haushalt (``engine.Eingaben``) gegen alle Banken; Arrays der Form (Banken,)."""
+    return {k: v[0] for k, v in berechne_banken(spalten_aus_eingaben([e]), bk).items()}
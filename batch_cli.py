@@ -0,0 +1,225 @@
+"""Kommandozeile: gespeicherte Kundenprofile (JSONL/CSV) im Stapel durchrechnen.
+
+Das Eingabeformat entspricht dem Button "Daten sichern (JSON)" (Keys ``sb_*``,
+``exp_*``, ``renovierung``), eine Zeile bzw. ein Datensatz pro Kunde.
+Die Datei wird in Blöcken gelesen, die Blöcke laufen parallel durch
+``batch_engine`` und die Ergebnisse werden sofort in der Eingabereihenfolge
+geschrieben. Der Speicherbedarf hängt damit nur von Blockgröße und
+Worker-Zahl ab, nicht von der Dateigröße.
+
+Ein kaputter Datensatz (kein gültiges JSON, unbekannte Nutzung, Text statt
+Zahl ...) bricht den Lauf nicht ab: er fehlt in der Ergebnisdatei und steht
+mit Zeilennummer in ``<ausgabe>.fehler.txt``.
+
+Beispiel::
+
+    python batch_cli.py kunden.jsonl ergebnis.csv --chunk 5000 --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from batch_engine import OPTIONALE_FELDER, ZAHL_FELDER, berechne_batch, spalten_aus_eingaben
+from engine import OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben
+
+AUSGABE_FELDER = ("einnahmen", "ausgaben", "frei", "frei_bank", "max_kredit", "max_preis", "wunsch_rate", "machbar")
+
+
+# ==========================================
+# 📥 LESEN
+# ==========================================
+def _csv_wert(wert):
+    # CSV kennt nur Text: Zahlen und Checkbox-Werte zurückwandeln
+    if wert in ("True", "true"):
+        return True
+    if wert in ("False", "false"):
+        return False
+    try:
+        return int(wert)
+    except ValueError:
+        try:
+            return float(wert)
+        except ValueError:
+            return wert
+
+
+def lese_datensaetze(pfad, mit_zeile=False):
+    """Liefert JSONL-Zeilen roh (werden erst im Worker geparst) bzw. CSV-Zeilen als Dict.
+
+    Mit ``mit_zeile=True`` Paare ``(zeilennummer, datensatz)`` für Fehlermeldungen.
+    """
+    if pfad.endswith(".csv"):
+        with open(pfad, newline="", encoding="utf-8") as f:
+            leser = csv.DictReader(f)
+            for zeile in leser:
+                d = {k: _csv_wert(v) for k, v in zeile.items() if v != ""}
+                yield (leser.line_num, d) if mit_zeile else d
+    else:
+        with open(pfad, encoding="utf-8") as f:
+            for nr, zeile in enumerate(f, start=1):
+                if zeile.strip():
+                    yield (nr, zeile) if mit_zeile else zeile
+
+
+def bloecke(datensaetze, groesse):
+    it = iter(datensaetze)
+    while True:
+        block = list(islice(it, groesse))
+        if not block:
+            return
+        yield block
+
+
+# ==========================================
+# 🧮 WORKER
+# ==========================================
+def pruefe(e):
+    """Wirft ``ValueError``, wenn ``batch_engine`` den Datensatz nicht rechnen kann."""
+    if e.nutzung not in OPTIONS_NUTZUNG:
+        raise ValueError(f"sb_nutzung muss einer von {OPTIONS_NUTZUNG} sein, nicht {e.nutzung!r}.")
+    if e.erwachsene not in OPTIONS_ERWACHSENE:
+        raise ValueError(f"sb_erwachsene muss einer von {OPTIONS_ERWACHSENE} sein, nicht {e.erwachsene!r}.")
+    for feld in ZAHL_FELDER:
+        wert = getattr(e, feld)
+        # type() statt isinstance: bool zählt hier nicht als Zahl
+        if type(wert) not in (int, float) and not (wert is None and feld in OPTIONALE_FELDER):
+            raise ValueError(f"{feld} muss eine Zahl sein, nicht {wert!r}.")
+    return e
+
+
+def _zeilen(eingaben):
+    sp = spalten_aus_eingaben(eingaben)
+    res = berechne_batch(sp)
+    # Spaltenweise nach Python-Listen wandeln (viel schneller als Element für Element)
+    spalten = {k: res[k].round(2).tolist() for k in AUSGABE_FELDER if k != "machbar"}
+    # Urteil wie in App, API und Kundendatenbank: nur mit Wunsch-Objekt und ohne Unterdeckung
+    spalten["machbar"] = [m if w > 0 and f >= 0 else None for w, f, m in
+                          zip(sp["wunsch_preis"].tolist(), res["frei"].tolist(), res["machbar"].tolist())]
+    return list(zip([e.name for e in eingaben], *(spalten[k] for k in AUSGABE_FELDER)))
+
+
+def rechne_block(block):
+    """Rechnet ``(zeilennummer, datensatz)``-Paare; liefert Zeilen, Fehler und Zeiten.
+
+    Fehler sind ``(zeilennummer, text)`` und betreffen nur den einzelnen Datensatz.
+    """
+    t0 = time.perf_counter()
+    eingaben, fehler = [], []
+    for nr, d in block:
+        try:
+            eingaben.append(pruefe(Eingaben.from_state(json.loads(d) if isinstance(d, str) else d)))
+        except Exception as ex:
+            fehler.append((nr, f"{type(ex).__name__}: {ex}"))
+    t1 = time.perf_counter()
+    zeilen = _zeilen(eingaben) if eingaben else []
+    t2 = time.perf_counter()
+    return zeilen, fehler, t1 - t0, t2 - t1
+
+
+# ==========================================
+# 📤 SCHREIBEN
+# ==========================================
+class _Schreiber:
+    def __init__(self, pfad):
+        self.f = open(pfad, "w", newline="", encoding="utf-8")
+        self.jsonl = pfad.endswith(".jsonl")
+        self.spalten = ("name",) + AUSGABE_FELDER
+        if not self.jsonl:
+            self.csv = csv.writer(self.f)
+            self.csv.writerow(self.spalten)
+
+    def schreibe(self, zeilen):
+        if self.jsonl:
+            self.f.writelines(json.dumps(dict(zip(self.spalten, z)), ensure_ascii=False) + "\n" for z in zeilen)
+        else:
+            self.csv.writerows(zeilen)
+
+    def close(self):
+        self.f.close()
+
+
+# ==========================================
+# 🚀 ABLAUF
+# ==========================================
+def fehler_pfad(ausgabe):
+    return f"{ausgabe}.fehler.txt"
+
+
+def run(eingabe, ausgabe, chunk=5000, workers=None):
+    workers = workers or os.cpu_count() or 1
+    zeiten = {"lesen": 0.0, "parsen": 0.0, "rechnen": 0.0, "schreiben": 0.0}
+    anzahl = 0
+    fehler = []
+    start = time.perf_counter()
+
+    schreiber = _Schreiber(ausgabe)
+    offen = deque()
+
+    def abholen():
+        nonlocal anzahl
+        zeilen, block_fehler, t_parse, t_calc = offen.popleft().result()
+        fehler.extend(block_fehler)
+        zeiten["parsen"] += t_parse
+        zeiten["rechnen"] += t_calc
+        t = time.perf_counter()
+        schreiber.schreibe(zeilen)
+        zeiten["schreiben"] += time.perf_counter() - t
+        anzahl += len(zeilen)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            quelle = bloecke(lese_datensaetze(eingabe, mit_zeile=True), chunk)
+            while True:
+                t = time.perf_counter()
+                block = next(quelle, None)
+                zeiten["lesen"] += time.perf_counter() - t
+                if block is None:
+                    break
+                offen.append(pool.submit(rechne_block, block))
+                # Nur begrenzt viele Blöcke gleichzeitig im Speicher halten
+                while len(offen) >= 2 * workers:
+                    abholen()
+            while offen:
+                abholen()
+    finally:
+        schreiber.close()
+
+    if fehler:
+        with open(fehler_pfad(ausgabe), "w", encoding="utf-8") as f:
+            f.writelines(f"Zeile {nr}: {text}\n" for nr, text in fehler)
+    elif os.path.exists(fehler_pfad(ausgabe)):
+        # Keine Fehlerliste eines früheren Laufs stehen lassen
+        os.remove(fehler_pfad(ausgabe))
+
+    dauer = time.perf_counter() - start
+    return anzahl, dauer, zeiten, fehler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Finanzierungscheck für viele Kundenprofile (JSONL/CSV).")
+    parser.add_argument("eingabe", help="JSONL- oder CSV-Datei mit gespeicherten Profilen")
+    parser.add_argument("ausgabe", help="Ergebnisdatei (.csv oder .jsonl)")
+    parser.add_argument("--chunk", type=int, default=5000, help="Datensätze pro Block (Standard: 5000)")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    args = parser.parse_args(argv)
+
+    anzahl, dauer, zeiten, fehler = run(args.eingabe, args.ausgabe, args.chunk, args.workers)
+    print(f"{anzahl} Datensätze in {dauer:.2f} s ({anzahl / dauer if dauer else 0:,.0f} Datensätze/s), {len(fehler)} Fehler")
+    # parsen/rechnen laufen in den Workern und sind über alle Prozesse summiert
+    for stufe, sek in zeiten.items():
+        print(f"  {stufe:<10} {sek:8.3f} s")
+    if fehler:
+        for nr, text in fehler[:20]:
+            print(f"  Zeile {nr}: {text}")
+        print(f"Alle Fehler: {fehler_pfad(args.ausgabe)}")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Vektorisierte NumPy-Variante von ``engine.berechne`` für viele Haushalte.
+
+Alle Eingaben kommen als Spalten (gleich lange Arrays, Namen wie die Felder von
+``engine.Eingaben``), die Ergebnisse ebenso. Es gibt keine Python-Schleife pro
+Zeile; die Rechenreihenfolge entspricht der skalaren Variante, damit beide
+Pfade bitgleiche Werte liefern.
+"""
+import numpy as np
+
+from engine import (
+    ANRECHNUNG_MIETE_BESTAND, ANRECHNUNG_MIETE_NEU, BEWIRT_PRO_QM, EINKOMMENS_ZUSCHLAEGE, KINDERGELD,
+    LEBENSHALTUNG_PAAR, LEBENSHALTUNG_PRO_KIND, LEBENSHALTUNG_SINGLE, OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben, Ergebnis,
+)
+
+# Numerische Spalten (alles aus Eingaben ausser Name und den Auswahlfeldern)
+ZAHL_FELDER = tuple(f for f in Eingaben.__slots__ if f not in ("name", "nutzung", "erwachsene"))
+# Optionale Spalten: fehlen sie, gelten Bank-Richtwert bzw. qm-Pauschale
+OPTIONALE_FELDER = ("lebenshaltung", "bewirt")
+
+ERGEBNIS_FELDER = (
+    "einnahmen", "ausgaben", "frei", "frei_bank", "sozial_summe", "max_kredit", "max_preis",
+    "max_nk_euro", "wunsch_nk_euro", "wunsch_invest", "wunsch_darlehen", "wunsch_rate",
+    "diff_miete", "machbar",
+)
+
+
+# ==========================================
+# 🧩 SPALTEN AUFBAUEN
+# ==========================================
+def _codes(feld, werte, optionen):
+    arr = np.asarray(werte)
+    if arr.dtype.kind in "iub":
+        if arr.size and (arr.min() < 0 or arr.max() >= len(optionen)):
+            raise ValueError(f"{feld}: Code außerhalb von 0..{len(optionen) - 1}.")
+        return arr.astype(np.int8)
+    lookup = {text: i for i, text in enumerate(optionen)}
+    try:
+        return np.array([lookup[w] for w in arr.tolist()], dtype=np.int8)
+    except KeyError as ex:
+        # Unbekannte Texte nie still auf eine Option abbilden: skalar und Batch liefen sonst auseinander
+        raise ValueError(f"{feld} muss einer von {optionen} sein, nicht {ex.args[0]!r}.") from None
+
+
+def nutzung_code(werte):
+    """Wandelt OPTIONS_NUTZUNG-Texte (oder schon Indizes) in int-Codes 0..2."""
+    return _codes("nutzung", werte, OPTIONS_NUTZUNG)
+
+
+def erwachsene_code(werte):
+    """0 = Alleinstehend, 1 = Paar; unbekannte Texte -> ``ValueError``."""
+    return _codes("erwachsene", werte, OPTIONS_ERWACHSENE)
+
+
+def spalten_aus_eingaben(eingaben):
+    """Hilfsfunktion: Liste von Eingaben-Records -> Spalten-Dict."""
+    sp = {f: np.fromiter((getattr(e, f) for e in eingaben), dtype=np.float64, count=len(eingaben))
+          for f in ZAHL_FELDER}
+    sp["nutzung"] = nutzung_code([e.nutzung for e in eingaben])
+    sp["erwachsene"] = erwachsene_code([e.erwachsene for e in eingaben])
+    return sp
+
+
+# ==========================================
+# 🧮 RECHNUNG (VEKTORISIERT)
+# ==========================================
+def bank_richtwert(netto, erwachsene, kinder):
+    basis = np.where(erwachsene == 0, LEBENSHALTUNG_SINGLE, LEBENSHALTUNG_PAAR)
+    basis = basis + (kinder * LEBENSHALTUNG_PRO_KIND)
+    zuschlag = 0.0
+    for schwelle, betrag in EINKOMMENS_ZUSCHLAEGE:
+        zuschlag = zuschlag + np.where(netto > schwelle, float(betrag), 0.0)
+    return basis + zuschlag
+
+
+def berechne_batch(sp):
+    """Rechnet alle Zeilen eines Spalten-Dicts; liefert ein Dict von Arrays."""
+    f = {k: np.asarray(sp[k], dtype=np.float64) for k in ZAHL_FELDER if k not in OPTIONALE_FELDER}
+    nutzung = nutzung_code(sp["nutzung"])
+    erwachsene = erwachsene_code(sp["erwachsene"])
+
+    kindergeld = f["kinder"] * KINDERGELD
+
+    lebenshaltung = sp.get("lebenshaltung")
+    if lebenshaltung is None:
+        netto = (f["gehalt_h"] + f["gehalt_p"] + kindergeld + f["kinderzuschlag"] + f["wohngeld"]
+                 + f["neben"] + f["sonst"])
+        lebenshaltung = bank_richtwert(netto, erwachsene, f["kinder"])
+    lebenshaltung = np.asarray(lebenshaltung, dtype=np.float64)
+    bewirt = sp.get("bewirt")
+    bewirt = f["wohnflaeche"] * BEWIRT_PRO_QM if bewirt is None else np.asarray(bewirt, dtype=np.float64)
+
+    miete_bestand_anrechenbar = f["miete_bestand"] * ANRECHNUNG_MIETE_BESTAND
+    miete_neu_calc = np.where(nutzung != 0, f["neue_miete"] * ANRECHNUNG_MIETE_NEU, 0.0)
+    belastung_alte_miete = np.where(nutzung == 2, f["akt_miete"], 0.0)
+
+    einnahmen = (f["gehalt_h"] + f["gehalt_p"] + kindergeld + f["kinderzuschlag"] + f["wohngeld"] + f["neben"]
+                 + f["sonst"] + miete_bestand_anrechenbar + miete_neu_calc)
+    ausgaben = (lebenshaltung + bewirt + f["puffer"] + f["konsum"] + f["bauspar"] + f["rate_bestand"]
+                + belastung_alte_miete)
+    frei = einnahmen - ausgaben
+    annuitaet = f["zins"] + f["tilgung"]
+
+    sozial_summe = f["kinderzuschlag"] + f["wohngeld"]
+    frei_bank = frei - sozial_summe
+
+    nk_prozent_gesamt = f["grunderwerb"] + f["notar"] + f["makler"]
+    ok = (frei > 0) & (annuitaet > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_kredit = np.where(ok, (frei * 12 * 100) / annuitaet, 0.0)
+    max_preis = (max_kredit + f["ek"]) / (1 + (nk_prozent_gesamt / 100))
+    max_nk_euro = max_preis * (nk_prozent_gesamt / 100)
+
+    hat_wunsch = f["wunsch_preis"] > 0
+    wunsch_nk_euro = np.where(hat_wunsch, f["wunsch_preis"] * (nk_prozent_gesamt / 100), 0.0)
+    wunsch_invest = np.where(hat_wunsch, f["wunsch_preis"] + wunsch_nk_euro + f["renovierung"], 0.0)
+    wunsch_darlehen = np.where(hat_wunsch, wunsch_invest - f["ek"], 0.0)
+    wunsch_rate = np.where(wunsch_darlehen > 0, (wunsch_darlehen * annuitaet) / 100 / 12, 0.0)
+
+    # None der skalaren Variante -> NaN
+    hat_vergleich = (f["akt_miete"] > 0) & (nutzung != 2)
+    diff_miete = np.where(hat_vergleich, (frei + bewirt + f["puffer"]) - f["akt_miete"], np.nan)
+    neu_last = np.where(frei > 0, frei + bewirt + f["puffer"], 0.0)
+
+    return {
+        "kindergeld": kindergeld, "miete_bestand_anrechenbar": miete_bestand_anrechenbar,
+        "miete_neu_calc": miete_neu_calc, "belastung_alte_miete": belastung_alte_miete,
+        "annuitaet": annuitaet, "nk_prozent_gesamt": nk_prozent_gesamt, "neu_last": neu_last,
+        "einnahmen": einnahmen, "ausgaben": ausgaben, "frei": frei, "frei_bank": frei_bank,
+        "sozial_summe": sozial_summe, "max_kredit": max_kredit, "max_preis": max_preis,
+        "max_nk_euro": max_nk_euro, "wunsch_nk_euro": wunsch_nk_euro, "wunsch_invest": wunsch_invest,
+        "wunsch_darlehen": wunsch_darlehen, "wunsch_rate": wunsch_rate, "diff_miete": diff_miete,
+        "machbar": wunsch_rate <= frei,
+    }
+
+
+def als_ergebnisse(res):
+    """Batch-Ergebnis -> Liste von ``engine.Ergebnis`` (NaN bei diff_miete wird wieder None)."""
+    spalten = {k: res[k].tolist() for k in Ergebnis.__slots__}
+    spalten["diff_miete"] = [None if d != d else d for d in spalten["diff_miete"]]
+    return [Ergebnis(**dict(zip(spalten, werte))) for werte in zip(*spalten.values())]
+
+
+def berechne_viele(eingaben):
+    """Mehrere Eingaben-Records in einem Batch-Durchlauf; liefert ``Ergebnis``-Records."""
+    if not eingaben:
+        return []
+    return als_ergebnisse(berechne_batch(spalten_aus_eingaben(eingaben)))
@@ -0,0 +1,695 @@
+"""Differenz-Prüfstand: alle Rechenpfade gegen die ursprünglichen Formeln der App.
+
+``referenz`` ist die Haushaltsrechnung aus der ersten ``app.py``, Zeile für
+Zeile und mit den damaligen Zahlen (250 € Kindergeld, 80 %/75 %
+Mietanrechnung, 4 €/m², Pauschalen 1000/1700/350) -- bewusst ohne Import aus
+``engine``. Jeder Pfad rechnet dieselben geseedeten Zufallsprofile. Die
+Generatoren treffen gezielt die Ränder: ``frei`` <= 0 bzw. genau 0,
+Annuität 0, ``wunsch_darlehen`` <= 0 bzw. genau 0, alle drei Nutzungsarten,
+Sozialleistungen, die ``frei_bank`` ins Minus drücken, und Netto genau auf
+den Zuschlags-Schwellen.
+
+Geprüfte Pfade: ``engine.berechne`` (skalar), ``batch_engine`` (vektorisiert),
+``Rechengraph`` (inkrementell wie in der App-Session), ``banken`` (Profil
+STANDARD, mit/ohne Sozialleistungen), ``api`` (check und batch),
+Export-Format (``Eingaben.from_state``, Kundendatenbank, ``batch_cli``),
+``sicherung`` (Delta/Archiv), ``sensitivitaet`` und ``screener``.
+
+Danach wird der Durchsatz je Pfad gemessen und mit ``MINDEST_DURCHSATZ``
+(Profile/s auf dem Referenzrechner, skaliert mit ``--faktor``) verglichen.
+Exit-Code 1 bei Abweichung oder zu langsamem Pfad.
+
+Beispiele::
+
+    python benchmarks/abgleich.py
+    python benchmarks/abgleich.py --profile 2000 --ohne-durchsatz
+    python benchmarks/abgleich.py --nur skalar,batch --faktor 0.5 --seed 7
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import OPTIONS_BESTAND, OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben  # noqa: E402
+
+SEED = 20260101
+# Gleiche Rechenreihenfolge -> bitgleich erwartet; die Toleranz fängt nur Rundungsrauschen ab
+TOLERANZ_REL = 1e-12
+TOLERANZ_ABS = 1e-9
+# Pfade, die auf Cent runden (API, batch_cli)
+TOLERANZ_CENT = 0.01 + 1e-9
+
+# Profile (bzw. Gitterpunkte/Angebote) pro Sekunde: etwa 40 % dessen, was der
+# Referenzrechner schafft. Ein Pfad, der um mehr als das Doppelte langsamer
+# wird, fällt auf; normales Messrauschen nicht.
+MINDEST_DURCHSATZ = {
+    "skalar": 60_000,
+    "batch": 4_000_000,
+    "rechengraph": 12_000,
+    "banken": 3_000_000,
+    "api_check": 15_000,
+    "api_batch": 12_000,
+    "export": 15_000,
+    "sicherung": 5_000,
+    "sensitivitaet": 3_000_000,
+    "screener": 3_000_000,
+}
+
+ERGEBNIS = (
+    "kindergeld", "miete_bestand_anrechenbar", "miete_neu_calc", "belastung_alte_miete",
+    "einnahmen", "ausgaben", "frei", "annuitaet", "sozial_summe", "frei_bank",
+    "nk_prozent_gesamt", "max_kredit", "max_preis", "max_nk_euro",
+    "wunsch_nk_euro", "wunsch_invest", "wunsch_darlehen", "wunsch_rate",
+    "diff_miete", "neu_last",
+)
+
+
+# ==========================================
+# 📐 REFERENZ (Formeln der ursprünglichen app.py)
+# ==========================================
+def richtwert(netto, erwachsene, kinder):
+    basis = 1000.0 if erwachsene == "Alleinstehend" else 1700.0
+    basis += (kinder * 350.0)
+    zuschlag = 0.0
+    if netto > 4000: zuschlag += 200
+    if netto > 6000: zuschlag += 300
+    if netto > 8000: zuschlag += 400
+    return basis + zuschlag
+
+
+def referenz(p):
+    """Profil-Dict (Felder wie ``engine.Eingaben``) -> Dict aller Ergebnis-Größen."""
+    kindergeld = p["kinder"] * 250
+    lebenshaltung = p["lebenshaltung"]
+    if lebenshaltung is None:
+        netto = p["gehalt_h"] + p["gehalt_p"] + kindergeld + p["kinderzuschlag"] + p["wohngeld"] + p["neben"] + p["sonst"]
+        lebenshaltung = richtwert(netto, p["erwachsene"], p["kinder"])
+    bewirt = float(p["wohnflaeche"] * 4.0) if p["bewirt"] is None else p["bewirt"]
+    miete_bestand_anrechenbar = p["miete_bestand"] * 0.75
+
+    miete_neu_calc = 0.0
+    if p["nutzung"] != "Eigenheim (Nur Selbstbezug)":
+        miete_neu_calc = p["neue_miete"] * 0.80
+    belastung_alte_miete = p["akt_miete"] if p["nutzung"] == "Kapitalanlage (Reine Vermietung)" else 0.0
+
+    einnahmen = (p["gehalt_h"] + p["gehalt_p"] + kindergeld + p["kinderzuschlag"] + p["wohngeld"] + p["neben"]
+                 + p["sonst"] + miete_bestand_anrechenbar + miete_neu_calc)
+    ausgaben = lebenshaltung + bewirt + p["puffer"] + p["konsum"] + p["bauspar"] + p["rate_bestand"] + belastung_alte_miete
+    frei = einnahmen - ausgaben
+    annuitaet = p["zins"] + p["tilgung"]
+
+    sozial_summe = p["kinderzuschlag"] + p["wohngeld"]
+    frei_bank = frei - sozial_summe
+
+    nk_prozent_gesamt = p["grunderwerb"] + p["notar"] + p["makler"]
+    max_kredit = (frei * 12 * 100) / annuitaet if (frei > 0 and annuitaet > 0) else 0
+    max_preis = (max_kredit + p["ek"]) / (1 + (nk_prozent_gesamt / 100))
+    max_nk_euro = max_preis * (nk_prozent_gesamt / 100)
+
+    wunsch_rate = 0.0
+    wunsch_nk_euro = 0.0
+    wunsch_invest = 0.0
+    wunsch_darlehen = 0.0
+    if p["wunsch_preis"] > 0:
+        wunsch_nk_euro = p["wunsch_preis"] * (nk_prozent_gesamt / 100)
+        wunsch_invest = p["wunsch_preis"] + wunsch_nk_euro + p["renovierung"]
+        wunsch_darlehen = wunsch_invest - p["ek"]
+        if wunsch_darlehen > 0:
+            wunsch_rate = (wunsch_darlehen * annuitaet) / 100 / 12
+        else:
+            wunsch_rate = 0
+
+    diff_miete = None
+    if p["akt_miete"] > 0 and p["nutzung"] != "Kapitalanlage (Reine Vermietung)":
+        diff_miete = (frei + bewirt + p["puffer"]) - p["akt_miete"]
+    neu_last = (frei + bewirt + p["puffer"]) if frei > 0 else 0
+
+    return {
+        "kindergeld": kindergeld, "miete_bestand_anrechenbar": miete_bestand_anrechenbar,
+        "miete_neu_calc": miete_neu_calc, "belastung_alte_miete": belastung_alte_miete,
+        "einnahmen": einnahmen, "ausgaben": ausgaben, "frei": frei, "annuitaet": annuitaet,
+        "sozial_summe": sozial_summe, "frei_bank": frei_bank, "nk_prozent_gesamt": nk_prozent_gesamt,
+        "max_kredit": max_kredit, "max_preis": max_preis, "max_nk_euro": max_nk_euro,
+        "wunsch_nk_euro": wunsch_nk_euro, "wunsch_invest": wunsch_invest,
+        "wunsch_darlehen": wunsch_darlehen, "wunsch_rate": wunsch_rate,
+        "diff_miete": diff_miete, "neu_last": neu_last,
+        # nicht in der App-Rechnung, aber für Banken/Screener gebraucht
+        "lebenshaltung": lebenshaltung, "bewirt": bewirt, "machbar": wunsch_rate <= frei,
+    }
+
+
+# ==========================================
+# 🎲 PROFILE
+# ==========================================
+def _betrag(rnd, von, bis, schritt, krumm):
+    wert = rnd.randrange(von, bis, schritt)
+    # Ein Teil der Profile mit Cent-Beträgen (API und Batch erlauben das)
+    return round(wert + rnd.random(), 2) if krumm and wert else wert
+
+
+def _zufall(rnd, i):
+    krumm = rnd.random() < 0.2
+    paar = rnd.random() < 0.6
+    nutzung = rnd.choice(OPTIONS_NUTZUNG)
+    bestand = rnd.random() < 0.2
+    return {
+        "name": f"Profil {i}", "nutzung": nutzung,
+        "wohnflaeche": rnd.randrange(0, 260, 5),
+        "akt_miete": rnd.choice((0, _betrag(rnd, 300, 2500, 50, krumm))),
+        "neue_miete": _betrag(rnd, 200, 2000, 50, krumm) if nutzung != OPTIONS_NUTZUNG[0] else 0,
+        "gehalt_h": _betrag(rnd, 0, 9000, 50, krumm),
+        "erwachsene": OPTIONS_ERWACHSENE[1] if paar else OPTIONS_ERWACHSENE[0],
+        "gehalt_p": _betrag(rnd, 0, 6000, 50, krumm) if paar else 0,
+        "kinder": rnd.choice((0, 0, 1, 2, 3, 5)),
+        "kinderzuschlag": rnd.choice((0, 0, 0, 250, 500)),
+        "wohngeld": rnd.choice((0, 0, 0, 180, 400)),
+        "neben": rnd.choice((0, 0, 450, 538)),
+        "sonst": rnd.choice((0, 0, 200)),
+        # Pauschalen: meist errechnet (None), sonst von Hand überschrieben
+        "lebenshaltung": None if rnd.random() < 0.7 else float(_betrag(rnd, 800, 4000, 50, krumm)),
+        "bewirt": None if rnd.random() < 0.7 else float(_betrag(rnd, 0, 1200, 10, krumm)),
+        "puffer": rnd.randrange(0, 600, 50),
+        "konsum": rnd.choice((0, 0, 150, 300, 799)),
+        "bauspar": rnd.choice((0, 0, 100)),
+        "ek": _betrag(rnd, 0, 400_000, 1000, krumm),
+        "zins": round(rnd.uniform(0.1, 7.0), 2),
+        "tilgung": round(rnd.uniform(0.0, 5.0), 2),
+        "zinsbindung": rnd.randint(1, 40),
+        "sondertilgung": rnd.choice((0, 0, 5000)),
+        "miete_bestand": _betrag(rnd, 300, 3000, 50, krumm) if bestand else 0,
+        "rate_bestand": _betrag(rnd, 200, 2000, 50, krumm) if bestand else 0,
+        "grunderwerb": rnd.choice((3.5, 5.0, 6.0, 6.5)),
+        "notar": rnd.choice((1.5, 2.0)),
+        "makler": rnd.choice((0.0, 2.38, 3.57)),
+        "wunsch_preis": rnd.choice((0, _betrag(rnd, 50_000, 900_000, 5000, krumm))),
+        "renovierung": rnd.choice((0, 0, 20_000, 75_000)),
+    }
+
+
+def _rand_frei_null(rnd, p):
+    # Lebenshaltung so setzen, dass frei (fast) genau 0 wird
+    p["lebenshaltung"] = float(referenz({**p, "lebenshaltung": 0.0})["frei"])
+
+
+def _rand_frei_negativ(rnd, p):
+    p["lebenshaltung"] = float(referenz(p)["einnahmen"] + rnd.randrange(1, 3000))
+
+
+def _rand_annuitaet(rnd, p):
+    p["zins"], p["tilgung"] = rnd.choice(((0.0, 0.0), (0.0, 0.01), (0.01, 0.0), (0.1, 0.0)))
+
+
+def _rand_darlehen_null(rnd, p):
+    preis = p["wunsch_preis"] or rnd.randrange(50_000, 600_000, 5000)
+    p["wunsch_preis"] = preis
+    nk = p["grunderwerb"] + p["notar"] + p["makler"]
+    # EK genau so hoch wie die Investition -> Darlehen exakt 0 (gleiche Rechenfolge wie die App)
+    p["ek"] = preis + preis * (nk / 100) + p["renovierung"]
+    if rnd.random() < 0.5:
+        p["ek"] += rnd.randrange(1, 50_000)
+
+
+def _rand_sozial(rnd, p):
+    p["kinderzuschlag"] = rnd.randrange(250, 1500, 50)
+    p["wohngeld"] = rnd.randrange(100, 800, 20)
+    p["lebenshaltung"] = float(referenz({**p, "lebenshaltung": 0.0})["frei"] - rnd.randrange(1, p["kinderzuschlag"]))
+
+
+def _rand_schwelle(rnd, p):
+    # Netto genau auf einer Zuschlags-Schwelle (dort gibt es den Zuschlag noch nicht)
+    schwelle = rnd.choice((4000, 6000, 8000))
+    rest = p["gehalt_p"] + p["kinder"] * 250 + p["kinderzuschlag"] + p["wohngeld"] + p["neben"] + p["sonst"]
+    p["gehalt_h"] = max(schwelle - rest, 0) + rnd.choice((0, 0, 1))
+    p["lebenshaltung"] = None
+
+
+def _rand_ohne_miete(rnd, p):
+    p["akt_miete"] = 0
+
+
+RAENDER = (_rand_frei_null, _rand_frei_negativ, _rand_annuitaet, _rand_darlehen_null, _rand_sozial,
+           _rand_schwelle, _rand_ohne_miete)
+
+
+def profile(n, seed=SEED):
+    """``n`` reproduzierbare Profil-Dicts; etwa jedes zweite mit einem gezielten Randfall."""
+    rnd = random.Random(seed)
+    aus = []
+    for i in range(n):
+        p = _zufall(rnd, i)
+        if rnd.random() < 0.5:
+            rnd.choice(RAENDER)(rnd, p)
+        aus.append(p)
+    return aus
+
+
+def als_state(p):
+    """Profil -> Dict im Export-Format der App (``sb_*``/``exp_*``/``renovierung``)."""
+    s = {
+        "sb_name": p["name"], "sb_nutzung": p["nutzung"], "sb_wohnflaeche": p["wohnflaeche"],
+        "sb_akt_miete": p["akt_miete"], "sb_gehalt_h": p["gehalt_h"], "sb_erwachsene": p["erwachsene"],
+        "sb_gehalt_p": p["gehalt_p"], "sb_kinder": p["kinder"], "sb_kinderzuschlag": p["kinderzuschlag"],
+        "sb_wohngeld": p["wohngeld"], "sb_neben": p["neben"], "sb_sonst": p["sonst"], "sb_puffer": p["puffer"],
+        "sb_konsum": p["konsum"], "sb_bauspar": p["bauspar"], "sb_ek": p["ek"], "sb_zins": p["zins"],
+        "sb_tilgung": p["tilgung"], "sb_zinsbindung": p["zinsbindung"], "sb_sondertilgung": p["sondertilgung"],
+        "sb_hat_bestand": bool(p["miete_bestand"] or p["rate_bestand"]), "sb_bestand_modus": OPTIONS_BESTAND[0],
+        "sb_miete_bestand": p["miete_bestand"], "sb_rate_bestand": p["rate_bestand"],
+        "sb_grunderwerb": p["grunderwerb"], "sb_notar": p["notar"], "sb_makler": p["makler"],
+        "sb_wunsch_preis": p["wunsch_preis"], "renovierung": p["renovierung"],
+    }
+    if p["nutzung"] == OPTIONS_NUTZUNG[1]:
+        s["sb_neue_miete_mix"] = p["neue_miete"]
+    elif p["nutzung"] == OPTIONS_NUTZUNG[2]:
+        s["sb_neue_miete_ka"] = p["neue_miete"]
+    if p["lebenshaltung"] is not None:
+        s["exp_p_lebenshaltung"] = p["lebenshaltung"]
+    if p["bewirt"] is not None:
+        s["exp_bewirt"] = p["bewirt"]
+    return s
+
+
+# ==========================================
+# ⚖️ VERGLEICH
+# ==========================================
+class Abgleich:
+    """Sammelt Abweichungen eines Pfads (die ersten ``max_beispiele`` mit Details)."""
+
+    __slots__ = ("pfad", "geprueft", "abweichungen", "max_abweichung", "beispiele", "max_beispiele")
+
+    def __init__(self, pfad, max_beispiele=5):
+        self.pfad = pfad
+        self.geprueft = 0
+        self.abweichungen = 0
+        self.max_abweichung = 0.0
+        self.beispiele = []
+        self.max_beispiele = max_beispiele
+
+    def feld(self, index, feld, ist, soll, toleranz=None):
+        # None (kein Mietvergleich) entspricht NaN in den Array-Pfaden
+        if soll is None or ist is None or (isinstance(ist, float) and ist != ist):
+            gleich = (soll is None) == (ist is None or ist != ist)
+            diff = 0.0 if gleich else math.inf
+        elif isinstance(soll, bool) or isinstance(ist, (bool, np.bool_)):
+            gleich = bool(ist) == bool(soll)
+            diff = 0.0 if gleich else math.inf
+        else:
+            diff = abs(float(ist) - soll)
+            grenze = toleranz if toleranz is not None else TOLERANZ_ABS + TOLERANZ_REL * abs(soll)
+            gleich = diff <= grenze
+            if gleich:
+                self.max_abweichung = max(self.max_abweichung, diff)
+        if not gleich:
+            self.abweichungen += 1
+            self.max_abweichung = max(self.max_abweichung, diff)
+            if len(self.beispiele) < self.max_beispiele:
+                self.beispiele.append(f"Profil {index}, {feld}: ist {ist!r}, soll {soll!r}")
+
+    def profil(self, index, ist, soll, felder, toleranz=None):
+        self.geprueft += 1
+        for f in felder:
+            self.feld(index, f, ist[f], soll[f], toleranz)
+
+
+def _cent(x):
+    return None if x is None else round(x, 2)
+
+
+# ==========================================
+# 🛤 PFADE
+# ==========================================
+# Jeder Pfad: (Profile, Referenzen) -> Abgleich; dazu eine Funktion für die
+# Durchsatzmessung, die (Lauf, Anzahl) liefert.
+def pfad_skalar(ps, refs):
+    from engine import berechne
+    a = Abgleich("skalar")
+    for i, (p, ref) in enumerate(zip(ps, refs)):
+        a.profil(i, berechne(Eingaben(**p)).as_dict(), ref, ERGEBNIS)
+    return a
+
+
+def lauf_skalar(ps):
+    from engine import berechne
+    eingaben = [Eingaben(**p) for p in ps]
+    return (lambda: [berechne(e) for e in eingaben]), len(eingaben)
+
+
+def pfad_batch(ps, refs):
+    from batch_engine import berechne_batch, spalten_aus_eingaben
+    a = Abgleich("batch")
+    res = berechne_batch(spalten_aus_eingaben([Eingaben(**p) for p in ps]))
+    spalten = {k: res[k].tolist() for k in (*ERGEBNIS, "machbar")}
+    for i, ref in enumerate(refs):
+        a.profil(i, {k: v[i] for k, v in spalten.items()}, ref, (*ERGEBNIS, "machbar"))
+    return a
+
+
+def lauf_batch(ps):
+    from batch_engine import berechne_batch, spalten_aus_eingaben
+    sp = spalten_aus_eingaben([Eingaben(**p) for p in ps])
+    return (lambda: berechne_batch(sp)), len(ps)
+
+
+def _graph_schritte(ps, seed):
+    """Session-Verlauf: jedes Profil neu setzen, dann ein einzelnes Feld ändern (wie ein Widget)."""
+    rnd = random.Random(seed)
+    felder = [f for f in Eingaben.__slots__ if f not in ("name", "nutzung", "erwachsene")]
+    for p in ps:
+        e = Eingaben(**p)
+        yield e
+        d = e.as_dict()
+        f = rnd.choice(felder + ["nutzung", "erwachsene"])
+        if f == "nutzung":
+            d[f] = rnd.choice(OPTIONS_NUTZUNG)
+        elif f == "erwachsene":
+            d[f] = rnd.choice(OPTIONS_ERWACHSENE)
+        else:
+            d[f] = d[f] + rnd.choice((-100, -1, 1, 50, 1000)) if d[f] >= 100 else rnd.choice((0, 1, 250))
+        yield Eingaben(**d)
+
+
+def pfad_rechengraph(ps, refs, seed=SEED):
+    from rechengraph import Rechengraph
+    a = Abgleich("rechengraph")
+    g = Rechengraph()
+    for i, e in enumerate(_graph_schritte(ps, seed)):
+        g.setze(e.as_dict())
+        a.profil(i // 2, g.ergebnis().as_dict(), refs[i // 2] if i % 2 == 0 else referenz(e.as_dict()), ERGEBNIS)
+    return a
+
+
+def lauf_rechengraph(ps):
+    from rechengraph import Rechengraph
+    schritte = [e.as_dict() for e in _graph_schritte(ps, SEED)]
+    g = Rechengraph()
+
+    def lauf():
+        for d in schritte:
+            g.setze(d)
+            g.ergebnis()
+    return lauf, len(schritte)
+
+
+BANKEN_FELDER = ("lebenshaltung", "bewirt", "einnahmen", "ausgaben", "frei", "frei_bank", "max_kredit", "max_preis",
+                 "wunsch_rate", "machbar")
+
+
+def _bank_referenz(p, sozial):
+    # Banken rechnen Pauschalen immer selbst und den Kredit aus frei_bank
+    ref = referenz({**p, "lebenshaltung": None, "bewirt": None})
+    frei_bank = ref["frei"] if sozial else ref["frei_bank"]
+    annuitaet = p["zins"] + p["tilgung"]
+    nk = p["grunderwerb"] + p["notar"] + p["makler"]
+    max_kredit = (frei_bank * 12 * 100) / annuitaet if (frei_bank > 0 and annuitaet > 0) else 0.0
+    return {**ref, "frei_bank": frei_bank, "max_kredit": max_kredit, "max_preis": (max_kredit + p["ek"]) / (1 + (nk / 100)),
+            "machbar": ref["wunsch_rate"] <= frei_bank and frei_bank >= 0}
+
+
+def pfad_banken(ps, refs):
+    from banken import STANDARD, BankProfil, berechne_banken, kompiliere
+    from batch_engine import spalten_aus_eingaben
+    a = Abgleich("banken")
+    sozial = BankProfil("Standard mit Sozialleistungen", sozialleistungen_anrechnen=True)
+    res = berechne_banken(spalten_aus_eingaben([Eingaben(**p) for p in ps]), kompiliere([STANDARD, sozial]))
+    spalten = {k: res[k].tolist() for k in BANKEN_FELDER}
+    for i, p in enumerate(ps):
+        for b, mit_sozial in enumerate((False, True)):
+            a.profil(i, {k: v[i][b] for k, v in spalten.items()}, _bank_referenz(p, mit_sozial), BANKEN_FELDER)
+    return a
+
+
+def lauf_banken(ps):
+    from banken import STANDARD, berechne_banken, kompiliere
+    from batch_engine import spalten_aus_eingaben
+    sp = spalten_aus_eingaben([Eingaben(**p) for p in ps])
+    bk = kompiliere([STANDARD])
+    return (lambda: berechne_banken(sp, bk)), len(ps)
+
+
+def _api_soll(p, ref):
+    from api import API_FELDER
+    soll = {k: _cent(ref[k]) for k in API_FELDER}
+    mit_wunsch = p["wunsch_preis"] > 0 and ref["frei"] >= 0
+    soll["machbar"] = ref["wunsch_rate"] <= ref["frei"] if mit_wunsch else None
+    soll["machbar_bank"] = ref["wunsch_rate"] <= ref["frei_bank"] if mit_wunsch else None
+    return soll
+
+
+def _api_profil(p):
+    # Pauschalen nur mitschicken, wenn sie gesetzt sind (sonst rechnet die API sie aus)
+    return {k: v for k, v in p.items() if v is not None}
+
+
+def pfad_api_check(ps, refs):
+    from api import API_FELDER, check, profil
+    a = Abgleich("api_check")
+    felder = (*API_FELDER, "machbar", "machbar_bank")
+    for i, (p, ref) in enumerate(zip(ps, refs)):
+        a.profil(i, check(profil(_api_profil(p), i)), _api_soll(p, ref), felder, TOLERANZ_CENT)
+    return a
+
+
+def lauf_api_check(ps):
+    from api import check, profil
+    roh = [_api_profil(p) for p in ps]
+    return (lambda: [check(profil(d)) for d in roh]), len(roh)
+
+
+def pfad_api_batch(ps, refs):
+    from api import API_FELDER, MAX_BATCH, batch
+    a = Abgleich("api_batch")
+    felder = (*API_FELDER, "machbar", "machbar_bank")
+    for start in range(0, len(ps), MAX_BATCH):
+        teil = ps[start:start + MAX_BATCH]
+        # Zeilen- und Spaltenformat, einmal als Eingaben-Felder und einmal im Export-Format
+        roh = json.dumps({"profile": [_api_profil(p) for p in teil]}).encode()
+        zeilen = batch(roh)["ergebnisse"]
+        spalten = batch(json.dumps({"profile": [als_state(p) for p in teil], "format": "spalten"}).encode())["ergebnisse"]
+        for j, p in enumerate(teil):
+            soll = _api_soll(p, refs[start + j])
+            a.profil(start + j, zeilen[j], soll, felder, TOLERANZ_CENT)
+            a.profil(start + j, {k: spalten[k][j] for k in felder}, soll, felder, TOLERANZ_CENT)
+    return a
+
+
+def lauf_api_batch(ps):
+    from api import batch
+    roh = json.dumps({"profile": [_api_profil(p) for p in ps]}).encode()
+    return (lambda: batch(roh)), len(ps)
+
+
+def pfad_export(ps, refs):
+    from batch_cli import AUSGABE_FELDER, rechne_block
+    from engine import berechne
+    from kunden_db import kennzahlen
+    a = Abgleich("export")
+    states = [als_state(p) for p in ps]
+    zeilen, fehler, _, _ = rechne_block([(i, json.dumps(s)) for i, s in enumerate(states)])
+    for i, text in fehler:
+        # Erzeugte Profile sind alle gültig: jede Fehlermeldung ist eine Abweichung
+        a.feld(i, "batch_cli", text, None)
+    if fehler:
+        return a
+    for i, (s, ref) in enumerate(zip(states, refs)):
+        a.profil(i, berechne(Eingaben.from_state(s)).as_dict(), ref, ERGEBNIS)
+        k = kennzahlen(s)
+        mit_wunsch = s["sb_wunsch_preis"] > 0 and ref["frei"] >= 0
+        a.profil(i, k, {**ref, "wunsch_preis": s["sb_wunsch_preis"], "machbar": int(ref["machbar"]) if mit_wunsch else None},
+                 ("frei", "frei_bank", "max_preis", "wunsch_preis", "wunsch_rate", "machbar"))
+        a.profil(i, dict(zip(AUSGABE_FELDER, zeilen[i][1:])), {k: _cent(ref[k]) if k != "machbar" else
+                                                              (ref[k] if mit_wunsch else None)
+                                                              for k in AUSGABE_FELDER}, AUSGABE_FELDER, TOLERANZ_CENT)
+    return a
+
+
+def lauf_export(ps):
+    from batch_cli import rechne_block
+    block = [(i, json.dumps(als_state(p))) for i, p in enumerate(ps)]
+    return (lambda: rechne_block(block)), len(block)
+
+
+def pfad_sicherung(ps, refs):
+    import sicherung
+    from engine import berechne
+    a = Abgleich("sicherung")
+    for i, (p, ref) in enumerate(zip(ps, refs)):
+        s = als_state(p)
+        try:
+            sicherung.pruefe(s)
+        except ValueError:
+            # z.B. Zins 0 oder Cent-Beträge in ganzzahligen Feldern: in der App nicht eingebbar
+            continue
+        for stand in (sicherung.delta(s), sicherung.entpacke(sicherung.packe(s)), sicherung.voll(sicherung.delta(s))):
+            a.profil(i, berechne(Eingaben.from_state(stand)).as_dict(), ref, ERGEBNIS)
+    return a
+
+
+def lauf_sicherung(ps):
+    import sicherung
+    states = []
+    for p in ps:
+        try:
+            states.append(sicherung.pruefe(als_state(p)))
+        except ValueError:
+            pass
+    return (lambda: [sicherung.entpacke(sicherung.packe(s)) for s in states]), len(states)
+
+
+SENS_ZINS = (0.0, 0.1, 2.5, 3.85, 7.0)
+SENS_TILGUNG = (0.0, 1.0, 2.75)
+
+
+def pfad_sensitivitaet(ps, refs, jedes=40):
+    from sensitivitaet import ek_stufen, gitter, profil_schluessel
+    a = Abgleich("sensitivitaet")
+    for i in range(0, len(ps), jedes):
+        e = Eingaben(**ps[i])
+        ek_achse = ek_stufen(e.ek)
+        g = gitter(profil_schluessel(e), SENS_ZINS, SENS_TILGUNG, ek_achse)
+        basis = e.as_dict()
+        for x, ek in enumerate(ek_achse.tolist()):
+            for y, tilgung in enumerate(SENS_TILGUNG):
+                for z, zins in enumerate(SENS_ZINS):
+                    ref = referenz({**basis, "ek": ek, "tilgung": tilgung, "zins": zins})
+                    a.profil(i, {"max_preis": g["max_preis"][x, y, z], "wunsch_rate": g["wunsch_rate"][x, y, z],
+                                 "machbar": g["machbar"][x, y, z], "frei": g["frei"]},
+                             ref, ("max_preis", "wunsch_rate", "machbar", "frei"))
+    return a
+
+
+def lauf_sensitivitaet(ps):
+    from sensitivitaet import ZINS_ACHSE, TILGUNG_ACHSE, gitter, profil_schluessel
+    profil = profil_schluessel(Eingaben(**ps[0]))
+    ek_achse = (0, 30_000, 60_000, 90_000, 120_000)
+    return (lambda: gitter(profil, ek_achse=ek_achse)), len(ZINS_ACHSE) * len(TILGUNG_ACHSE) * len(ek_achse)
+
+
+def _angebote(rnd, n):
+    flaeche = [rnd.choice((math.nan, 0.0, float(rnd.randrange(20, 300)))) for _ in range(n)]
+    miete = [rnd.choice((math.nan, float(rnd.randrange(0, 3000, 10)))) for _ in range(n)]
+    return {"titel": [f"Angebot {j}" for j in range(n)],
+            "preis": np.array([float(rnd.randrange(20_000, 1_200_000, 1000)) for _ in range(n)]),
+            "wohnflaeche": np.array(flaeche), "miete": np.array(miete)}
+
+
+def pfad_screener(ps, refs, jedes=40, seed=SEED):
+    from screener import bewerte
+    a = Abgleich("screener")
+    rnd = random.Random(seed)
+    for i in range(0, len(ps), jedes):
+        e = Eingaben(**ps[i])
+        basis = e.as_dict()
+        angebote = _angebote(rnd, 25)
+        res = bewerte(e, angebote)
+        for j in range(len(angebote["preis"])):
+            f, m = angebote["wohnflaeche"][j], angebote["miete"][j]
+            hat_flaeche = math.isfinite(f) and f > 0
+            p = {**basis, "wunsch_preis": float(angebote["preis"][j]),
+                 "wohnflaeche": f if hat_flaeche else basis["wohnflaeche"],
+                 "bewirt": f * 4.0 if hat_flaeche else basis["bewirt"]}
+            if p["nutzung"] != OPTIONS_NUTZUNG[0] and math.isfinite(m):
+                p["neue_miete"] = m
+            ref = referenz(p)
+            soll = {"rate": ref["wunsch_rate"], "darlehen": ref["wunsch_darlehen"], "nk": ref["wunsch_nk_euro"],
+                    "frei": ref["frei"], "frei_bank": ref["frei_bank"], "luecke": ref["frei"] - ref["wunsch_rate"],
+                    "machbar": ref["machbar"] and ref["frei"] >= 0,
+                    "machbar_bank": ref["wunsch_rate"] <= ref["frei_bank"] and ref["frei_bank"] >= 0}
+            a.profil(i, {k: res[k][j] for k in soll}, soll, tuple(soll))
+    return a
+
+
+def lauf_screener(ps):
+    from screener import bewerte
+    e = Eingaben(**ps[0])
+    angebote = _angebote(random.Random(SEED), 10_000)
+    return (lambda: bewerte(e, angebote)), len(angebote["preis"])
+
+
+PFADE = {
+    "skalar": (pfad_skalar, lauf_skalar),
+    "batch": (pfad_batch, lauf_batch),
+    "rechengraph": (pfad_rechengraph, lauf_rechengraph),
+    "banken": (pfad_banken, lauf_banken),
+    "api_check": (pfad_api_check, lauf_api_check),
+    "api_batch": (pfad_api_batch, lauf_api_batch),
+    "export": (pfad_export, lauf_export),
+    "sicherung": (pfad_sicherung, lauf_sicherung),
+    "sensitivitaet": (pfad_sensitivitaet, lauf_sensitivitaet),
+    "screener": (pfad_screener, lauf_screener),
+}
+
+
+# ==========================================
+# ⏱ DURCHSATZ
+# ==========================================
+def durchsatz(lauf_fabrik, ps, wiederholungen=5):
+    """Bester Durchsatz (Einheiten/s) aus mehreren Läufen -- robust gegen Ausreißer nach oben."""
+    lauf, anzahl = lauf_fabrik(ps)
+    lauf()
+    beste = math.inf
+    for _ in range(wiederholungen):
+        t = time.perf_counter()
+        lauf()
+        beste = min(beste, time.perf_counter() - t)
+    return anzahl / beste
+
+
+# ==========================================
+# ▶️ CLI
+# ==========================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alle Rechenpfade gegen die Referenzformeln prüfen.")
+    parser.add_argument("--profile", type=int, default=20_000, help="Anzahl Zufallsprofile (Standard 20000)")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--nur", help="Kommagetrennte Pfade, z.B. skalar,batch")
+    parser.add_argument("--ohne-durchsatz", action="store_true", help="Nur Zahlen prüfen, keine Zeitmessung")
+    parser.add_argument("--durchsatz-profile", type=int, default=5000, help="Profile pro Durchsatzmessung")
+    parser.add_argument("--faktor", type=float, default=float(os.environ.get("IMMO_DURCHSATZ_FAKTOR", "1")),
+                        help="Skaliert die Mindestwerte (z.B. 0.5 auf langsamer CI-Maschine)")
+    args = parser.parse_args(argv)
+
+    namen = args.nur.split(",") if args.nur else list(PFADE)
+    unbekannt = [n for n in namen if n not in PFADE]
+    if unbekannt:
+        parser.error(f"Unbekannte Pfade: {', '.join(unbekannt)} (verfügbar: {', '.join(PFADE)})")
+
+    t = time.perf_counter()
+    ps = profile(args.profile, args.seed)
+    refs = [referenz(p) for p in ps]
+    print(f"{len(ps)} Profile (Seed {args.seed}) in {time.perf_counter() - t:.1f} s erzeugt; "
+          f"frei<=0: {sum(r['frei'] <= 0 for r in refs)}, Annuität 0: {sum(r['annuitaet'] == 0 for r in refs)}, "
+          f"Darlehen<=0 mit Wunsch: {sum(r['wunsch_darlehen'] <= 0 < p['wunsch_preis'] for p, r in zip(ps, refs))}, "
+          f"frei_bank<0<frei: {sum(r['frei_bank'] < 0 < r['frei'] for r in refs)}")
+
+    fehler = False
+    for name in namen:
+        pruefen, lauf = PFADE[name]
+        t = time.perf_counter()
+        a = pruefen(ps, refs)
+        zeile = (f"{name:<14} {a.geprueft:>7} geprüft  {a.abweichungen:>5} Abweichungen  "
+                 f"max. {a.max_abweichung:.2e}  ({time.perf_counter() - t:.1f} s)")
+        if a.abweichungen or not a.geprueft:
+            fehler = True
+            zeile += "  FEHLER" if a.geprueft else "  FEHLER (nichts geprüft)"
+        if not args.ohne_durchsatz:
+            ist = durchsatz(lauf, ps[:args.durchsatz_profile])
+            mindest = MINDEST_DURCHSATZ[name] * args.faktor
+            zeile += f"  |  {ist:>12,.0f}/s (mind. {mindest:,.0f})".replace(",", ".")
+            if ist < mindest:
+                fehler = True
+                zeile += "  ZU LANGSAM"
+        print(zeile)
+        for b in a.beispiele:
+            print(f"    {b}")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
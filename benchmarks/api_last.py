@@ -0,0 +1,169 @@
+"""Lasttest für ``api.py``, komplett gegen localhost.
+
+Startet die API in einem eigenen Prozess (oder nutzt ``--url``) und feuert
+über mehrere Keep-Alive-Verbindungen gleichzeitig Anfragen ab. Der Client
+ist ein schlanker asyncio-HTTP/1.1-Client, damit die Messung nicht an einer
+Client-Bibliothek hängt. Profile kommen aus ``kunden.py`` (fester Seed).
+
+Beispiele::
+
+    python benchmarks/api_last.py                              # check + batch, je 10 s
+    python benchmarks/api_last.py --modus batch --batch 5000 --verbindungen 4
+    python benchmarks/api_last.py --url http://127.0.0.1:8601 --dauer 30 --out last.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kunden import zufallsprofile  # noqa: E402
+
+# Wie der Server: ist ein Token gesetzt, schickt der Lasttest es mit
+TOKEN = os.environ.get("IMMO_API_TOKEN")
+
+
+# ==========================================
+# 🔌 CLIENT
+# ==========================================
+class Verbindung:
+    """Eine Keep-Alive-Verbindung; eine Anfrage zur Zeit."""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+        self.auth = f"Authorization: Bearer {TOKEN}\r\n" if TOKEN else ""
+
+    async def post(self, pfad, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"POST {pfad} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"{self.auth}Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        laenge = 0
+        while (zeile := await self.reader.readline()) not in (b"\r\n", b""):
+            name, _, wert = zeile.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                laenge = int(wert)
+        await self.reader.readexactly(laenge)
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+async def _lauf(host, port, pfad, bodies, profile_pro_anfrage, verbindungen, dauer):
+    latenzen, fehler = [], 0
+    ende = time.perf_counter() + dauer
+
+    async def arbeiter(nr):
+        nonlocal fehler
+        v = Verbindung(host, port)
+        i = nr
+        try:
+            while time.perf_counter() < ende:
+                t = time.perf_counter()
+                status = await v.post(pfad, bodies[i % len(bodies)])
+                latenzen.append((time.perf_counter() - t) * 1000)
+                fehler += status != 200
+                i += verbindungen
+        finally:
+            await v.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(arbeiter(n) for n in range(verbindungen)))
+    sekunden = time.perf_counter() - start
+    latenzen.sort()
+
+    def p(q):
+        return round(latenzen[min(int(q * len(latenzen)), len(latenzen) - 1)], 2)
+
+    return {
+        "anfragen": len(latenzen), "fehler": fehler, "sekunden": round(sekunden, 2),
+        "anfragen_pro_s": round(len(latenzen) / sekunden, 1),
+        "profile_pro_s": round(len(latenzen) * profile_pro_anfrage / sekunden, 1),
+        "p50_ms": p(0.50), "p95_ms": p(0.95), "p99_ms": p(0.99), "max_ms": round(latenzen[-1], 2),
+        "mittel_ms": round(statistics.fmean(latenzen), 2),
+    }
+
+
+# ==========================================
+# 🚀 ABLAUF
+# ==========================================
+def _server_starten(port):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "api.py"), "--port", str(port)], cwd=ROOT)
+    grenze = time.time() + 20
+    while time.time() < grenze:
+        try:
+            import urllib.request
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("API ist nicht gestartet.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest für die HTTP-API (localhost).")
+    parser.add_argument("--url", help="Laufende API (Standard: eigenen Server auf --port starten)")
+    parser.add_argument("--port", type=int, default=8699)
+    parser.add_argument("--modus", choices=("check", "batch", "beide"), default="beide")
+    parser.add_argument("--dauer", type=float, default=10.0, help="Sekunden je Modus (Standard: 10)")
+    parser.add_argument("--verbindungen", type=int, default=16, help="Gleichzeitige Verbindungen (Standard: 16)")
+    parser.add_argument("--batch", type=int, default=1000, help="Profile pro Batch-Anfrage (Standard: 1000)")
+    parser.add_argument("--out", help="Ergebnis als JSON speichern")
+    args = parser.parse_args(argv)
+
+    proc = None
+    if args.url:
+        teile = urlsplit(args.url)
+        host, port = teile.hostname, teile.port or 80
+    else:
+        host, port = "127.0.0.1", args.port
+        proc = _server_starten(port)
+
+    profile = [e.as_dict() for e in zufallsprofile(max(args.batch, 1000))]
+    ergebnis = {}
+    try:
+        if args.modus in ("check", "beide"):
+            bodies = [json.dumps(p).encode() for p in profile[:1000]]
+            ergebnis["check"] = asyncio.run(_lauf(host, port, "/v1/check", bodies, 1, args.verbindungen, args.dauer))
+        if args.modus in ("batch", "beide"):
+            body = json.dumps({"profile": profile[:args.batch]}).encode()
+            # Batch-Anfragen sind CPU-lastig: weniger Verbindungen als beim Einzel-Check reichen
+            ergebnis["batch"] = asyncio.run(_lauf(host, port, "/v1/batch", [body], args.batch,
+                                                  max(1, min(args.verbindungen, 4)), args.dauer))
+        import urllib.request
+        anfrage = urllib.request.Request(f"http://{host}:{port}/v1/metriken",
+                                         headers={"Authorization": f"Bearer {TOKEN}"} if TOKEN else {})
+        ergebnis["server"] = json.loads(urllib.request.urlopen(anfrage).read())
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    for modus in ("check", "batch"):
+        if modus in ergebnis:
+            r = ergebnis[modus]
+            print(f"{modus:<6} {r['anfragen_pro_s']:>9,.0f} Anfr./s {r['profile_pro_s']:>11,.0f} Profile/s  "
+                  f"p50 {r['p50_ms']:.2f} ms  p95 {r['p95_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms  Fehler {r['fehler']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"parameter": vars(args), **ergebnis}, f, indent=2)
+    return 1 if any(ergebnis[m]["fehler"] for m in ("check", "batch") if m in ergebnis) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Feste, geseedete Kundenprofile für Benchmarks.
+
+Gleicher Seed -> gleiche Profile, auf jeder Maschine. Die Verteilungen decken
+alle Nutzungsarten, Singles/Paare, Sozialleistungen und Bestandsobjekte ab.
+"""
+import random
+
+from engine import OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben
+
+SEED = 20260101
+
+
+def zufallsprofile(n, seed=SEED):
+    """Liefert ``n`` reproduzierbare ``Eingaben``-Records."""
+    rnd = random.Random(seed)
+    profile = []
+    for i in range(n):
+        paar = rnd.random() < 0.6
+        nutzung = rnd.choices(OPTIONS_NUTZUNG, weights=(6, 2, 2))[0]
+        bestand = rnd.random() < 0.15
+        profile.append(Eingaben(
+            name=f"Kunde {i}",
+            nutzung=nutzung,
+            wohnflaeche=rnd.randrange(40, 220, 5),
+            akt_miete=rnd.choice((0, rnd.randrange(400, 2200, 50))),
+            neue_miete=rnd.randrange(300, 1500, 50) if nutzung != OPTIONS_NUTZUNG[0] else 0,
+            gehalt_h=rnd.randrange(1500, 7000, 50),
+            erwachsene=OPTIONS_ERWACHSENE[1] if paar else OPTIONS_ERWACHSENE[0],
+            gehalt_p=rnd.randrange(0, 5000, 50) if paar else 0,
+            kinder=rnd.choice((0, 0, 1, 2, 3)),
+            kinderzuschlag=rnd.choice((0, 0, 0, 250)),
+            wohngeld=rnd.choice((0, 0, 0, 180)),
+            neben=rnd.choice((0, 0, 450)),
+            sonst=rnd.choice((0, 0, 200)),
+            puffer=rnd.randrange(100, 500, 50),
+            konsum=rnd.choice((0, 0, 150, 300)),
+            bauspar=rnd.choice((0, 0, 100)),
+            ek=rnd.randrange(0, 200_000, 5000),
+            zins=round(rnd.uniform(2.5, 5.5), 2),
+            tilgung=round(rnd.uniform(1.0, 3.5), 2),
+            zinsbindung=rnd.choice((5, 10, 15, 20)),
+            miete_bestand=rnd.randrange(300, 1200, 50) if bestand else 0,
+            rate_bestand=rnd.randrange(200, 900, 50) if bestand else 0,
+            wunsch_preis=rnd.choice((0, rnd.randrange(150_000, 700_000, 5000))),
+            renovierung=rnd.choice((0, 0, 20_000)),
+        ))
+    return profile
+
+
+def kurzprofil():
+    """PDF ohne Wunsch-Objekt und ohne Mietvergleich (Kapitalanlage, keine Miete)."""
+    return Eingaben(name="Kurz", nutzung=OPTIONS_NUTZUNG[2], akt_miete=0, neue_miete=600)
+
+
+def vollprofil():
+    """PDF mit allen Abschnitten: Sozialleistungen, Mietvergleich, Wunsch-Objekt."""
+    return Eingaben(name="Voll", nutzung=OPTIONS_NUTZUNG[1], akt_miete=1100, neue_miete=500,
+                    gehalt_p=2200, kinderzuschlag=250, wohngeld=120, miete_bestand=600, rate_bestand=400,
+                    wunsch_preis=420_000, renovierung=25_000)
@@ -0,0 +1,102 @@
+"""Kaltstart-Benchmark: Importzeit und Zeit bis zur ersten Anzeige.
+
+Jede Messung läuft in einem frischen Python-Prozess (sonst wären alle Module
+schon geladen). Gemessen werden:
+
+* ``import_ms``: Import von Streamlit und den leichten App-Modulen
+* ``first_paint_ms``: erster Lauf von ``app.py`` bis zur Passwort-Maske
+* ``first_page_ms``: erster Lauf nach erfolgreichem Login (ganze Seite)
+* ``schwere_module_vor_login``: NumPy/Pandas/Plotly/FPDF, die schon für die
+  Passwort-Maske geladen wurden (soll leer bleiben)
+
+Beispiel::
+
+    python benchmarks/startup.py --runs 5 --out startup.json
+    python benchmarks/startup.py --baseline startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHWERE_MODULE = ("numpy", "pandas", "plotly.express", "fpdf")
+
+_MESSUNG = r"""
+import json, logging, sys, time
+sys.path.insert(0, {root!r})
+logging.disable(logging.WARNING)
+t = time.perf_counter()
+import streamlit, engine, pdf_cache, rechengraph
+import_ms = (time.perf_counter() - t) * 1000
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.secrets["password"] = "benchmark"
+if {eingeloggt!r}:
+    at.session_state["password_correct"] = True
+t = time.perf_counter()
+at.run()
+lauf_ms = (time.perf_counter() - t) * 1000
+if at.exception:
+    raise SystemExit(str(at.exception))
+print(json.dumps({{"import_ms": import_ms, "lauf_ms": lauf_ms,
+                  "module": [m for m in {module!r} if m in sys.modules]}}))
+"""
+
+
+def _messe(eingeloggt):
+    code = _MESSUNG.format(root=ROOT, app=os.path.join(ROOT, "app.py"), eingeloggt=eingeloggt, module=SCHWERE_MODULE)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def messen(runs=5):
+    login = [_messe(False) for _ in range(runs)]
+    seite = [_messe(True) for _ in range(runs)]
+    return {
+        "runs": runs,
+        "import_ms": statistics.median(m["import_ms"] for m in login),
+        "first_paint_ms": statistics.median(m["lauf_ms"] for m in login),
+        "first_page_ms": statistics.median(m["lauf_ms"] for m in seite),
+        "schwere_module_vor_login": sorted({x for m in login for x in m["module"]}),
+    }
+
+
+def vergleiche(ergebnis, baseline, toleranz):
+    """Liefert Meldungen für alle Kennzahlen, die mehr als ``toleranz`` langsamer sind."""
+    meldungen = []
+    for key in ("import_ms", "first_paint_ms", "first_page_ms"):
+        alt, neu = baseline.get(key), ergebnis[key]
+        if alt and neu > alt * (1 + toleranz):
+            meldungen.append(f"{key}: {neu:.0f} ms statt {alt:.0f} ms (+{(neu / alt - 1) * 100:.0f} %)")
+    if ergebnis["schwere_module_vor_login"]:
+        meldungen.append(f"vor dem Login geladen: {', '.join(ergebnis['schwere_module_vor_login'])}")
+    return meldungen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kaltstart-Benchmark für app.py")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", help="Ergebnis als JSON speichern")
+    parser.add_argument("--baseline", help="Mit gespeichertem Ergebnis vergleichen")
+    parser.add_argument("--toleranz", type=float, default=0.25, help="Erlaubte Verschlechterung (Standard: 0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    ergebnis = messen(args.runs)
+    print(json.dumps(ergebnis, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(ergebnis, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            meldungen = vergleiche(ergebnis, json.load(f), args.toleranz)
+        for m in meldungen:
+            print(f"REGRESSION {m}")
+        return 1 if meldungen else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
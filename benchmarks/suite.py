@@ -0,0 +1,334 @@
+"""Benchmark-Suite: Rechenkern, Batch, PDF, Exporte und kompletter App-Rerun.
+
+Alle Fälle nutzen die festen Profile aus ``kunden.py``. Pro Fall wird
+mehrfach gemessen und der Median gespeichert (plus Minimum und Streuung).
+
+Für die Tilgungsplan-Exporte misst ``tracemalloc`` zusätzlich den
+Speicher-Spitzenwert bei 120 und 480 Monaten. Mit ``--baseline`` schlägt der
+Lauf fehl, wenn dieser Wert mit der Laufzeit wächst (über ``SPEICHER_PRO_MONAT``
+hinaus) oder gegenüber der Baseline um mehr als die Toleranz steigt.
+
+Beispiele::
+
+    python benchmarks/suite.py --out baseline.json
+    python benchmarks/suite.py --baseline baseline.json          # Exit 1 bei Regression
+    python benchmarks/suite.py --nur engine_skalar,batch_10k --wiederholungen 9
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from kunden import SEED, kurzprofil, vollprofil, zufallsprofile  # noqa: E402
+
+
+def _zeiten(fn, wiederholungen, aufwaermen=1):
+    for _ in range(aufwaermen):
+        fn()
+    ts = []
+    for _ in range(wiederholungen):
+        t = time.perf_counter()
+        fn()
+        ts.append((time.perf_counter() - t) * 1000)
+    return ts
+
+
+# ==========================================
+# 🧪 FÄLLE
+# ==========================================
+# Jeder Fall liefert (Messfunktion, Einheit-Teiler): die Zeit wird durch den
+# Teiler geteilt, z.B. pro Profil bei der skalaren Rechnung.
+def fall_engine_skalar():
+    from engine import berechne
+    profile = zufallsprofile(10_000)
+
+    def lauf():
+        for e in profile:
+            berechne(e)
+    return lauf, len(profile)
+
+
+def _fall_batch(n):
+    from batch_engine import berechne_batch, spalten_aus_eingaben
+    sp = spalten_aus_eingaben(zufallsprofile(n))
+    return (lambda: berechne_batch(sp)), 1
+
+
+def fall_batch_10k():
+    return _fall_batch(10_000)
+
+
+def fall_batch_100k():
+    return _fall_batch(100_000)
+
+
+def _fall_pdf(e):
+    from engine import berechne
+    from zertifikat import create_pdf
+    r = berechne(e)
+    return (lambda: create_pdf(e, r)), 1
+
+
+def fall_pdf_kurz():
+    return _fall_pdf(kurzprofil())
+
+
+def fall_pdf_voll():
+    return _fall_pdf(vollprofil())
+
+
+def fall_pdf_serie(n=100, mit_vorlage=False):
+    """Je Lauf ``n`` neue Profile (wie Bulk-Export oder viele Sessions); Zeit pro Dokument.
+
+    Ohne Vorlage baut jedes Dokument seine festen Texte neu (vorher), mit teilen
+    sich alle eine ``Vorlage`` wie in App und Bulk-Export (nachher).
+    """
+    from itertools import cycle
+
+    from engine import berechne
+    from zertifikat import Vorlage, create_pdf
+    profile = [(e, berechne(e)) for e in zufallsprofile(10 * n)]
+    serien = cycle([profile[i:i + n] for i in range(0, len(profile), n)])
+    vorlage = Vorlage() if mit_vorlage else None
+
+    def lauf():
+        for e, r in next(serien):
+            create_pdf(e, r, vorlage=vorlage)
+    return lauf, n
+
+
+def fall_pdf_serie_vorlage():
+    return fall_pdf_serie(mit_vorlage=True)
+
+
+def _betraege(n=100):
+    """Die Beträge eines Zertifikats für ``n`` Profile (wie sie pro Dokument formatiert werden)."""
+    from engine import berechne
+    werte = []
+    for e in zufallsprofile(n):
+        r = berechne(e)
+        werte += [e.gehalt_h, e.gehalt_p, e.lebenshaltung, e.bewirt, e.puffer, e.ek, e.wunsch_preis,
+                  r.einnahmen, r.ausgaben, r.frei, r.max_preis, r.max_nk_euro, r.max_kredit, r.wunsch_rate]
+    return werte
+
+
+def fall_pdf_eur_ungemerkt():
+    """Vorher: Formatierung plus drei ``replace`` für jeden Betrag."""
+    from format_de import _format
+    werte = _betraege()
+
+    def lauf():
+        for w in werte:
+            _format(w) + " EUR"
+    return lauf, len(werte)
+
+
+def fall_pdf_eur_gemerkt():
+    """Nachher: ``pdf_eur`` mit prozessweitem LRU-Cache (Wiederholung wie bei Reruns/Serien)."""
+    from format_de import pdf_eur
+    werte = _betraege()
+
+    def lauf():
+        for w in werte:
+            pdf_eur(w)
+    return lauf, len(werte)
+
+
+def _langer_plan(monate=480):
+    """Vollprofil mit 1 % Tilgung: der Plan läuft länger als 40 Jahre, ``monate`` Zeilen werden geschrieben."""
+    from engine import berechne
+    from tilgung import monatszeilen
+    e = vollprofil()
+    e.tilgung, e.zins = 1.0, 3.0
+    r = berechne(e)
+    return e, r, (lambda: monatszeilen(r.wunsch_darlehen, e.zins, e.tilgung, None, max_jahre=monate // 12))
+
+
+def _pdf_plan(monate):
+    from zertifikat import create_pdf
+    e, r, zeilen = _langer_plan(monate)
+    return lambda: create_pdf(e, r, zeilen())
+
+
+def _xlsx_plan(monate):
+    import io
+
+    from openpyxl import Workbook
+
+    from xlsx_export import schreibe_plan
+    e, r, zeilen = _langer_plan(monate)
+
+    def lauf():
+        wb = Workbook(write_only=True)
+        schreibe_plan(wb.create_sheet("Tilgungsplan"), zeilen(), e.zinsbindung * 12)
+        wb.save(io.BytesIO())
+    return lauf
+
+
+def fall_pdf_plan_480():
+    return _pdf_plan(480), 1
+
+
+def fall_xlsx_plan_480():
+    return _xlsx_plan(480), 1
+
+
+def fall_app_rerun():
+    """Geskripteter Rerun von app.py (Einkommen ändert sich bei jedem Lauf)."""
+    logging.disable(logging.WARNING)
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.secrets["password"] = "benchmark"
+    at.session_state["password_correct"] = True
+    at.run()
+    at.sidebar.number_input(key="sb_wunsch_preis").set_value(350_000).run()
+    schritt = iter(range(10**9))
+
+    def lauf():
+        at.sidebar.number_input(key="sb_gehalt_h").set_value(3000 + 50 * (next(schritt) % 40))
+        at.run()
+        if at.exception:
+            raise RuntimeError(str(at.exception))
+    return lauf, 1
+
+
+FAELLE = {
+    "engine_skalar": (fall_engine_skalar, "us/Profil"),
+    "batch_10k": (fall_batch_10k, "ms"),
+    "batch_100k": (fall_batch_100k, "ms"),
+    "pdf_kurz": (fall_pdf_kurz, "ms"),
+    "pdf_voll": (fall_pdf_voll, "ms"),
+    "pdf_serie": (fall_pdf_serie, "us/Dokument"),
+    "pdf_serie_vorlage": (fall_pdf_serie_vorlage, "us/Dokument"),
+    "pdf_eur_ungemerkt": (fall_pdf_eur_ungemerkt, "us/Wert"),
+    "pdf_eur_gemerkt": (fall_pdf_eur_gemerkt, "us/Wert"),
+    "pdf_plan_480": (fall_pdf_plan_480, "ms"),
+    "xlsx_plan_480": (fall_xlsx_plan_480, "ms"),
+    "app_rerun": (fall_app_rerun, "ms"),
+}
+
+
+# ==========================================
+# 🧠 SPEICHER (Spitzenwert je Laufzeit)
+# ==========================================
+SPEICHER_MONATE = (120, 480)
+# Erlaubter Zuwachs des Spitzenwerts je zusätzlichem Monat (Bytes). Die Zeilen
+# selbst werden gestreamt; FPDF hält aber den Seiteninhalt des Dokuments bis
+# zur Ausgabe unkomprimiert (~0,6 KB je Tabellenzeile) -- das ist erlaubt,
+# eine materialisierte Zeilenliste oder Ähnliches käme obendrauf.
+SPEICHER_PRO_MONAT = {"pdf_plan_480": 1024, "xlsx_plan_480": 0}
+SPEICHER_FAELLE = {"pdf_plan_480": _pdf_plan, "xlsx_plan_480": _xlsx_plan}
+# Rauschen (Allocator, Caches), relativ zum kürzeren Plan
+SPEICHER_RAUSCHEN = 0.05
+
+
+def spitze_kb(lauf):
+    """Speicher-Spitzenwert (KB) eines Laufs; vorher einmal aufwärmen (Import-, Format-Caches)."""
+    lauf()
+    tracemalloc.start()
+    try:
+        lauf()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def speicher(name):
+    return {str(m): round(spitze_kb(SPEICHER_FAELLE[name](m)), 1) for m in SPEICHER_MONATE}
+
+
+def speicher_meldungen(name, peak_kb):
+    kurz, lang = (peak_kb[str(m)] for m in SPEICHER_MONATE)
+    erlaubt = kurz * (1 + SPEICHER_RAUSCHEN) + SPEICHER_PRO_MONAT[name] * (SPEICHER_MONATE[1] - SPEICHER_MONATE[0]) / 1024
+    if lang > erlaubt:
+        return [f"{name}: Speicher wächst mit der Laufzeit ({kurz:.0f} KB bei {SPEICHER_MONATE[0]} Monaten, "
+                f"{lang:.0f} KB bei {SPEICHER_MONATE[1]}; erlaubt {erlaubt:.0f} KB)"]
+    return []
+
+
+def messen(namen=None, wiederholungen=7):
+    ergebnisse = {}
+    for name in namen or FAELLE:
+        aufbau, einheit = FAELLE[name]
+        lauf, teiler = aufbau()
+        ts = _zeiten(lauf, wiederholungen)
+        faktor = (1000 if einheit.startswith("us") else 1) / teiler
+        werte = [t * faktor for t in ts]
+        ergebnisse[name] = {
+            "einheit": einheit,
+            "median": statistics.median(werte),
+            "min": min(werte),
+            "stdev": statistics.stdev(werte) if len(werte) > 1 else 0.0,
+            "n": len(werte),
+        }
+        print(f"{name:<18} {ergebnisse[name]['median']:>10.3f} {einheit}  (min {ergebnisse[name]['min']:.3f})",
+              file=sys.stderr)
+        if name in SPEICHER_FAELLE:
+            ergebnisse[name]["peak_kb"] = speicher(name)
+            print(f"{'':<18} Spitze {ergebnisse[name]['peak_kb']} KB (Monate)", file=sys.stderr)
+    return {
+        "meta": {"python": platform.python_version(), "plattform": platform.platform(), "seed": SEED,
+                 "zeit": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "faelle": ergebnisse,
+    }
+
+
+def vergleiche(ergebnis, baseline, toleranz):
+    """Meldungen für alle Fälle, deren Median (bzw. Speicher-Spitze) mehr als ``toleranz`` über der
+    Baseline liegt, und für Exporte, deren Speicher mit der Laufzeit wächst."""
+    meldungen = []
+    for name, neu in ergebnis["faelle"].items():
+        if "peak_kb" in neu:
+            meldungen += speicher_meldungen(name, neu["peak_kb"])
+        alt = baseline.get("faelle", {}).get(name)
+        for monate, kb in (neu.get("peak_kb") or {}).items():
+            kb_alt = ((alt or {}).get("peak_kb") or {}).get(monate)
+            if kb_alt and kb > kb_alt * (1 + toleranz):
+                meldungen.append(f"{name}: Speicher-Spitze {kb:.0f} statt {kb_alt:.0f} KB bei {monate} Monaten")
+        if not alt or not alt["median"]:
+            continue
+        verhaeltnis = neu["median"] / alt["median"]
+        if verhaeltnis > 1 + toleranz:
+            meldungen.append(f"{name}: {neu['median']:.3f} statt {alt['median']:.3f} {neu['einheit']} "
+                             f"(+{(verhaeltnis - 1) * 100:.0f} %)")
+    return meldungen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite für den Finanzierungscheck")
+    parser.add_argument("--nur", help=f"Kommagetrennte Auswahl aus: {', '.join(FAELLE)}")
+    parser.add_argument("--wiederholungen", type=int, default=7)
+    parser.add_argument("--out", help="Ergebnis als JSON speichern")
+    parser.add_argument("--baseline", help="Mit gespeichertem Ergebnis vergleichen")
+    parser.add_argument("--toleranz", type=float, default=0.20, help="Erlaubte Verschlechterung (Standard: 0.20 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    namen = args.nur.split(",") if args.nur else None
+    unbekannt = set(namen or ()) - set(FAELLE)
+    if unbekannt:
+        parser.error(f"Unbekannte Fälle: {', '.join(sorted(unbekannt))}")
+
+    ergebnis = messen(namen, args.wiederholungen)
+    print(json.dumps(ergebnis, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(ergebnis, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            meldungen = vergleiche(ergebnis, json.load(f), args.toleranz)
+        for m in meldungen:
+            print(f"REGRESSION {m}", file=sys.stderr)
+        return 1 if meldungen else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
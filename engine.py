@@ -0,0 +1,254 @@
+"""Rechenkern des Finanzierungschecks (ohne Streamlit, Plotly oder FPDF).
+
+Eingaben und Ergebnisse sind schlanke ``__slots__``-Records, damit der Kern
+auch in Batch-Jobs, Benchmarks und Exporten ohne laufende Session nutzbar ist.
+"""
+
+# ==========================================
+# ⚙️ KONSTANTEN (Bank-Logik)
+# ==========================================
+OPTIONS_NUTZUNG = [
+    "Eigenheim (Nur Selbstbezug)",
+    "Eigenheim mit Vermietung (Einliegerw./MFH)",
+    "Kapitalanlage (Reine Vermietung)",
+]
+OPTIONS_ERWACHSENE = ["Alleinstehend", "Paar (2 Personen)"]
+OPTIONS_BESTAND = ["Summe", "Portfolio (CSV)"]
+
+KINDERGELD = 250
+# Lebenshaltungs-Pauschale: Basis + pro Kind + Zuschlag, wenn Netto > Schwelle
+LEBENSHALTUNG_SINGLE = 1000.0
+LEBENSHALTUNG_PAAR = 1700.0
+LEBENSHALTUNG_PRO_KIND = 350.0
+EINKOMMENS_ZUSCHLAEGE = ((4000, 200), (6000, 300), (8000, 400))
+BEWIRT_PRO_QM = 4.0
+ANRECHNUNG_MIETE_BESTAND = 0.75
+ANRECHNUNG_MIETE_NEU = 0.80
+
+
+def get_bank_richtwert(netto, erw, kind):
+    # 1. Basis
+    basis = LEBENSHALTUNG_SINGLE if erw == "Alleinstehend" else LEBENSHALTUNG_PAAR
+    basis += (kind * LEBENSHALTUNG_PRO_KIND)
+
+    # 2. Lifestyle-Zuschlag
+    zuschlag = 0.0
+    for schwelle, betrag in EINKOMMENS_ZUSCHLAEGE:
+        if netto > schwelle: zuschlag += betrag
+    return basis + zuschlag
+
+
+def bewirtschaftung(qm):
+    return float(qm * BEWIRT_PRO_QM)
+
+
+# ==========================================
+# 📥 EINGABEN
+# ==========================================
+class Eingaben:
+    """Alle Werte, die die Sidebar (``sb_*``/``exp_*``/``renovierung``) liefert."""
+
+    __slots__ = (
+        "name", "nutzung", "wohnflaeche", "akt_miete", "neue_miete",
+        "gehalt_h", "erwachsene", "gehalt_p", "kinder",
+        "kinderzuschlag", "wohngeld", "neben", "sonst",
+        "lebenshaltung", "bewirt", "puffer", "konsum", "bauspar",
+        "ek", "zins", "tilgung", "zinsbindung", "sondertilgung", "miete_bestand", "rate_bestand",
+        "grunderwerb", "notar", "makler", "wunsch_preis", "renovierung",
+    )
+
+    def __init__(self, name="Kunde", nutzung=OPTIONS_NUTZUNG[0], wohnflaeche=120,
+                 akt_miete=1000, neue_miete=0, gehalt_h=3000, erwachsene=OPTIONS_ERWACHSENE[1],
+                 gehalt_p=0, kinder=1, kinderzuschlag=0, wohngeld=0, neben=0, sonst=0,
+                 lebenshaltung=None, bewirt=None, puffer=250, konsum=0, bauspar=0,
+                 ek=60000, zins=3.8, tilgung=2.0, zinsbindung=10, sondertilgung=0,
+                 miete_bestand=0, rate_bestand=0,
+                 grunderwerb=6.5, notar=2.0, makler=3.57, wunsch_preis=0, renovierung=0):
+        self.name = name
+        self.nutzung = nutzung
+        self.wohnflaeche = wohnflaeche
+        self.akt_miete = akt_miete
+        self.neue_miete = neue_miete
+        self.gehalt_h = gehalt_h
+        self.erwachsene = erwachsene
+        self.gehalt_p = gehalt_p
+        self.kinder = kinder
+        self.kinderzuschlag = kinderzuschlag
+        self.wohngeld = wohngeld
+        self.neben = neben
+        self.sonst = sonst
+        if lebenshaltung is None:
+            lebenshaltung = get_bank_richtwert(self.netto_einkommen(), erwachsene, kinder)
+        self.lebenshaltung = lebenshaltung
+        self.bewirt = bewirtschaftung(wohnflaeche) if bewirt is None else bewirt
+        self.puffer = puffer
+        self.konsum = konsum
+        self.bauspar = bauspar
+        self.ek = ek
+        self.zins = zins
+        self.tilgung = tilgung
+        self.zinsbindung = zinsbindung
+        self.sondertilgung = sondertilgung
+        self.miete_bestand = miete_bestand
+        self.rate_bestand = rate_bestand
+        self.grunderwerb = grunderwerb
+        self.notar = notar
+        self.makler = makler
+        self.wunsch_preis = wunsch_preis
+        self.renovierung = renovierung
+
+    def netto_einkommen(self):
+        return (self.gehalt_h + self.gehalt_p + self.kinder * KINDERGELD + self.kinderzuschlag
+                + self.wohngeld + self.neben + self.sonst)
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return f"Eingaben({self.as_dict()!r})"
+
+    @classmethod
+    def from_state(cls, state):
+        """Baut die Eingaben aus Session-State oder einem gespeicherten JSON-Dict."""
+        g = state.get
+        nutzung = g("sb_nutzung", OPTIONS_NUTZUNG[0])
+        erwachsene = g("sb_erwachsene", OPTIONS_ERWACHSENE[1])
+
+        neue_miete = 0
+        if nutzung == OPTIONS_NUTZUNG[1]:
+            neue_miete = g("sb_neue_miete_mix", 500)
+        elif nutzung == OPTIONS_NUTZUNG[2]:
+            neue_miete = g("sb_neue_miete_ka", 600)
+
+        miete_bestand, rate_bestand = 0, 0
+        if g("sb_hat_bestand", False):
+            if g("sb_bestand_modus", OPTIONS_BESTAND[0]) == OPTIONS_BESTAND[1] and g("sb_portfolio"):
+                from portfolio import Portfolio
+                agg = Portfolio.from_dict(g("sb_portfolio")).aggregat()
+                miete_bestand, rate_bestand = agg["miete"], agg["rate"]
+            else:
+                miete_bestand = g("sb_miete_bestand", 0)
+                rate_bestand = g("sb_rate_bestand", 0)
+
+        return cls(
+            name=g("sb_name", "Kunde"),
+            nutzung=nutzung,
+            wohnflaeche=g("sb_wohnflaeche", 120),
+            akt_miete=g("sb_akt_miete", 1000),
+            neue_miete=neue_miete,
+            gehalt_h=g("sb_gehalt_h", 3000),
+            erwachsene=erwachsene,
+            gehalt_p=g("sb_gehalt_p", 0) if erwachsene == OPTIONS_ERWACHSENE[1] else 0,
+            kinder=g("sb_kinder", 1),
+            kinderzuschlag=g("sb_kinderzuschlag", 0),
+            wohngeld=g("sb_wohngeld", 0),
+            neben=g("sb_neben", 0),
+            sonst=g("sb_sonst", 0),
+            lebenshaltung=g("exp_p_lebenshaltung"),
+            bewirt=g("exp_bewirt"),
+            puffer=g("sb_puffer", 250),
+            konsum=g("sb_konsum", 0),
+            bauspar=g("sb_bauspar", 0),
+            ek=g("sb_ek", 60000),
+            zins=g("sb_zins", 3.8),
+            tilgung=g("sb_tilgung", 2.0),
+            zinsbindung=g("sb_zinsbindung", 10),
+            sondertilgung=g("sb_sondertilgung", 0),
+            miete_bestand=miete_bestand,
+            rate_bestand=rate_bestand,
+            grunderwerb=g("sb_grunderwerb", 6.5),
+            notar=g("sb_notar", 2.0),
+            makler=g("sb_makler", 3.57),
+            wunsch_preis=g("sb_wunsch_preis", 0),
+            renovierung=g("renovierung", 0),
+        )
+
+
+# ==========================================
+# 📤 ERGEBNIS
+# ==========================================
+class Ergebnis:
+    """Abgeleitete Größen der Haushalts- und Kaufpreisrechnung."""
+
+    __slots__ = (
+        "kindergeld", "miete_bestand_anrechenbar", "miete_neu_calc", "belastung_alte_miete",
+        "einnahmen", "ausgaben", "frei", "annuitaet", "sozial_summe", "frei_bank",
+        "nk_prozent_gesamt", "max_kredit", "max_preis", "max_nk_euro",
+        "wunsch_nk_euro", "wunsch_invest", "wunsch_darlehen", "wunsch_rate",
+        "diff_miete", "neu_last",
+    )
+
+    def __init__(self, **werte):
+        for k in self.__slots__:
+            setattr(self, k, werte[k])
+
+    @property
+    def machbar(self):
+        return self.wunsch_rate <= self.frei
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+    def __repr__(self):
+        return f"Ergebnis({self.as_dict()!r})"
+
+
+# ==========================================
+# 🧮 RECHNUNG
+# ==========================================
+def berechne(e):
+    kindergeld = e.kinder * KINDERGELD
+    miete_bestand_anrechenbar = e.miete_bestand * ANRECHNUNG_MIETE_BESTAND
+
+    miete_neu_calc = 0.0
+    if e.nutzung != OPTIONS_NUTZUNG[0]:
+        miete_neu_calc = e.neue_miete * ANRECHNUNG_MIETE_NEU
+    belastung_alte_miete = e.akt_miete if e.nutzung == OPTIONS_NUTZUNG[2] else 0.0
+
+    einnahmen = (e.gehalt_h + e.gehalt_p + kindergeld + e.kinderzuschlag + e.wohngeld + e.neben
+                 + e.sonst + miete_bestand_anrechenbar + miete_neu_calc)
+    ausgaben = (e.lebenshaltung + e.bewirt + e.puffer + e.konsum + e.bauspar + e.rate_bestand
+                + belastung_alte_miete)
+    frei = einnahmen - ausgaben
+    annuitaet = e.zins + e.tilgung
+
+    # Sozialleistungs-Check (Bank-Sicht)
+    sozial_summe = e.kinderzuschlag + e.wohngeld
+    frei_bank = frei - sozial_summe
+
+    # Max Kaufpreis
+    nk_prozent_gesamt = e.grunderwerb + e.notar + e.makler
+    max_kredit = (frei * 12 * 100) / annuitaet if (frei > 0 and annuitaet > 0) else 0
+    max_preis = (max_kredit + e.ek) / (1 + (nk_prozent_gesamt / 100))
+    max_nk_euro = max_preis * (nk_prozent_gesamt / 100)
+
+    # Wunsch Objekt
+    wunsch_rate = 0.0
+    wunsch_nk_euro = 0.0
+    wunsch_invest = 0.0
+    wunsch_darlehen = 0.0
+    if e.wunsch_preis > 0:
+        wunsch_nk_euro = e.wunsch_preis * (nk_prozent_gesamt / 100)
+        wunsch_invest = e.wunsch_preis + wunsch_nk_euro + e.renovierung
+        wunsch_darlehen = wunsch_invest - e.ek
+        if wunsch_darlehen > 0:
+            wunsch_rate = (wunsch_darlehen * annuitaet) / 100 / 12
+        else:
+            wunsch_rate = 0
+
+    diff_miete = None
+    if e.akt_miete > 0 and e.nutzung != OPTIONS_NUTZUNG[2]:
+        neue_wohnkosten = frei + e.bewirt + e.puffer
+        diff_miete = neue_wohnkosten - e.akt_miete
+    neu_last = (frei + e.bewirt + e.puffer) if frei > 0 else 0
+
+    return Ergebnis(
+        kindergeld=kindergeld, miete_bestand_anrechenbar=miete_bestand_anrechenbar,
+        miete_neu_calc=miete_neu_calc, belastung_alte_miete=belastung_alte_miete,
+        einnahmen=einnahmen, ausgaben=ausgaben, frei=frei, annuitaet=annuitaet,
+        sozial_summe=sozial_summe, frei_bank=frei_bank, nk_prozent_gesamt=nk_prozent_gesamt,
+        max_kredit=max_kredit, max_preis=max_preis, max_nk_euro=max_nk_euro,
+        wunsch_nk_euro=wunsch_nk_euro, wunsch_invest=wunsch_invest,
+        wunsch_darlehen=wunsch_darlehen, wunsch_rate=wunsch_rate,
+        diff_miete=diff_miete, neu_last=neu_last,
+    )
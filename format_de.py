@@ -0,0 +1,102 @@
+"""Deutsche Zahlen- und Währungsformate (1.234,56), prozessweit gemerkt.
+
+App, Zertifikat und Exporte formatieren pro Rerun bzw. Dokument hunderte
+Beträge, meist immer wieder dieselben (Pauschalen, Budget, Raten). Jeder
+Formatierer hat deshalb einen begrenzten LRU-Cache; ein Treffer kostet nur
+noch einen Dict-Zugriff statt Formatierung plus drei ``replace``.
+
+Die Größe pro Cache steuert ``IMMO_FORMAT_CACHE`` (Standard 4096 Einträge).
+
+Umgekehrt liest ``lies_zahl`` Beträge aus importierten CSVs (Screener,
+Portfolio), deutsch wie englisch geschrieben.
+"""
+import math
+import os
+import re
+from functools import lru_cache
+
+CACHE_GROESSE = int(os.environ.get("IMMO_FORMAT_CACHE", "4096"))
+
+
+def _format(wert):
+    return f"{wert:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+@lru_cache(maxsize=CACHE_GROESSE)
+def _zahl(wert):
+    return _format(wert)
+
+
+@lru_cache(maxsize=CACHE_GROESSE)
+def _eur(wert):
+    return _format(wert) + " €"
+
+
+@lru_cache(maxsize=CACHE_GROESSE)
+def _pdf_eur(wert):
+    return _format(wert) + " EUR"
+
+
+# 0.0 und -0.0 sind als Cache-Schlüssel gleich, ergeben aber "0,00" bzw. "-0,00"
+# -> Null immer direkt formatieren.
+def zahl_de(wert):
+    return _zahl(wert) if wert else _format(wert)
+
+
+def eur(wert):
+    """Betrag für die Oberfläche (mit €-Zeichen)."""
+    return _eur(wert) if wert else _format(wert) + " €"
+
+
+def pdf_eur(wert):
+    """Betrag fürs PDF (Latin-1-Schrift: "EUR" statt €)."""
+    return _pdf_eur(wert) if wert else _format(wert) + " EUR"
+
+
+def stats():
+    """Treffer/Fehlgriffe je Formatierer (für die Profiling-Anzeige)."""
+    aus = {}
+    for name, f in (("zahl", _zahl), ("eur", _eur), ("pdf_eur", _pdf_eur)):
+        info = f.cache_info()
+        aus[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize}
+    return aus
+
+
+# ==========================================
+# 📥 EINLESEN
+# ==========================================
+# Gültige Tausendergruppen je Trennzeichen ("350.000", "1,234,567"); keine führende 0
+_TAUSENDER = {sep: re.compile(rf"^[+-]?[1-9]\d{{0,2}}(\{sep}\d{{3}})+$") for sep in ".,"}
+
+
+def lies_zahl(text):
+    """Deutsche und englische Zahlformate ("350.000", "1.234,50", "1,234.50", "1234.5", "350000 €").
+
+    Kommen Punkt und Komma vor, ist das hintere das Dezimalzeichen und das
+    andere muss sauber in Dreiergruppen trennen. Ein einzelnes Trennzeichen
+    vor genau drei Ziffern gilt als Tausender ("350,000" = "350.000" =
+    350000), sonst als Dezimalzeichen ("1234,5", "12.5"). Alles andere
+    ("1.234.5", "1,23,456.7") ist mehrdeutig und ergibt NaN.
+    """
+    t = str(text).replace("€", "").replace("EUR", "").replace(" ", "").replace("\u00a0", "").replace("\u202f", "").strip()
+    if not t:
+        return math.nan
+    komma, punkt = t.rfind(","), t.rfind(".")
+    if komma >= 0 and punkt >= 0:
+        dezimal, tausender = (",", ".") if komma > punkt else (".", ",")
+        ganz, _, nachkomma = t.rpartition(dezimal)
+        if not _TAUSENDER[tausender].match(ganz) or not nachkomma.isdigit():
+            return math.nan
+        t = ganz.replace(tausender, "") + "." + nachkomma
+    elif komma >= 0 or punkt >= 0:
+        sep = "," if komma >= 0 else "."
+        if _TAUSENDER[sep].match(t):
+            t = t.replace(sep, "")
+        elif t.count(sep) == 1:
+            t = t.replace(sep, ".")
+        else:
+            return math.nan
+    try:
+        return float(t)
+    except ValueError:
+        return math.nan
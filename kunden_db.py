@@ -0,0 +1,171 @@
+"""Lokale SQLite-Ablage für Kunden und ihre gespeicherten Szenarien.
+
+Ein Szenario ist derselbe Dict wie beim JSON-Export (``sb_*``/``exp_*``/
+``renovierung``), abgelegt als geprüftes Delta (``sicherung.delta``: nur die
+Felder, die von der Vorgabe abweichen); ältere, vollständige Einträge bleiben
+lesbar. Beim Speichern werden ``frei``, ``frei_bank``, ``max_preis``,
+``wunsch_rate`` und ``machbar`` mit ``engine.berechne`` vorberechnet. Listen
+lassen sich so direkt in SQL sortieren und filtern, ohne jedes Profil neu zu rechnen.
+
+Eine Instanz hält eine Verbindung und ist threadsicher. In der App lebt sie
+über ``st.cache_resource`` und überdauert damit alle Reruns und Sessions.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from engine import Eingaben, berechne
+from sicherung import delta
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kunden (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    erstellt   TEXT NOT NULL,
+    geaendert  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS szenarien (
+    id          INTEGER PRIMARY KEY,
+    kunde_id    INTEGER NOT NULL REFERENCES kunden(id) ON DELETE CASCADE,
+    titel       TEXT NOT NULL,
+    erstellt    TEXT NOT NULL,
+    daten       TEXT NOT NULL,
+    frei        REAL NOT NULL,
+    frei_bank   REAL NOT NULL,
+    max_preis   REAL NOT NULL,
+    wunsch_preis REAL NOT NULL,
+    wunsch_rate REAL NOT NULL,
+    machbar     INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_kunden_geaendert ON kunden(geaendert);
+CREATE INDEX IF NOT EXISTS ix_szenarien_kunde ON szenarien(kunde_id, erstellt);
+CREATE INDEX IF NOT EXISTS ix_szenarien_erstellt ON szenarien(erstellt);
+CREATE INDEX IF NOT EXISTS ix_szenarien_max_preis ON szenarien(max_preis);
+CREATE INDEX IF NOT EXISTS ix_szenarien_frei ON szenarien(frei);
+"""
+
+# Erlaubte Sortierungen für suche() (Spaltennamen werden nie aus Eingaben übernommen)
+SORTIERUNGEN = {
+    "neueste": "s.erstellt DESC",
+    "name": "k.name COLLATE NOCASE ASC, s.erstellt DESC",
+    "frei": "s.frei DESC",
+    "max_preis": "s.max_preis DESC",
+    "machbar": "s.machbar DESC, s.frei DESC",
+}
+
+
+def _jetzt():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def kennzahlen(daten):
+    """Vorberechnete Ergebnis-Spalten eines Szenario-Dicts."""
+    e = Eingaben.from_state(daten)
+    r = berechne(e)
+    # MACHBAR gibt es (wie in der App) nur mit Wunsch-Objekt und ohne Unterdeckung
+    machbar = int(r.machbar) if (e.wunsch_preis > 0 and r.frei >= 0) else None
+    return {"frei": r.frei, "frei_bank": r.frei_bank, "max_preis": r.max_preis,
+            "wunsch_preis": e.wunsch_preis, "wunsch_rate": r.wunsch_rate, "machbar": machbar}
+
+
+class KundenDB:
+    def __init__(self, pfad="kunden.sqlite"):
+        self.pfad = pfad
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(pfad, check_same_thread=False)
+        self._con.row_factory = sqlite3.Row
+        with self._lock, self._con:
+            if pfad != ":memory:":
+                self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA foreign_keys=ON")
+            self._con.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._con.close()
+
+    # ==========================================
+    # 💾 SPEICHERN
+    # ==========================================
+    def speichere(self, name, daten, titel=None):
+        """Legt den Kunden bei Bedarf an und speichert das Szenario. Liefert die Szenario-ID."""
+        name = (name or "").strip() or "Kunde"
+        daten = delta(daten)
+        jetzt = _jetzt()
+        k = kennzahlen(daten)
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT INTO kunden (name, erstellt, geaendert) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET geaendert = excluded.geaendert",
+                (name, jetzt, jetzt),
+            )
+            kunde_id = self._con.execute("SELECT id FROM kunden WHERE name = ?", (name,)).fetchone()[0]
+            cur = self._con.execute(
+                "INSERT INTO szenarien (kunde_id, titel, erstellt, daten, frei, frei_bank, max_preis, "
+                "wunsch_preis, wunsch_rate, machbar) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (kunde_id, titel or f"Stand {jetzt[:16].replace('T', ' ')}", jetzt,
+                 json.dumps(daten, separators=(",", ":")), k["frei"], k["frei_bank"], k["max_preis"],
+                 k["wunsch_preis"], k["wunsch_rate"], k["machbar"]),
+            )
+            return cur.lastrowid
+
+    def loesche_szenario(self, szenario_id):
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM szenarien WHERE id = ?", (szenario_id,))
+
+    def neu_berechnen(self):
+        """Rechnet die Ergebnis-Spalten aller Szenarien neu (z.B. nach Änderung der Bank-Logik)."""
+        with self._lock:
+            zeilen = self._con.execute("SELECT id, daten FROM szenarien").fetchall()
+        werte = []
+        for z in zeilen:
+            k = kennzahlen(json.loads(z["daten"]))
+            werte.append((k["frei"], k["frei_bank"], k["max_preis"], k["wunsch_preis"], k["wunsch_rate"],
+                          k["machbar"], z["id"]))
+        with self._lock, self._con:
+            self._con.executemany(
+                "UPDATE szenarien SET frei = ?, frei_bank = ?, max_preis = ?, wunsch_preis = ?, "
+                "wunsch_rate = ?, machbar = ? WHERE id = ?", werte)
+        return len(werte)
+
+    # ==========================================
+    # 🔎 SUCHEN & LADEN
+    # ==========================================
+    def suche(self, name="", seit=None, bis=None, nur_machbar=False, sortierung="neueste", limit=100, offset=0):
+        """Szenarien mit Kundennamen und Kennzahlen (ohne die Rohdaten).
+
+        ``name`` sucht nach Namensanfang (Index auf ``kunden.name``); ``seit``/
+        ``bis`` sind ISO-Daten (``YYYY-MM-DD``) auf das Speicherdatum.
+        """
+        bedingungen, parameter = [], []
+        if name:
+            bedingungen.append("k.name LIKE ? ESCAPE '\\'")
+            parameter.append(name.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if seit:
+            bedingungen.append("s.erstellt >= ?")
+            parameter.append(str(seit))
+        if bis:
+            bedingungen.append("s.erstellt < date(?, '+1 day')")
+            parameter.append(str(bis))
+        if nur_machbar:
+            bedingungen.append("s.machbar = 1")
+        where = f"WHERE {' AND '.join(bedingungen)}" if bedingungen else ""
+        sql = (
+            "SELECT s.id, k.name, s.titel, s.erstellt, s.frei, s.frei_bank, s.max_preis, s.wunsch_preis, "
+            "s.wunsch_rate, s.machbar FROM szenarien s JOIN kunden k ON k.id = s.kunde_id "
+            f"{where} ORDER BY {SORTIERUNGEN[sortierung]} LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            return [dict(z) for z in self._con.execute(sql, (*parameter, limit, offset))]
+
+    def lade(self, szenario_id):
+        """Gespeicherter Session-Dict eines Szenarios (None, falls unbekannt)."""
+        with self._lock:
+            z = self._con.execute("SELECT daten FROM szenarien WHERE id = ?", (szenario_id,)).fetchone()
+        return json.loads(z["daten"]) if z else None
+
+    def anzahl(self):
+        with self._lock:
+            k, s = self._con.execute("SELECT (SELECT COUNT(*) FROM kunden), (SELECT COUNT(*) FROM szenarien)").fetchone()
+        return {"kunden": k, "szenarien": s}
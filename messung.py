@@ -0,0 +1,125 @@
+"""Leichte Laufzeitmessung der App-Phasen pro Rerun (abschaltbar).
+
+Eingeschaltet wird sie über die Umgebungsvariable ``IMMO_PROFILING=1``. Die
+Zeilen landen als JSONL in ``IMMO_PROFILING_LOG`` (Standard:
+``profiling.jsonl``). Ist die Messung aus, liefert ``phase`` einen geteilten
+``nullcontext`` und ``start``/``stop`` kehren sofort zurück. Fragment-Reruns
+der App stehen als eigene Lauf-Art ``fragment:<name>`` im Log.
+
+Auswertung (p50/p95 je Phase über alle Sessions)::
+
+    python messung.py profiling.jsonl
+"""
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from contextlib import nullcontext
+
+AKTIV = os.environ.get("IMMO_PROFILING", "") not in ("", "0")
+LOG_PFAD = os.environ.get("IMMO_PROFILING_LOG", "profiling.jsonl")
+
+_AUS = nullcontext()
+_LOCK = threading.Lock()
+
+
+class _Phase:
+    __slots__ = ("messung", "name", "t0")
+
+    def __init__(self, messung, name):
+        self.messung = messung
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.messung.addiere(self.name, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+
+class Messung:
+    """Sammelt die Dauer benannter Phasen (ms) eines Laufs."""
+
+    __slots__ = ("aktiv", "lauf", "phasen", "t0", "geschrieben", "_offen")
+
+    def __init__(self, aktiv=AKTIV, lauf="rerun"):
+        self.aktiv = aktiv
+        self.lauf = lauf
+        self.phasen = {}
+        self.t0 = time.perf_counter()
+        self.geschrieben = False
+        self._offen = {}
+
+    def phase(self, name):
+        """Context-Manager für einen Block; gleichnamige Phasen werden addiert."""
+        return _Phase(self, name) if self.aktiv else _AUS
+
+    def start(self, name):
+        if self.aktiv:
+            self._offen[name] = time.perf_counter()
+
+    def stop(self, name):
+        if self.aktiv and name in self._offen:
+            self.addiere(name, (time.perf_counter() - self._offen.pop(name)) * 1000)
+
+    def addiere(self, name, ms):
+        self.phasen[name] = self.phasen.get(name, 0.0) + ms
+
+    def gesamt_ms(self):
+        return (time.perf_counter() - self.t0) * 1000
+
+    def als_zeile(self, **extra):
+        return {"ts": round(time.time(), 3), "lauf": self.lauf, "gesamt_ms": round(self.gesamt_ms(), 3),
+                "phasen": {k: round(v, 3) for k, v in self.phasen.items()}, **extra}
+
+    def schreibe(self, pfad=None, **extra):
+        """Hängt den Lauf als JSON-Zeile an das Log an (nur wenn aktiv)."""
+        if not self.aktiv:
+            return None
+        zeile = self.als_zeile(**extra)
+        self.geschrieben = True
+        with _LOCK, open(pfad or LOG_PFAD, "a", encoding="utf-8") as f:
+            f.write(json.dumps(zeile, separators=(",", ":")) + "\n")
+        return zeile
+
+
+# ==========================================
+# 📊 AUSWERTUNG
+# ==========================================
+def _perzentil(werte, p):
+    if len(werte) == 1:
+        return werte[0]
+    return statistics.quantiles(werte, n=100, method="inclusive")[p - 1]
+
+
+def auswerten(pfad=None):
+    """p50/p95/max je Phase (und gesamt) aus dem JSONL-Log, getrennt nach Lauf-Art."""
+    reihen = {}
+    try:
+        with open(pfad or LOG_PFAD, encoding="utf-8") as f:
+            for zeile in f:
+                try:
+                    d = json.loads(zeile)
+                except ValueError:
+                    continue
+                lauf = d.get("lauf", "rerun")
+                reihen.setdefault((lauf, "gesamt"), []).append(d["gesamt_ms"])
+                for name, ms in d.get("phasen", {}).items():
+                    reihen.setdefault((lauf, name), []).append(ms)
+    except FileNotFoundError:
+        return []
+    return [
+        {"Lauf": lauf, "Phase": name, "n": len(w), "p50_ms": round(_perzentil(w, 50), 2),
+         "p95_ms": round(_perzentil(w, 95), 2), "max_ms": round(max(w), 2)}
+        for (lauf, name), w in sorted(reihen.items())
+    ]
+
+
+if __name__ == "__main__":
+    for z in auswerten(sys.argv[1] if len(sys.argv) > 1 else None):
+        print(f"{z['Lauf']:<10} {z['Phase']:<16} n={z['n']:<6} p50={z['p50_ms']:>9.2f} ms  "
+              f"p95={z['p95_ms']:>9.2f} ms  max={z['max_ms']:>9.2f} ms")
@@ -0,0 +1,185 @@
+"""Finanzierungs-Optimierer: beste Kombination aus Tilgung, Sondertilgung und EK-Einsatz.
+
+Gesucht wird über drei Achsen:
+
+* anfängliche Tilgung (%)
+* jährliche Sondertilgung (€, höchstens ``sonder_max_prozent`` des Darlehens)
+* eingesetztes Eigenkapital (Rest bleibt als Reserve)
+
+Nebenbedingung: Monatsrate + Sondertilgung / 12 <= Budget (``frei`` oder
+``frei_bank``). Ziel ist wahlweise minimale Zinslast in der Zinsbindung,
+minimale Restschuld an deren Ende oder minimale Zinsen über die gesamte
+Laufzeit (gleicher Zins nach der Zinsbindung).
+
+Die Kandidaten werden als Arrays bewertet (eine Python-Schleife nur über
+die Jahre der Zinsbindung). Unzulässige Kombinationen fallen vor der
+Bewertung weg. Danach läuft die Suche grob -> fein: nur die Umgebung der
+besten groben Kandidaten wird fein abgesucht, solange das Zeitbudget reicht.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from tilgung import kennzahlen_batch, monatsrate, restschuld
+
+ZIELE = {
+    "zinsen_zinsbindung": "Zinsen in der Zinsbindung",
+    "restschuld_zinsbindung": "Restschuld am Ende der Zinsbindung",
+    "zinsen_gesamt": "Zinsen über die gesamte Laufzeit",
+}
+
+
+# ==========================================
+# 🧮 BEWERTUNG (VEKTORISIERT)
+# ==========================================
+def _ein_jahr(s, q, rate):
+    """Zwölf Monatsraten auf Restschuld ``s``; liefert (Restschuld, Zinsen) inkl. Volltilgung im Jahr."""
+    s12 = restschuld(s, q, rate, 12)
+    zinsen = rate * 12 - (s - s12)
+    getilgt = s12 <= 0
+    if getilgt.any():
+        # Monat der Volltilgung: n = -ln(1 - q*s/R) / ln(1+q); letzte Rate nur noch Rest + Zinsen
+        with np.errstate(divide="ignore", invalid="ignore"):
+            n = np.where(q > 0, -np.log1p(-q * s / rate) / np.log1p(q), s / rate)
+        n = np.clip(np.ceil(n - 1e-9), 1, 12)
+        s_vor = restschuld(s, q, rate, n - 1)
+        zinsen = np.where(getilgt, rate * (n - 1) - (s - s_vor) + s_vor * q, zinsen)
+        s12 = np.where(getilgt, 0.0, s12)
+    zinsen = np.where(s > 0, zinsen, 0.0)
+    return np.maximum(s12, 0.0), zinsen
+
+
+def bewerte(investition, ek_einsatz, zins, tilgung, sondertilgung, zinsbindung_jahre):
+    """Kennzahlen für alle Kandidaten (Arrays gleicher Länge, Broadcasting erlaubt)."""
+    ek_einsatz, tilgung, sondertilgung = np.broadcast_arrays(
+        np.asarray(ek_einsatz, dtype=np.float64), np.asarray(tilgung, dtype=np.float64),
+        np.asarray(sondertilgung, dtype=np.float64))
+    darlehen = np.maximum(investition - ek_einsatz, 0.0)
+    q = zins / 100 / 12
+    rate = monatsrate(darlehen, zins, tilgung)
+
+    s = darlehen.copy()
+    zinsen_zb = np.zeros_like(s)
+    for _ in range(int(zinsbindung_jahre)):
+        s, z = _ein_jahr(s, q, rate)
+        zinsen_zb += z
+        s = np.maximum(s - sondertilgung, 0.0)
+
+    # Danach: gleicher Zins, gleiche Rate, keine Sondertilgung mehr
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tilgung_rest = np.where(s > 0, rate * 1200 / s - zins, 0.0)
+    rest = kennzahlen_batch(s, zins, tilgung_rest, 0)
+    zinsen_gesamt = zinsen_zb + np.where(s > 0, rest["zinsen_gesamt"], 0.0)
+    return {
+        "darlehen": darlehen, "rate": rate, "zinsen_zinsbindung": zinsen_zb,
+        "restschuld_zinsbindung": s, "zinsen_gesamt": zinsen_gesamt,
+        "laufzeit_rest_monate": np.where(s > 0, rest["laufzeit_monate"], 0.0),
+    }
+
+
+def _bewerte_block(args):
+    return bewerte(*args)
+
+
+# ==========================================
+# 🔎 SUCHE
+# ==========================================
+def _kandidaten(investition, ek, zins, budget, tilg_achse, sonder_achse, ek_achse, sonder_max_prozent):
+    """Alle zulässigen Kombinationen als flache Arrays (Pruning vor der Bewertung)."""
+    e, t, so = (a.ravel() for a in np.meshgrid(ek_achse, tilg_achse, sonder_achse, indexing="ij"))
+    darlehen = np.maximum(investition - e, 0.0)
+    rate = monatsrate(darlehen, zins, t)
+    # Sondertilgung über der Grenze des Darlehens wird auf die Grenze gekappt (nicht verworfen)
+    so = np.minimum(so, np.floor(darlehen * sonder_max_prozent / 100))
+    ok = rate + so / 12 <= budget + 1e-9
+    # Ohne Darlehen sind Tilgung und Sondertilgung egal -> nur eine Variante behalten
+    ok &= (darlehen > 0) | ((t == tilg_achse[0]) & (so == 0))
+    return e[ok], t[ok], so[ok]
+
+
+def _auswerten(investition, zins, zinsbindung_jahre, e, t, so, workers):
+    if workers and workers > 1 and len(e) > 20_000:
+        teile = np.array_split(np.arange(len(e)), workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            stuecke = list(pool.map(_bewerte_block, [
+                (investition, e[i], zins, t[i], so[i], zinsbindung_jahre) for i in teile]))
+        return {k: np.concatenate([s[k] for s in stuecke]) for k in stuecke[0]}
+    return bewerte(investition, e, zins, t, so, zinsbindung_jahre)
+
+
+def optimiere(investition, ek, zins, zinsbindung_jahre, budget, ziel="zinsen_zinsbindung",
+              ek_reserve=0.0, tilgung_min=1.0, tilgung_max=6.0, sonder_max_prozent=5.0,
+              top=5, zeitbudget=0.5, workers=None, vollstaendig=False):
+    """Sucht die besten ``top`` Pläne; liefert (Liste von Dicts, Statistik).
+
+    ``investition`` = Kaufpreis + Nebenkosten + Renovierung. ``zeitbudget`` in
+    Sekunden begrenzt die Feinsuche; die grobe Suche läuft immer vollständig.
+    ``vollstaendig=True`` bewertet stattdessen das ganze feine Gitter (zum
+    Gegenprüfen oder mit ``workers`` als Hintergrundjob).
+    """
+    t0 = time.perf_counter()
+    ek_max = max(min(ek - ek_reserve, investition), 0.0)
+    sonder_grenze = investition * sonder_max_prozent / 100
+
+    if vollstaendig:
+        tilg_grob = np.round(np.arange(tilgung_min, tilgung_max + 1e-9, 0.1), 2)
+        sonder_grob = np.unique(np.append(np.arange(0, sonder_grenze, 500.0), sonder_grenze))
+        ek_grob = np.unique(np.append(np.arange(0, ek_max, 1000.0), ek_max))
+    else:
+        # Grob: 0,5 %-Schritte Tilgung, 10 Sondertilgungs-Stufen, 10 %-Schritte EK
+        tilg_grob = np.round(np.arange(tilgung_min, tilgung_max + 1e-9, 0.5), 2)
+        sonder_grob = np.unique(np.round(np.linspace(0, sonder_grenze, 11), -2))
+        ek_grob = np.unique(np.minimum(np.round(np.linspace(0, ek_max, 11), -2), ek_max))
+    e, t, so = _kandidaten(investition, ek, zins, budget, tilg_grob, sonder_grob, ek_grob, sonder_max_prozent)
+    statistik = {"kandidaten_grob": len(e), "kandidaten_fein": 0, "bereiche_fein": 0}
+    if not len(e):
+        statistik["sekunden"] = time.perf_counter() - t0
+        return [], statistik
+    res = _auswerten(investition, zins, zinsbindung_jahre, e, t, so, workers)
+
+    alle = [(e, t, so, res)]
+    # Fein: Umgebung der besten groben Kandidaten (0,1 % Tilgung, 500 € Sondertilgung, 1.000 € EK)
+    beste = [] if vollstaendig else np.argsort(res[ziel], kind="stable")[:max(top, 15)]
+    for i in beste:
+        if time.perf_counter() - t0 > zeitbudget:
+            break
+        tilg_fein = np.round(np.arange(max(t[i] - 0.5, tilgung_min), min(t[i] + 0.5, tilgung_max) + 1e-9, 0.1), 2)
+        # Ränder (volle Sondertilgung, volles EK) immer mit prüfen, dort liegt das Optimum oft
+        schritt_so = sonder_grob[1] if len(sonder_grob) > 1 else 0
+        sonder_fein = np.unique(np.clip(np.append(
+            np.arange(so[i] - schritt_so, so[i] + schritt_so + 1e-9, 500.0), sonder_grenze), 0, sonder_grenze))
+        schritt_ek = ek_grob[1] if len(ek_grob) > 1 else 0
+        ek_fein = np.unique(np.clip(np.append(
+            np.arange(e[i] - schritt_ek, e[i] + schritt_ek + 1e-9, 1000.0), ek_max), 0, ek_max))
+        ef, tf, sf = _kandidaten(investition, ek, zins, budget, tilg_fein, sonder_fein, ek_fein, sonder_max_prozent)
+        if len(ef):
+            alle.append((ef, tf, sf, _auswerten(investition, zins, zinsbindung_jahre, ef, tf, sf, workers)))
+            statistik["kandidaten_fein"] += len(ef)
+            statistik["bereiche_fein"] += 1
+
+    e = np.concatenate([a[0] for a in alle])
+    t = np.concatenate([a[1] for a in alle])
+    so = np.concatenate([a[2] for a in alle])
+    res = {k: np.concatenate([a[3][k] for a in alle]) for k in alle[0][3]}
+
+    # Gleichstand: weniger Rate (mehr Luft im Budget) gewinnt
+    reihenfolge = np.lexsort((res["rate"] + so / 12, res[ziel]))
+    plaene, gesehen = [], set()
+    for i in reihenfolge:
+        schluessel = (round(float(t[i]), 2), round(float(so[i]), -1), round(float(e[i]), -2))
+        if schluessel in gesehen:
+            continue
+        gesehen.add(schluessel)
+        plaene.append({
+            "tilgung": float(t[i]), "sondertilgung": float(so[i]), "ek_einsatz": float(e[i]),
+            "ek_reserve": float(ek - e[i]), "darlehen": float(res["darlehen"][i]), "rate": float(res["rate"][i]),
+            "budget_rest": float(budget - res["rate"][i] - so[i] / 12),
+            "zinsen_zinsbindung": float(res["zinsen_zinsbindung"][i]),
+            "restschuld_zinsbindung": float(res["restschuld_zinsbindung"][i]),
+            "zinsen_gesamt": float(res["zinsen_gesamt"][i]),
+        })
+        if len(plaene) >= top:
+            break
+    statistik["sekunden"] = time.perf_counter() - t0
+    return plaene, statistik
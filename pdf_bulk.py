@@ -0,0 +1,134 @@
+"""Sammel-Export: "Finanzierungs-Zertifikat" für viele Kundenprofile in ein ZIP.
+
+Die Profile (JSONL/CSV wie bei ``batch_cli``) werden in kleinen Paketen auf
+einen Prozess-Pool verteilt. Jedes fertige PDF wird sofort ins ZIP
+geschrieben; im Speicher liegen nur die gerade laufenden Pakete. Jedes Profil
+wird vorher wie ein hochgeladener Stand geprüft (``sicherung.pruefe``, dazu
+keine unbekannten Felder). Ein kaputtes Profil bricht den Lauf nicht ab und
+bekommt kein Zertifikat, sondern landet in ``FEHLER.txt`` im Archiv.
+
+Beispiel::
+
+    python pdf_bulk.py kunden.jsonl zertifikate.zip --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from batch_cli import bloecke, lese_datensaetze
+from engine import Eingaben
+from sicherung import FELD_NAMEN, VERSION_FELD, pruefe
+from zertifikat import Vorlage, render_pdf
+
+
+def dateiname(name):
+    # Wie der Download-Button in app.py
+    return f"{str(name).replace(' ', '_').replace('/', '_')}_Finanzcheck.pdf"
+
+
+# ==========================================
+# 🧮 WORKER
+# ==========================================
+_ERLAUBT = frozenset(FELD_NAMEN) | {VERSION_FELD}
+# Zertifikat-Vorlage: einmal pro Worker-Prozess, für alle Pakete
+_VORLAGE = None
+
+
+def vorlage():
+    global _VORLAGE
+    if _VORLAGE is None:
+        _VORLAGE = Vorlage()
+    return _VORLAGE
+
+
+def pruefe_profil(profil):
+    """Geprüfter, normalisierter Stand; ``ValueError`` bei Tippfehlern oder falschen Werten."""
+    if isinstance(profil, dict):
+        # Auch ohne sb_version streng: ein vertippter Key hieße Zertifikat mit Vorgabewerten
+        unbekannt = sorted(k for k in profil if k not in _ERLAUBT)
+        if unbekannt:
+            raise ValueError(f"unbekannte Felder {', '.join(unbekannt)}")
+    return pruefe(profil)
+
+
+def rendere_paket(paket):
+    """Rendert ein Paket (Startnummer, Datensätze); Fehler werden pro Profil gemeldet."""
+    start, datensaetze = paket
+    ergebnisse = []
+    for nr, roh in enumerate(datensaetze, start=start):
+        try:
+            profil = json.loads(roh) if isinstance(roh, str) else roh
+            e = Eingaben.from_state(pruefe_profil(profil))
+            ergebnisse.append((nr, e.name, render_pdf(e, vorlage=vorlage()), None))
+        except Exception as ex:
+            ergebnisse.append((nr, None, None, f"{type(ex).__name__}: {ex}"))
+    return ergebnisse
+
+
+# ==========================================
+# 🚀 ABLAUF
+# ==========================================
+def export_zip(eingabe, ausgabe, workers=None, paket_groesse=20):
+    workers = workers or os.cpu_count() or 1
+    fehler = []
+    vergeben = set()
+    anzahl = 0
+
+    def einpacken(zf, future):
+        nonlocal anzahl
+        for nr, name, pdf_bytes, err in future.result():
+            if err is not None:
+                fehler.append((nr, f"Datensatz {nr}: {err}"))
+                continue
+            fname = dateiname(name)
+            if fname in vergeben:
+                fname = fname.replace("_Finanzcheck.pdf", f"_{nr}_Finanzcheck.pdf")
+            vergeben.add(fname)
+            zf.writestr(fname, pdf_bytes)
+            anzahl += 1
+
+    with zipfile.ZipFile(ausgabe, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            offen = set()
+            start = 1
+            for block in bloecke(lese_datensaetze(eingabe), paket_groesse):
+                offen.add(pool.submit(rendere_paket, (start, block)))
+                start += len(block)
+                # Begrenzt viele Pakete unterwegs -> konstanter Speicher
+                if len(offen) >= 2 * workers:
+                    fertig, offen = wait(offen, return_when=FIRST_COMPLETED)
+                    for fut in fertig:
+                        einpacken(zf, fut)
+            for fut in wait(offen).done:
+                einpacken(zf, fut)
+        # Pakete werden in Fertigstellungs-Reihenfolge eingepackt: Fehler nach Datensatz sortieren
+        fehler = [text for _, text in sorted(fehler)]
+        if fehler:
+            zf.writestr("FEHLER.txt", "\n".join(fehler) + "\n")
+
+    return anzahl, fehler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Finanzierungs-Zertifikate für viele Kunden als ZIP erzeugen.")
+    parser.add_argument("eingabe", help="JSONL- oder CSV-Datei mit gespeicherten Profilen")
+    parser.add_argument("ausgabe", help="Ziel-ZIP")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--paket", type=int, default=20, help="Profile pro Worker-Auftrag (Standard: 20)")
+    args = parser.parse_args(argv)
+
+    t = time.perf_counter()
+    anzahl, fehler = export_zip(args.eingabe, args.ausgabe, args.workers, args.paket)
+    dauer = time.perf_counter() - t
+    print(f"{anzahl} PDFs in {dauer:.2f} s ({anzahl / dauer if dauer else 0:,.1f} PDFs/s), {len(fehler)} Fehler")
+    for zeile in fehler[:20]:
+        print(f"  {zeile}")
+    return 1 if fehler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================================
+# 📄 PDF-CACHE (prozessweit, begrenzt)
+# ==========================================
+# Das Modul wird pro Prozess nur einmal importiert und überlebt damit jeden
+# Streamlit-Rerun und jede Session. Gleiche Szenarien werden so nur einmal
+# gerendert, egal wie oft oder von wem sie heruntergeladen werden.
+
+
+def _json_default(obj):
+    # Records aus engine (Eingaben/Ergebnis) bringen ihr eigenes as_dict() mit
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    return str(obj)
+
+
+def stable_hash(data):
+    """Stabiler Schlüssel für PDF-Eingaben (unabhängig von Key-Reihenfolge)."""
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PdfCache:
+    """LRU-Cache für fertige PDF-Bytes mit Treffer-/Fehlzählern."""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Fertige Bytes zum Schlüssel oder None (zählt als Treffer/Fehlgriff)."""
+        with self._lock:
+            if key in self._items:
+                self.hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def peek(self, key):
+        """Wie ``get``, aber ohne Zähler -- für Status-Abfragen bei jedem Rerun."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+            return None
+
+    def put(self, key, pdf_bytes):
+        with self._lock:
+            self._items[key] = pdf_bytes
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def get_or_render(self, data, render):
+        key = stable_hash(data)
+        pdf_bytes = self.get(key)
+        if pdf_bytes is None:
+            # Rendern ausserhalb des Locks, damit andere Downloads nicht warten
+            pdf_bytes = render(data)
+            self.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "maxsize": self.maxsize}
+
+
+PDF_CACHE = PdfCache()
+
+
+# ==========================================
+# ⏳ HINTERGRUND-JOBS (ein Pool für alle Sessions)
+# ==========================================
+# Das Rendern läuft in einem Thread-Pool statt im Script-Thread der Session.
+# Die Seite zeigt solange den Status und bietet den Download an, sobald das
+# PDF im Cache liegt. Gleiche Eingaben (gleicher Hash) ergeben genau einen
+# Job, egal wie viele Sessions gleichzeitig danach fragen.
+
+
+class PdfJobs:
+    def __init__(self, cache, max_workers=None):
+        self.cache = cache
+        self.max_workers = max_workers or int(os.environ.get("IMMO_PDF_WORKER", "2"))
+        self.gestartet = 0
+        self.zusammengelegt = 0
+        self._pool = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def _ausfuehren(self, key, data, render):
+        pdf_bytes = render(data)
+        self.cache.put(key, pdf_bytes)
+        return pdf_bytes
+
+    def _fertig(self, key, future):
+        # Erfolgreiche Jobs liegen jetzt im Cache; nur Fehler bleiben sichtbar
+        if future.exception() is None:
+            with self._lock:
+                if self._jobs.get(key) is future:
+                    del self._jobs[key]
+
+    def submit(self, data, render):
+        """Startet das Rendern im Hintergrund (falls nötig) und liefert den Job-Schlüssel."""
+        key = stable_hash(data)
+        with self._lock:
+            laufend = self._jobs.get(key)
+            if key in self.cache or (laufend is not None and not laufend.done()):
+                self.zusammengelegt += 1
+                return key
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf")
+            future = self._pool.submit(self._ausfuehren, key, data, render)
+            self._jobs[key] = future
+            self.gestartet += 1
+        future.add_done_callback(lambda f: self._fertig(key, f))
+        return key
+
+    def status(self, key):
+        """"fertig", "läuft", "wartet", "fehler" oder None (nie gestartet / verdrängt)."""
+        if key in self.cache:
+            return "fertig"
+        with self._lock:
+            future = self._jobs.get(key)
+        if future is None:
+            return "fertig" if key in self.cache else None
+        if future.done():
+            return "fehler" if future.exception() is not None else "fertig"
+        return "läuft" if future.running() else "wartet"
+
+    def fehler(self, key):
+        with self._lock:
+            future = self._jobs.get(key)
+        return future.exception() if future is not None and future.done() else None
+
+    def ergebnis(self, key):
+        """Fertige PDF-Bytes oder None (Statusabfrage: zählt nicht im Cache)."""
+        return self.cache.peek(key)
+
+    def stats(self):
+        with self._lock:
+            offen = sum(not f.done() for f in self._jobs.values())
+        return {"gestartet": self.gestartet, "zusammengelegt": self.zusammengelegt, "offen": offen,
+                "worker": self.max_workers}
+
+
+PDF_JOBS = PdfJobs(PDF_CACHE)
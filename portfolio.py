@@ -0,0 +1,185 @@
+"""Bestandsportfolio: viele vermietete Einheiten als Spalten (NumPy-Arrays).
+
+Jede Einheit hat Kaltmiete, Restschuld, Monatsrate, Zins und das Ende der
+Zinsbindung. Die Summen (Miete, Rate) fließen über ``miete_bestand`` und
+``rate_bestand`` in die bestehende Haushaltsrechnung. Die Anrechnung (75 %)
+bleibt damit dort, wo sie immer war.
+
+Für Session-State, JSON-Export und Kundendatenbank gibt es eine
+JSON-fähige Form (``as_dict``/``from_dict``), Listen je Spalte.
+"""
+import csv
+import io
+import re
+from datetime import date
+
+import numpy as np
+
+from engine import ANRECHNUNG_MIETE_BESTAND
+from format_de import lies_zahl
+from tilgung import restschuld
+
+SPALTEN = {
+    "bezeichnung": ("bezeichnung", "objekt", "einheit", "adresse", "name", "id"),
+    "miete": ("miete", "kaltmiete", "mieteinnahme", "nettokaltmiete"),
+    "restschuld": ("restschuld", "darlehen", "saldo"),
+    "rate": ("rate", "monatsrate", "annuitaet", "annuität"),
+    "zins": ("zins", "sollzins", "zinssatz"),
+    "zinsbindung_ende": ("zinsbindung_ende", "zinsbindung", "zinsbindungsende", "ende_zinsbindung"),
+}
+
+_MONAT = re.compile(r"^(?:(\d{1,2})[./-])?(\d{4})(?:-(\d{1,2}))?")
+
+
+def monat_index(text, standard=None):
+    """"2031", "06/2031", "06.2031" oder "2031-06" -> Jahr * 12 + Monat - 1."""
+    m = _MONAT.match(str(text).strip())
+    if not m:
+        return standard
+    monat = int(m.group(1) or m.group(3) or 12)
+    return int(m.group(2)) * 12 + min(max(monat, 1), 12) - 1
+
+
+def monat_text(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class Portfolio:
+    __slots__ = ("bezeichnung", "miete", "restschuld", "rate", "zins", "zinsbindung_ende")
+
+    def __init__(self, bezeichnung, miete, restschuld, rate, zins, zinsbindung_ende):
+        self.bezeichnung = list(bezeichnung)
+        self.miete = np.asarray(miete, dtype=np.float64)
+        self.restschuld = np.asarray(restschuld, dtype=np.float64)
+        self.rate = np.asarray(rate, dtype=np.float64)
+        self.zins = np.asarray(zins, dtype=np.float64)
+        # Monatsindex (Jahr * 12 + Monat - 1) des letzten Monats der Zinsbindung
+        self.zinsbindung_ende = np.asarray(zinsbindung_ende, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.bezeichnung)
+
+    # ==========================================
+    # 📥 IMPORT / EXPORT
+    # ==========================================
+    @classmethod
+    def from_csv(cls, daten):
+        """CSV (bytes/str, ``;`` oder ``,``) mit Spalten nach Namen; fehlende Werte = 0."""
+        if isinstance(daten, bytes):
+            daten = daten.decode("utf-8-sig")
+        kopf = daten[:4096]
+        reader = csv.reader(io.StringIO(daten), delimiter=";" if kopf.count(";") > kopf.count(",") else ",")
+        header = [h.strip().lower().replace(" ", "") for h in next(reader, [])]
+        index = {feld: next((i for i, h in enumerate(header) if h in namen), None) for feld, namen in SPALTEN.items()}
+        if index["miete"] is None and index["rate"] is None:
+            raise ValueError("Weder Miet- noch Raten-Spalte gefunden.")
+
+        zeilen = [z for z in reader if any(x.strip() for x in z)]
+        def wert(z, feld):
+            i = index[feld]
+            return z[i] if i is not None and i < len(z) else ""
+        def zahlen(feld):
+            werte = np.array([lies_zahl(wert(z, feld)) for z in zeilen], dtype=np.float64)
+            return np.nan_to_num(werte, nan=0.0)
+
+        heute = date.today()
+        standard_ende = heute.year * 12 + heute.month - 1
+        return cls(
+            [wert(z, "bezeichnung").strip() or f"Einheit {n + 1}" for n, z in enumerate(zeilen)],
+            zahlen("miete"), zahlen("restschuld"), zahlen("rate"), zahlen("zins"),
+            [monat_index(wert(z, "zinsbindung_ende"), standard_ende) for z in zeilen],
+        )
+
+    def as_dict(self):
+        return {
+            "bezeichnung": self.bezeichnung, "miete": self.miete.tolist(), "restschuld": self.restschuld.tolist(),
+            "rate": self.rate.tolist(), "zins": self.zins.tolist(),
+            "zinsbindung_ende": [monat_text(int(i)) for i in self.zinsbindung_ende],
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["bezeichnung"], d["miete"], d["restschuld"], d["rate"], d["zins"],
+                   [monat_index(t) for t in d["zinsbindung_ende"]])
+
+    # ==========================================
+    # ∑ AGGREGAT
+    # ==========================================
+    def aggregat(self, anrechnung=ANRECHNUNG_MIETE_BESTAND):
+        """Summen für die Haushaltsrechnung (``miete``/``rate`` gehen in miete_bestand/rate_bestand)."""
+        miete = float(self.miete.sum())
+        restschuld_summe = float(self.restschuld.sum())
+        return {
+            "einheiten": len(self),
+            "miete": miete,
+            "miete_anrechenbar": miete * anrechnung,
+            "rate": float(self.rate.sum()),
+            "restschuld": restschuld_summe,
+            # Nach Restschuld gewichteter Durchschnittszins
+            "zins_mittel": float((self.zins * self.restschuld).sum() / restschuld_summe) if restschuld_summe > 0 else 0.0,
+        }
+
+    def zinsbindung_auslauf(self):
+        """Je Jahr: Anzahl Einheiten und heutige Restschuld, deren Zinsbindung dann endet."""
+        jahre = self.zinsbindung_ende // 12
+        mit_darlehen = self.restschuld > 0
+        liste = np.unique(jahre[mit_darlehen])
+        return {
+            "jahr": liste,
+            "einheiten": np.array([int(((jahre == j) & mit_darlehen).sum()) for j in liste]),
+            "restschuld": np.array([float(self.restschuld[(jahre == j) & mit_darlehen].sum()) for j in liste]),
+        }
+
+    # ==========================================
+    # 📈 CASHFLOW-PROJEKTION
+    # ==========================================
+    def cashflow(self, jahre=20, anschluss_zins=None, mietsteigerung=0.0, start=None):
+        """Jährlicher Cashflow (Einheiten × Monate vektorisiert).
+
+        Die Rate bleibt nach der Zinsbindung gleich, nur der Zins wechselt auf
+        ``anschluss_zins`` (None = bisheriger Zins). ``mietsteigerung`` in %
+        p.a., jeweils zu Beginn eines Projektionsjahres. Liefert Arrays
+        ``jahr``, ``miete``, ``zinsen``, ``tilgung``, ``rate``, ``cashflow``,
+        ``restschuld`` (Jahresende).
+        """
+        if start is None:
+            heute = date.today()
+            start = heute.year * 12 + heute.month - 1
+        monate = int(jahre * 12)
+        k = np.arange(1, monate + 1, dtype=np.float64)[None, :]
+
+        s0 = self.restschuld[:, None]
+        rate = self.rate[:, None]
+        q1 = self.zins[:, None] / 100 / 12
+        q2 = q1 if anschluss_zins is None else np.full_like(q1, anschluss_zins / 100 / 12)
+        # Monate bis einschliesslich Ende der Zinsbindung (ab Startmonat)
+        zb = np.clip(self.zinsbindung_ende[:, None] - start + 1, 0, monate).astype(np.float64)
+
+        s_zb = restschuld(s0, q1, rate, zb)
+        s = np.where(k <= zb, restschuld(s0, q1, rate, np.minimum(k, zb)), restschuld(s_zb, q2, rate, k - zb))
+        s_vor = np.concatenate((np.broadcast_to(s0, (len(self), 1)), s[:, :-1]), axis=1)
+        q = np.where(k <= zb, q1, q2)
+
+        # Ist die Schuld getilgt, fällt die Rate weg; der letzte Monat zahlt nur den Rest
+        s_vor = np.maximum(s_vor, 0.0)
+        zinsen = s_vor * q
+        zahlung = np.minimum(rate, s_vor + zinsen)
+        tilgung = zahlung - zinsen
+        rest = np.maximum(s, 0.0)
+
+        jahr_faktor = (1 + mietsteigerung / 100) ** np.arange(jahre)
+        miete = float(self.miete.sum()) * 12 * jahr_faktor
+        starts = np.arange(0, monate, 12)
+        zinsen_j = np.add.reduceat(zinsen.sum(axis=0), starts)
+        tilgung_j = np.add.reduceat(tilgung.sum(axis=0), starts)
+        rate_j = zinsen_j + tilgung_j
+        return {
+            # Kalenderjahr, in dem das Projektionsjahr beginnt
+            "jahr": start // 12 + np.arange(jahre),
+            "miete": miete,
+            "zinsen": zinsen_j,
+            "tilgung": tilgung_j,
+            "rate": rate_j,
+            "cashflow": miete - rate_j,
+            "restschuld": rest[:, 11::12].sum(axis=0),
+        }
@@ -0,0 +1,163 @@
+"""Reaktiver Rechengraph für die abgeleiteten Größen des Finanzierungschecks.
+
+Jeder Knoten kennt seine Abhängigkeiten (Eingabefelder von ``engine.Eingaben``
+oder andere Knoten). ``Rechengraph.setze`` vergleicht die neuen Eingaben mit
+dem letzten Stand und rechnet nur die Knoten neu, die davon betroffen sind.
+Die Formeln und ihre Rechenreihenfolge entsprechen ``engine.berechne``.
+Über ``erklaere`` lässt sich jeder Wert bis zu den Eingaben zurückverfolgen.
+"""
+from engine import (
+    ANRECHNUNG_MIETE_BESTAND, ANRECHNUNG_MIETE_NEU, KINDERGELD, OPTIONS_NUTZUNG,
+    Ergebnis, get_bank_richtwert,
+)
+
+
+class Knoten:
+    __slots__ = ("name", "deps", "fn", "beschreibung")
+
+    def __init__(self, name, deps, fn, beschreibung=""):
+        self.name = name
+        self.deps = deps
+        self.fn = fn
+        self.beschreibung = beschreibung
+
+
+def _max_kredit(frei, annuitaet):
+    return (frei * 12 * 100) / annuitaet if (frei > 0 and annuitaet > 0) else 0
+
+
+def _wunsch_rate(darlehen, annuitaet):
+    return (darlehen * annuitaet) / 100 / 12 if darlehen > 0 else 0
+
+
+def _diff_miete(frei, bewirt, puffer, akt_miete, nutzung):
+    if akt_miete > 0 and nutzung != OPTIONS_NUTZUNG[2]:
+        return (frei + bewirt + puffer) - akt_miete
+    return None
+
+
+KNOTEN = (
+    Knoten("kindergeld", ("kinder",), lambda k: k * KINDERGELD, "Kinder × Kindergeld"),
+    Knoten("aktuelles_gesamt_netto",
+           ("gehalt_h", "gehalt_p", "kindergeld", "kinderzuschlag", "wohngeld", "neben", "sonst"),
+           lambda h, p, k, kz, wg, n, s: h + p + k + kz + wg + n + s, "Summe aller Netto-Einkommen"),
+    Knoten("bank_richtwert", ("aktuelles_gesamt_netto", "erwachsene", "kinder"), get_bank_richtwert,
+           "Lebenshaltungs-Pauschale der Bank inkl. Einkommens-Zuschlag"),
+    Knoten("miete_bestand_anrechenbar", ("miete_bestand",), lambda m: m * ANRECHNUNG_MIETE_BESTAND,
+           "75 % der Bestandsmiete"),
+    Knoten("miete_neu_calc", ("neue_miete", "nutzung"),
+           lambda m, n: m * ANRECHNUNG_MIETE_NEU if n != OPTIONS_NUTZUNG[0] else 0.0,
+           "80 % der neuen Mieteinnahme (nicht bei reinem Selbstbezug)"),
+    Knoten("belastung_alte_miete", ("akt_miete", "nutzung"),
+           lambda m, n: m if n == OPTIONS_NUTZUNG[2] else 0.0, "Alte Miete bleibt nur bei Kapitalanlage"),
+    Knoten("einnahmen", ("aktuelles_gesamt_netto", "miete_bestand_anrechenbar", "miete_neu_calc"),
+           lambda netto, mb, mn: netto + mb + mn, "Netto-Einkommen + anrechenbare Mieten"),
+    Knoten("ausgaben",
+           ("lebenshaltung", "bewirt", "puffer", "konsum", "bauspar", "rate_bestand", "belastung_alte_miete"),
+           lambda l, b, p, k, bs, rb, am: l + b + p + k + bs + rb + am, "Summe aller Ausgaben"),
+    Knoten("frei", ("einnahmen", "ausgaben"), lambda e, a: e - a, "Einnahmen - Ausgaben"),
+    Knoten("annuitaet", ("zins", "tilgung"), lambda z, t: z + t, "Zins + Tilgung (%)"),
+    Knoten("sozial_summe", ("kinderzuschlag", "wohngeld"), lambda kz, wg: kz + wg, "Kinderzuschlag + Wohngeld"),
+    Knoten("frei_bank", ("frei", "sozial_summe"), lambda f, s: f - s, "Freie Rate ohne Sozialleistungen"),
+    Knoten("nk_prozent_gesamt", ("grunderwerb", "notar", "makler"), lambda g, n, m: g + n + m,
+           "Kaufnebenkosten gesamt (%)"),
+    Knoten("max_kredit", ("frei", "annuitaet"), _max_kredit, "Freie Rate × 12 × 100 / Annuität"),
+    Knoten("max_preis", ("max_kredit", "ek", "nk_prozent_gesamt"), lambda k, ek, nk: (k + ek) / (1 + (nk / 100)),
+           "(Kredit + EK) / (1 + Nebenkosten)"),
+    Knoten("max_nk_euro", ("max_preis", "nk_prozent_gesamt"), lambda p, nk: p * (nk / 100),
+           "Nebenkosten auf den Max. Kaufpreis"),
+    Knoten("wunsch_nk_euro", ("wunsch_preis", "nk_prozent_gesamt"),
+           lambda p, nk: p * (nk / 100) if p > 0 else 0.0, "Nebenkosten Wunsch-Objekt"),
+    Knoten("wunsch_invest", ("wunsch_preis", "wunsch_nk_euro", "renovierung"),
+           lambda p, nk, r: p + nk + r if p > 0 else 0.0, "Kaufpreis + Nebenkosten + Renovierung"),
+    Knoten("wunsch_darlehen", ("wunsch_preis", "wunsch_invest", "ek"),
+           lambda p, inv, ek: inv - ek if p > 0 else 0.0, "Investition - Eigenkapital"),
+    Knoten("wunsch_rate", ("wunsch_darlehen", "annuitaet"), _wunsch_rate, "Darlehen × Annuität / 100 / 12"),
+    Knoten("diff_miete", ("frei", "bewirt", "puffer", "akt_miete", "nutzung"), _diff_miete,
+           "Neue Wohnkosten - alte Warmmiete"),
+    Knoten("neu_last", ("frei", "bewirt", "puffer"), lambda f, b, p: (f + b + p) if f > 0 else 0,
+           "Rate + Bewirtschaftung + Puffer"),
+)
+
+
+class Rechengraph:
+    """Hält Eingaben und Knotenwerte einer Session und rechnet inkrementell nach."""
+
+    def __init__(self, knoten=KNOTEN):
+        self.knoten = {k.name: k for k in knoten}
+        self.abhaengige = {}
+        for k in knoten:
+            for d in k.deps:
+                self.abhaengige.setdefault(d, []).append(k.name)
+        self.reihenfolge = self._topologisch()
+        self.eingaben = {}
+        self.werte = {}
+        self.zuletzt_berechnet = ()
+        self.auswertungen = 0
+
+    def _topologisch(self):
+        reihenfolge, besucht = [], set()
+
+        def besuche(name):
+            if name in besucht or name not in self.knoten:
+                return
+            besucht.add(name)
+            for d in self.knoten[name].deps:
+                besuche(d)
+            reihenfolge.append(name)
+
+        for name in self.knoten:
+            besuche(name)
+        return tuple(reihenfolge)
+
+    def setze(self, eingaben):
+        """Übernimmt neue Eingaben (Dict) und rechnet nur betroffene Knoten neu.
+
+        Liefert die Namen der neu berechneten Knoten.
+        """
+        geaendert = [k for k, v in eingaben.items() if k not in self.eingaben or self.eingaben[k] != v]
+        self.eingaben.update(eingaben)
+
+        schmutzig = set()
+        stapel = list(geaendert)
+        while stapel:
+            for abh in self.abhaengige.get(stapel.pop(), ()):
+                if abh not in schmutzig:
+                    schmutzig.add(abh)
+                    stapel.append(abh)
+
+        berechnet = []
+        for name in self.reihenfolge:
+            if name in schmutzig or name not in self.werte:
+                k = self.knoten[name]
+                self.werte[name] = k.fn(*(self._wert(d) for d in k.deps))
+                berechnet.append(name)
+        self.zuletzt_berechnet = tuple(berechnet)
+        self.auswertungen += len(berechnet)
+        return self.zuletzt_berechnet
+
+    def _wert(self, name):
+        return self.werte[name] if name in self.knoten else self.eingaben[name]
+
+    def wert(self, name):
+        return self._wert(name)
+
+    def ergebnis(self):
+        return Ergebnis(**{k: self.werte[k] for k in Ergebnis.__slots__})
+
+    def erklaere(self, name, tiefe=None):
+        """Rechenweg eines Wertes als verschachteltes Dict (bis zu den Eingaben)."""
+        if name not in self.knoten:
+            return {"name": name, "wert": self.eingaben.get(name), "eingabe": True, "deps": []}
+        k = self.knoten[name]
+        deps = [] if tiefe == 0 else [self.erklaere(d, None if tiefe is None else tiefe - 1) for d in k.deps]
+        return {"name": name, "wert": self.werte.get(name), "formel": k.beschreibung, "eingabe": False,
+                "neu": name in self.zuletzt_berechnet, "deps": deps}
+
+    def als_zeilen(self):
+        """Flache Übersicht aller Knoten in Rechenreihenfolge (für Tabellen/Logs)."""
+        return [
+            {"Knoten": n, "Wert": self.werte.get(n), "Formel": self.knoten[n].beschreibung,
+             "Abhängig von": ", ".join(self.knoten[n].deps), "Neu berechnet": n in self.zuletzt_berechnet}
+            for n in self.reihenfolge
+        ]
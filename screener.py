@@ -0,0 +1,119 @@
+"""Angebots-Screener: viele Immobilien-Angebote gegen einen Haushalt prüfen.
+
+Die Angebote kommen als CSV (Kaufpreis, Wohnfläche, optional erwartete
+Kaltmiete). Der Haushalt ist fest; pro Angebot ändern sich nur Kaufpreis,
+Bewirtschaftung (Wohnfläche × ``BEWIRT_PRO_QM``, wie ``update_bewirtschaftung``)
+und ggf. die Mieteinnahme. Alles läuft in einem Aufruf von
+``batch_engine.berechne_batch``; Sortieren und Blättern arbeiten auf den
+fertigen Arrays, ohne neu zu rechnen.
+"""
+import csv
+import io
+
+import numpy as np
+
+from batch_engine import berechne_batch, spalten_aus_eingaben
+from engine import BEWIRT_PRO_QM, OPTIONS_NUTZUNG
+from format_de import lies_zahl
+
+# Erkannte Spaltennamen (klein geschrieben, ohne Leerzeichen)
+SPALTEN = {
+    "preis": ("kaufpreis", "preis", "price", "wunsch_preis"),
+    "wohnflaeche": ("wohnflaeche", "wohnfläche", "flaeche", "fläche", "qm", "m2", "m²", "area"),
+    "miete": ("miete", "kaltmiete", "mieteinnahme", "neue_miete", "rent"),
+    "titel": ("titel", "objekt", "adresse", "name", "id", "title"),
+}
+
+SORTIERBAR = {
+    "Lücke (Haushalt)": "luecke", "Lücke (Bank)": "luecke_bank", "Kaufpreis": "preis",
+    "Nötige Rate": "rate", "Wohnfläche": "wohnflaeche", "Preis/m²": "preis_qm",
+}
+
+def lese_angebote(daten):
+    """CSV (bytes oder str) -> Dict mit ``titel`` (Liste) und float-Arrays.
+
+    Trennzeichen (``;`` oder ``,``) wird erkannt. Zeilen ohne gültigen
+    Kaufpreis werden verworfen.
+    """
+    if isinstance(daten, bytes):
+        daten = daten.decode("utf-8-sig")
+    kopf = daten[:4096]
+    trenner = ";" if kopf.count(";") > kopf.count(",") else ","
+    reader = csv.reader(io.StringIO(daten), delimiter=trenner)
+    header = [h.strip().lower().replace(" ", "") for h in next(reader, [])]
+
+    index = {}
+    for feld, namen in SPALTEN.items():
+        for i, h in enumerate(header):
+            if h in namen:
+                index[feld] = i
+                break
+    if "preis" not in index:
+        raise ValueError(f"Keine Kaufpreis-Spalte gefunden (erwartet: {', '.join(SPALTEN['preis'])}).")
+
+    zeilen = [z for z in reader if z]
+    def spalte(feld):
+        i = index.get(feld)
+        if i is None:
+            return np.full(len(zeilen), np.nan)
+        return np.array([lies_zahl(z[i]) if i < len(z) else np.nan for z in zeilen], dtype=np.float64)
+
+    preis = spalte("preis")
+    gueltig = np.isfinite(preis) & (preis > 0)
+    i_titel = index.get("titel")
+    titel = [z[i_titel].strip() if i_titel is not None and i_titel < len(z) else f"Angebot {n + 1}"
+             for n, z in enumerate(zeilen)]
+    return {
+        "titel": [t for t, ok in zip(titel, gueltig) if ok],
+        "preis": preis[gueltig],
+        "wohnflaeche": spalte("wohnflaeche")[gueltig],
+        "miete": spalte("miete")[gueltig],
+    }
+
+
+def bewerte(e, angebote):
+    """Bewertet alle Angebote gegen den Haushalt ``e`` (``engine.Eingaben``).
+
+    Fehlt die Wohnfläche, gilt die Bewirtschaftung des Haushalts; fehlt die
+    Miete, die Mieteinnahme aus den Eingaben.
+    """
+    n = len(angebote["preis"])
+    sp = {k: np.repeat(v, n) for k, v in spalten_aus_eingaben([e]).items()}
+    flaeche = angebote["wohnflaeche"]
+    hat_flaeche = np.isfinite(flaeche) & (flaeche > 0)
+    sp["wunsch_preis"] = angebote["preis"]
+    sp["wohnflaeche"] = np.where(hat_flaeche, flaeche, e.wohnflaeche)
+    sp["bewirt"] = np.where(hat_flaeche, flaeche * BEWIRT_PRO_QM, e.bewirt)
+    if e.nutzung != OPTIONS_NUTZUNG[0]:
+        sp["neue_miete"] = np.where(np.isfinite(angebote["miete"]), angebote["miete"], e.neue_miete)
+    res = berechne_batch(sp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        preis_qm = np.where(hat_flaeche, angebote["preis"] / flaeche, np.nan)
+    return {
+        "titel": angebote["titel"],
+        "preis": angebote["preis"],
+        "wohnflaeche": np.where(hat_flaeche, flaeche, np.nan),
+        "preis_qm": preis_qm,
+        "nk": res["wunsch_nk_euro"],
+        "bewirt": sp["bewirt"],
+        "darlehen": res["wunsch_darlehen"],
+        "rate": res["wunsch_rate"],
+        "frei": res["frei"],
+        "frei_bank": res["frei_bank"],
+        "luecke": res["frei"] - res["wunsch_rate"],
+        "luecke_bank": res["frei_bank"] - res["wunsch_rate"],
+        "machbar": res["machbar"] & (res["frei"] >= 0),
+        "machbar_bank": (res["wunsch_rate"] <= res["frei_bank"]) & (res["frei_bank"] >= 0),
+    }
+
+
+def seite(ergebnis, sortierung="luecke", absteigend=True, nur_machbar=False, nummer=1, pro_seite=50):
+    """Sortiert/filtert die Ergebnis-Arrays und liefert (Zeilen-Indizes der Seite, Treffer gesamt)."""
+    idx = np.flatnonzero(ergebnis["machbar"]) if nur_machbar else np.arange(len(ergebnis["preis"]))
+    werte = ergebnis[sortierung][idx]
+    # NaN (z.B. fehlende Fläche) immer ans Ende, stabile Sortierung
+    schluessel = np.where(np.isnan(werte), np.inf, -werte if absteigend else werte)
+    idx = idx[np.argsort(schluessel, kind="stable")]
+    start = (max(nummer, 1) - 1) * pro_seite
+    return idx[start:start + pro_seite], len(idx)
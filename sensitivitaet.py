@@ -0,0 +1,54 @@
+"""Sensitivität: Max. Kaufpreis und Wunsch-Rate über ein Zins × Tilgung × EK-Gitter.
+
+Der Haushalt bleibt fest, nur Zins, Tilgung und Eigenkapital variieren. Das
+ganze Gitter läuft in einem einzigen Aufruf von ``batch_engine.berechne_batch``
+(Broadcasting über die drei Achsen).
+"""
+import numpy as np
+
+from batch_engine import berechne_batch, spalten_aus_eingaben
+from engine import Eingaben
+
+ZINS_ACHSE = np.round(np.arange(2.0, 6.0 + 1e-9, 0.1), 2)
+TILGUNG_ACHSE = np.round(np.arange(1.0, 4.0 + 1e-9, 0.25), 2)
+VARIABLE_FELDER = ("zins", "tilgung", "ek")
+
+
+def ek_stufen(ek):
+    """Standard-EK-Stufen rund um das eingegebene Eigenkapital."""
+    stufen = {0.0, round(ek * 0.5, -3), float(ek), round(ek * 1.5, -3), round(ek * 2.0, -3)}
+    return np.array(sorted(stufen))
+
+
+def profil_schluessel(e):
+    """Alles ausser Zins/Tilgung/EK -- ändert sich das, muss das Gitter neu gerechnet werden."""
+    return {k: v for k, v in e.as_dict().items() if k not in VARIABLE_FELDER}
+
+
+def gitter(profil, zins_achse=ZINS_ACHSE, tilgung_achse=TILGUNG_ACHSE, ek_achse=(60000,)):
+    """Rechnet das komplette Gitter.
+
+    ``profil`` ist ein Dict wie von :func:`profil_schluessel`. Ergebnis-Arrays
+    haben die Form ``(len(ek_achse), len(tilgung_achse), len(zins_achse))``.
+    """
+    zins_achse = np.asarray(zins_achse, dtype=np.float64)
+    tilgung_achse = np.asarray(tilgung_achse, dtype=np.float64)
+    ek_achse = np.asarray(ek_achse, dtype=np.float64)
+    ek, tilg, zins = np.meshgrid(ek_achse, tilgung_achse, zins_achse, indexing="ij")
+
+    sp = spalten_aus_eingaben([Eingaben(**profil)])
+    sp["zins"] = zins.ravel()
+    sp["tilgung"] = tilg.ravel()
+    sp["ek"] = ek.ravel()
+    res = berechne_batch(sp)
+
+    form = ek.shape
+    return {
+        "zins": zins_achse,
+        "tilgung": tilgung_achse,
+        "ek": ek_achse,
+        "max_preis": res["max_preis"].reshape(form),
+        "wunsch_rate": res["wunsch_rate"].reshape(form),
+        "machbar": res["machbar"].reshape(form),
+        "frei": float(res["frei"][0]),
+    }
@@ -0,0 +1,378 @@
+"""Versioniertes Sicherungsformat der Sidebar-Werte (``sb_*``/``exp_*``/``renovierung``).
+
+Ein Stand ist ein flacher Dict wie der bisherige JSON-Export, plus
+``sb_version``. Fehlende Felder gelten als Vorgabe -- mit denselben Werten
+wie in ``Eingaben.from_state``. Ein Delta-Stand (nur Felder, die von der
+Vorgabe abweichen) ist deshalb ohne Umweg in App, API, Batch und
+Kundendatenbank lesbar und meist nur wenige Dutzend Bytes groß.
+
+Formate:
+
+* JSON: ``als_json`` (voll oder als Delta)
+* Archiv: ``packe``/``entpacke`` -- binär (Feldmaske, Varints), bei Bedarf zlib
+
+Stände ohne ``sb_version`` (Exporte vor Version 1) werden weiter gelesen;
+unbekannte Felder darin werden verworfen statt in den Session-State
+geschrieben. Die Reihenfolge in ``FELDER`` ist Teil des Archivformats: neue
+Felder nur hinten anhängen, alles andere braucht eine neue ``VERSION``.
+"""
+import json
+import math
+import struct
+import zlib
+
+from engine import OPTIONS_BESTAND, OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben
+from portfolio import monat_index
+
+VERSION = 1
+VERSION_FELD = "sb_version"
+MAGIC = b"IMS"
+_ZLIB = 1  # Flag im Archivkopf
+
+# Feldarten
+GANZ, KOMMA, TEXT, WAHL, JA_NEIN, PORTFOLIO = "ganz", "komma", "text", "wahl", "ja_nein", "portfolio"
+PORTFOLIO_SPALTEN = ("bezeichnung", "miete", "restschuld", "rate", "zins", "zinsbindung_ende")
+
+
+class Feld:
+    """Ein gesichertes Eingabefeld mit Art, Vorgabe und erlaubtem Bereich."""
+
+    __slots__ = ("name", "art", "vorgabe", "minimum", "maximum", "auswahl")
+
+    def __init__(self, name, art, vorgabe, minimum=0, maximum=None, auswahl=None):
+        self.name = name
+        self.art = art
+        # None = keine feste Vorgabe (abgeleitet bzw. nicht gesetzt)
+        self.vorgabe = vorgabe
+        self.minimum = minimum
+        self.maximum = maximum
+        self.auswahl = auswahl
+
+
+FELDER = (
+    Feld("sb_name", TEXT, "Kunde"),
+    Feld("sb_nutzung", WAHL, OPTIONS_NUTZUNG[0], auswahl=OPTIONS_NUTZUNG),
+    Feld("sb_wohnflaeche", GANZ, 120),
+    Feld("sb_akt_miete", GANZ, 1000),
+    Feld("sb_neue_miete_mix", GANZ, 500),
+    Feld("sb_neue_miete_ka", GANZ, 600),
+    Feld("sb_gehalt_h", GANZ, 3000),
+    Feld("sb_erwachsene", WAHL, OPTIONS_ERWACHSENE[1], auswahl=OPTIONS_ERWACHSENE),
+    Feld("sb_gehalt_p", GANZ, 0),
+    Feld("sb_kinder", GANZ, 1),
+    Feld("sb_kinderzuschlag", GANZ, 0),
+    Feld("sb_wohngeld", GANZ, 0),
+    Feld("sb_neben", GANZ, 0),
+    Feld("sb_sonst", GANZ, 0),
+    Feld("exp_p_lebenshaltung", KOMMA, None),
+    Feld("exp_bewirt", KOMMA, None),
+    Feld("sb_puffer", GANZ, 250),
+    Feld("sb_konsum", GANZ, 0),
+    Feld("sb_bauspar", GANZ, 0),
+    Feld("sb_ek", GANZ, 60000),
+    Feld("sb_zins", KOMMA, 3.8, minimum=0.1),
+    Feld("sb_tilgung", KOMMA, 2.0),
+    Feld("sb_zinsbindung", GANZ, 10, minimum=1, maximum=40),
+    Feld("sb_sondertilgung", GANZ, 0),
+    Feld("sb_hat_bestand", JA_NEIN, False),
+    Feld("sb_bestand_modus", WAHL, OPTIONS_BESTAND[0], auswahl=OPTIONS_BESTAND),
+    Feld("sb_miete_bestand", GANZ, 0),
+    Feld("sb_rate_bestand", GANZ, 0),
+    Feld("sb_portfolio", PORTFOLIO, None),
+    Feld("sb_grunderwerb", KOMMA, 6.5),
+    Feld("sb_notar", KOMMA, 2.0),
+    Feld("sb_makler", KOMMA, 3.57),
+    Feld("sb_wunsch_preis", GANZ, 0),
+    Feld("renovierung", GANZ, 0),
+)
+FELD_NAMEN = tuple(f.name for f in FELDER)
+_NACH_NAME = {f.name: f for f in FELDER}
+# Fehlen diese, rechnet die App sie aus den übrigen Werten (Bank-Richtwert, m² x 4 €)
+ABGELEITET = ("exp_p_lebenshaltung", "exp_bewirt")
+
+
+# ==========================================
+# ✅ PRÜFEN
+# ==========================================
+def _zahl(feld, wert):
+    if isinstance(wert, bool) or not isinstance(wert, (int, float)):
+        raise ValueError(f"{feld.name} muss eine Zahl sein.")
+    if isinstance(wert, float):
+        if not math.isfinite(wert):
+            raise ValueError(f"{feld.name} muss endlich sein.")
+        if feld.art == GANZ:
+            if not wert.is_integer():
+                raise ValueError(f"{feld.name} muss ganzzahlig sein.")
+            wert = int(wert)
+    elif feld.art == KOMMA:
+        wert = float(wert)
+    if wert < feld.minimum:
+        raise ValueError(f"{feld.name} muss mindestens {feld.minimum} sein.")
+    if feld.maximum is not None and wert > feld.maximum:
+        raise ValueError(f"{feld.name} darf höchstens {feld.maximum} sein.")
+    return wert
+
+
+def _text(feld, wert):
+    if not isinstance(wert, str):
+        raise ValueError(f"{feld.name} muss ein Text sein.")
+    return wert
+
+
+def _wahl(feld, wert):
+    if wert not in feld.auswahl:
+        raise ValueError(f"{feld.name} muss einer von {feld.auswahl} sein.")
+    return wert
+
+
+def _ja_nein(feld, wert):
+    if not isinstance(wert, bool):
+        raise ValueError(f"{feld.name} muss true/false sein.")
+    return wert
+
+
+def _portfolio(feld, wert):
+    if not isinstance(wert, dict) or wert.keys() != set(PORTFOLIO_SPALTEN):
+        raise ValueError(f"{feld.name} braucht die Spalten {', '.join(PORTFOLIO_SPALTEN)}.")
+    spalten = [wert[s] for s in PORTFOLIO_SPALTEN]
+    if not all(isinstance(s, list) for s in spalten) or len({len(s) for s in spalten}) != 1:
+        raise ValueError(f"{feld.name}: alle Spalten müssen gleich lange Listen sein.")
+    for s in spalten[1:5]:
+        for x in s:
+            if isinstance(x, bool) or not isinstance(x, (int, float)) or not math.isfinite(x):
+                raise ValueError(f"{feld.name}: Miete, Restschuld, Rate und Zins müssen Zahlen sein.")
+    if not all(isinstance(x, str) for x in spalten[0]):
+        raise ValueError(f"{feld.name}: Bezeichnungen müssen Texte sein.")
+    # Sonst scheitert Portfolio.from_dict erst beim Rechnen (None in der Monatsspalte)
+    for x in spalten[5]:
+        if isinstance(x, bool) or monat_index(x) is None:
+            raise ValueError(f"{feld.name}: Zinsbindungsende {x!r} ist kein Monat (z.B. 06/2031).")
+    return wert
+
+
+_PRUEFER = {GANZ: _zahl, KOMMA: _zahl, TEXT: _text, WAHL: _wahl, JA_NEIN: _ja_nein, PORTFOLIO: _portfolio}
+
+
+def pruefe(stand):
+    """Prüft einen gespeicherten Stand und liefert ihn normalisiert (ohne ``sb_version``).
+
+    Ganzzahlige Felder kommen als ``int``, Kommazahlen als ``float`` zurück --
+    so wie die Sidebar-Widgets sie erwarten. Fehler als ``ValueError``.
+    """
+    if not isinstance(stand, dict):
+        raise ValueError("Sicherung: Objekt erwartet.")
+    version = stand.get(VERSION_FELD, 0)
+    if isinstance(version, bool) or not isinstance(version, int) or not 0 <= version <= VERSION:
+        raise ValueError(f"Sicherung: Version {version!r} wird nicht unterstützt (höchstens {VERSION}).")
+    aus = {}
+    for name, wert in stand.items():
+        feld = _NACH_NAME.get(name)
+        if feld is None:
+            if version and name != VERSION_FELD:
+                raise ValueError(f"Sicherung: unbekanntes Feld {name}.")
+            continue
+        # Alte Exporte enthalten z.B. "sb_portfolio": null
+        if wert is None and feld.vorgabe is None:
+            continue
+        aus[name] = _PRUEFER[feld.art](feld, wert)
+    return aus
+
+
+# ==========================================
+# ➖ DELTA & VOLLER STAND
+# ==========================================
+def _abgeleitet(daten):
+    """Lebenshaltung und Bewirtschaftung, wie ``Eingaben.from_state`` sie ohne exp_* rechnet."""
+    e = Eingaben.from_state({k: v for k, v in daten.items() if k not in ABGELEITET})
+    return {"exp_p_lebenshaltung": e.lebenshaltung, "exp_bewirt": e.bewirt}
+
+
+def delta(stand):
+    """Nur die Felder, die von der Vorgabe abweichen (plus ``sb_version``).
+
+    Abgeleitete Werte fallen weg, wenn sie dem errechneten Wert entsprechen.
+    ``Eingaben.from_state(delta(s))`` ergibt dieselben Eingaben wie ``s``.
+    """
+    daten = pruefe(stand)
+    aus = {VERSION_FELD: VERSION}
+    for name, wert in daten.items():
+        if name not in ABGELEITET and wert != _NACH_NAME[name].vorgabe:
+            aus[name] = wert
+    if any(name in daten for name in ABGELEITET):
+        errechnet = _abgeleitet(daten)
+        for name in ABGELEITET:
+            if name in daten and daten[name] != errechnet[name]:
+                aus[name] = daten[name]
+    return aus
+
+
+def voll(stand):
+    """Vollständiger, geprüfter Stand: fehlende Felder mit Vorgabe bzw. errechnetem Wert."""
+    daten = {f.name: f.vorgabe for f in FELDER if f.vorgabe is not None}
+    daten.update(pruefe(stand))
+    fehlend = [name for name in ABGELEITET if name not in daten]
+    if fehlend:
+        errechnet = _abgeleitet(daten)
+        for name in fehlend:
+            daten[name] = float(errechnet[name])
+    return daten
+
+
+def als_json(stand, nur_delta=False):
+    """UTF-8-JSON eines Stands; ``nur_delta`` für Massenablage, sonst voll und lesbar."""
+    if nur_delta:
+        return json.dumps(delta(stand), ensure_ascii=False, separators=(",", ":")).encode()
+    return json.dumps({VERSION_FELD: VERSION, **pruefe(stand)}, ensure_ascii=False).encode()
+
+
+# ==========================================
+# 📦 ARCHIV (BINÄR)
+# ==========================================
+# Kopf: MAGIC, Version, Flags. Danach (ggf. zlib): Feldmaske als Varint, dann
+# die Werte der gesetzten Felder in FELDER-Reihenfolge.
+def _varint(n, aus):
+    while n > 0x7F:
+        aus.append((n & 0x7F) | 0x80)
+        n >>= 7
+    aus.append(n)
+
+
+def _lies_varint(puffer, pos):
+    n = shift = 0
+    while True:
+        b = puffer[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _bytes(b, aus):
+    _varint(len(b), aus)
+    aus += b
+
+
+def packe(stand):
+    """Delta eines Stands als kompakte Bytes fürs Archiv (typisch 20-60 Bytes)."""
+    daten = delta(stand)
+    maske = 0
+    werte = bytearray()
+    for i, feld in enumerate(FELDER):
+        if feld.name not in daten:
+            continue
+        maske |= 1 << i
+        wert = daten[feld.name]
+        if feld.art == GANZ:
+            _varint(wert, werte)
+        elif feld.art == KOMMA:
+            # Tausendstel als Varint (gerade), sonst 1 + IEEE-Double
+            k = round(wert * 1000) if wert < 1e12 else None
+            if k is not None and k / 1000 == wert:
+                _varint(2 * k, werte)
+            else:
+                werte.append(1)
+                werte += struct.pack("<d", wert)
+        elif feld.art == TEXT:
+            _bytes(wert.encode(), werte)
+        elif feld.art == WAHL:
+            werte.append(feld.auswahl.index(wert))
+        elif feld.art == JA_NEIN:
+            werte.append(int(wert))
+        else:
+            _bytes(json.dumps(wert, separators=(",", ":")).encode(), werte)
+    nutzlast = bytearray()
+    _varint(maske, nutzlast)
+    nutzlast += werte
+
+    flags = 0
+    gepackt = zlib.compress(bytes(nutzlast), 9)
+    if len(gepackt) < len(nutzlast):
+        nutzlast, flags = gepackt, _ZLIB
+    return MAGIC + bytes((VERSION, flags)) + bytes(nutzlast)
+
+
+def entpacke(roh):
+    """Archiv-Bytes -> geprüfter Stand (nur die gesicherten Delta-Felder)."""
+    if roh[:len(MAGIC)] != MAGIC or len(roh) < len(MAGIC) + 2:
+        raise ValueError("Sicherung: kein Archivformat.")
+    version, flags = roh[len(MAGIC)], roh[len(MAGIC) + 1]
+    if not 1 <= version <= VERSION:
+        raise ValueError(f"Sicherung: Version {version} wird nicht unterstützt (höchstens {VERSION}).")
+    try:
+        puffer = roh[len(MAGIC) + 2:]
+        if flags & _ZLIB:
+            puffer = zlib.decompress(puffer)
+        maske, pos = _lies_varint(puffer, 0)
+        if maske >> len(FELDER):
+            raise ValueError("Sicherung: unbekannte Felder im Archiv.")
+        stand = {VERSION_FELD: version}
+        for i, feld in enumerate(FELDER):
+            if not maske >> i & 1:
+                continue
+            if feld.art == GANZ:
+                wert, pos = _lies_varint(puffer, pos)
+            elif feld.art == KOMMA:
+                k, pos = _lies_varint(puffer, pos)
+                if k & 1:
+                    wert = struct.unpack_from("<d", puffer, pos)[0]
+                    pos += 8
+                else:
+                    wert = (k >> 1) / 1000
+            elif feld.art in (WAHL, JA_NEIN):
+                wert = puffer[pos]
+                pos += 1
+                wert = feld.auswahl[wert] if feld.art == WAHL else bool(wert)
+            else:
+                n, pos = _lies_varint(puffer, pos)
+                if pos + n > len(puffer):
+                    raise IndexError(pos + n)
+                text = bytes(puffer[pos:pos + n]).decode()
+                pos += n
+                wert = text if feld.art == TEXT else json.loads(text)
+            stand[feld.name] = wert
+        if pos != len(puffer):
+            raise IndexError(pos)
+    except (IndexError, struct.error, zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Sicherung: Archivdaten beschädigt.") from None
+    return pruefe(stand)
+
+
+def lade(roh):
+    """Archiv- oder JSON-Bytes (auch alte Exporte) -> geprüfter Stand."""
+    if roh[:len(MAGIC)] == MAGIC:
+        return entpacke(roh)
+    try:
+        stand = json.loads(roh)
+    except (json.JSONDecodeError, UnicodeDecodeError) as ex:
+        raise ValueError(f"Sicherung: kein gültiges JSON ({ex}).") from None
+    return pruefe(stand)
+
+
+# ==========================================
+# 📸 SCHNAPPSCHUSS (APP)
+# ==========================================
+class Schnappschuss:
+    """Ein Stand der Sidebar. Geprüft und kodiert wird erst beim ersten Zugriff, danach gemerkt."""
+
+    __slots__ = ("roh", "_daten", "_json", "_archiv")
+
+    def __init__(self, roh):
+        self.roh = roh
+        self._daten = self._json = self._archiv = None
+
+    @property
+    def daten(self):
+        if self._daten is None:
+            self._daten = pruefe(self.roh)
+        return self._daten
+
+    def json(self):
+        if self._json is None:
+            self._json = als_json(self.daten)
+        return self._json
+
+    def archiv(self):
+        if self._archiv is None:
+            self._archiv = packe(self.daten)
+        return self._archiv
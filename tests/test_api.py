@@ -0,0 +1,78 @@
+"""HTTP-API: Token-Prüfung, kaputte Header und Fehlerzählung (direkt über ASGI)."""
+import asyncio
+import json
+
+import pytest
+
+import api
+
+
+def _anfrage(methode, pfad, body=b"", headers=(), teile=None):
+    # teile: Body in mehreren Nachrichten (chunked, ohne Content-Length)
+    if teile is None:
+        teile = [body]
+    nachrichten = [{"type": "http.request", "body": t, "more_body": i < len(teile) - 1} for i, t in enumerate(teile)]
+    antwort = {"status": None, "body": b""}
+
+    async def receive():
+        return nachrichten.pop(0) if nachrichten else {"type": "http.disconnect"}
+
+    async def send(msg):
+        if msg["type"] == "http.response.start":
+            antwort["status"] = msg["status"]
+        elif msg["type"] == "http.response.body":
+            antwort["body"] += msg.get("body", b"")
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": methode, "path": pfad, "raw_path": pfad.encode(),
+        "query_string": b"", "root_path": "", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+    }
+    asyncio.run(api.app(scope, receive, send))
+    return antwort["status"], antwort["body"]
+
+
+@pytest.fixture
+def metriken(monkeypatch):
+    m = api.Metriken()
+    monkeypatch.setattr(api, "METRIKEN", m)
+    return m
+
+
+def test_kaputte_content_length_ist_400(metriken):
+    status, body = _anfrage("POST", "/v1/check", b"{}", [("Content-Length", "zwei")])
+    assert status == 400 and "Content-Length" in json.loads(body)["fehler"]
+    assert metriken.als_dict()["endpunkte"]["check"]["fehler"] == 1
+
+
+def test_unerwarteter_fehler_wird_gezaehlt(metriken, monkeypatch):
+    def kaputt(*args):
+        raise RuntimeError("kaputt")
+    monkeypatch.setattr(api, "batch", kaputt)
+    with pytest.raises(RuntimeError):
+        _anfrage("POST", "/v1/batch", b'{"profile": []}')
+    assert metriken.als_dict()["endpunkte"]["batch"]["fehler"] == 1
+
+
+def test_token_auch_fuer_metriken(metriken, monkeypatch):
+    monkeypatch.setattr(api, "TOKEN", "geheim")
+    assert _anfrage("GET", "/v1/metriken")[0] == 401
+    assert _anfrage("GET", "/v1/metriken", headers=[("Authorization", "Bearer falsch")])[0] == 401
+    assert _anfrage("GET", "/v1/metriken", headers=[("Authorization", "Bearer geheim")])[0] == 200
+    assert _anfrage("POST", "/v1/check", b"{}", [("Authorization", "Bearer falsch")])[0] == 401
+    assert _anfrage("POST", "/v1/check", b"{}", [("Authorization", "Bearer geheim")])[0] == 200
+    assert _anfrage("GET", "/health")[0] == 200
+
+
+def test_chunked_ueber_limit_ist_413(metriken, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BYTES", 100)
+    teile = [b'{"profile": [' + b" " * 40] + [b" " * 1000] * 50 + [b"]}"]
+    status, body = _anfrage("POST", "/v1/batch", teile=teile)
+    assert status == 413 and "100 Bytes" in json.loads(body)["fehler"]
+    assert metriken.als_dict()["endpunkte"]["batch"]["fehler"] == 1
+
+
+def test_chunked_unter_limit(monkeypatch):
+    monkeypatch.setattr(api, "MAX_BYTES", 100)
+    status, body = _anfrage("POST", "/v1/batch", teile=[b'{"profile":', b" [", b"]}"])
+    assert status == 200 and json.loads(body)["anzahl"] == 0
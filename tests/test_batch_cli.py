@@ -0,0 +1,45 @@
+"""``batch_cli``: Fehler je Datensatz und das machbar-Urteil in der Ausgabe."""
+import csv
+import json
+
+from batch_cli import AUSGABE_FELDER, fehler_pfad, main, rechne_block
+
+
+def _profil(name, **felder):
+    return json.dumps({"sb_name": name, **felder})
+
+
+def test_ohne_wunsch_objekt_kein_urteil():
+    zeilen, fehler, _, _ = rechne_block([
+        (1, _profil("A")),
+        (2, _profil("B", sb_gehalt_h=6000, sb_wunsch_preis=250_000)),
+        (3, _profil("C", sb_wunsch_preis=250_000, exp_p_lebenshaltung=9000.0)),
+    ])
+    assert fehler == []
+    machbar = {z[0]: dict(zip(AUSGABE_FELDER, z[1:]))["machbar"] for z in zeilen}
+    # A: wunsch_rate 0 <= frei, aber ohne Wunsch-Objekt gibt es kein Urteil
+    assert machbar == {"A": None, "B": True, "C": None}
+
+
+def test_kaputte_datensaetze_brechen_den_lauf_nicht_ab(tmp_path):
+    eingabe = tmp_path / "kunden.jsonl"
+    eingabe.write_text("\n".join([
+        _profil("A"),
+        "{kein json",
+        "",
+        _profil("B", sb_nutzung="Ferienhaus"),
+        _profil("C", sb_puffer="viel"),
+        _profil("D", sb_gehalt_h=6000, sb_wunsch_preis=250_000),
+    ]) + "\n", encoding="utf-8")
+    ausgabe = tmp_path / "ergebnis.csv"
+
+    assert main([str(eingabe), str(ausgabe), "--workers", "1", "--chunk", "2"]) == 1
+
+    with open(ausgabe, newline="", encoding="utf-8") as f:
+        zeilen = list(csv.DictReader(f))
+    assert [z["name"] for z in zeilen] == ["A", "D"]
+    assert zeilen[0]["machbar"] == "" and zeilen[1]["machbar"] == "True"
+
+    fehler = open(fehler_pfad(str(ausgabe)), encoding="utf-8").read().splitlines()
+    assert [z.split(":")[0] for z in fehler] == ["Zeile 2", "Zeile 4", "Zeile 5"]
+    assert "JSONDecodeError" in fehler[0] and "sb_nutzung" in fehler[1] and "puffer" in fehler[2]
@@ -0,0 +1,96 @@
+"""``batch_engine`` muss bitgleich zu ``engine.berechne`` rechnen."""
+import random
+
+import numpy as np
+import pytest
+
+from batch_engine import ERGEBNIS_FELDER, berechne_batch, erwachsene_code, nutzung_code, spalten_aus_eingaben
+from engine import OPTIONS_ERWACHSENE, OPTIONS_NUTZUNG, Eingaben, berechne
+
+
+def _zufall(rnd, i):
+    paar = rnd.random() < 0.6
+    return dict(
+        name=f"Profil {i}", nutzung=rnd.choice(OPTIONS_NUTZUNG),
+        wohnflaeche=rnd.randrange(0, 260, 5), akt_miete=rnd.choice((0, rnd.randrange(300, 2500, 50))),
+        neue_miete=rnd.randrange(0, 2000, 50), gehalt_h=rnd.randrange(0, 9000, 50) + rnd.choice((0, 0.37)),
+        erwachsene=OPTIONS_ERWACHSENE[paar], gehalt_p=rnd.randrange(0, 6000, 50) if paar else 0,
+        kinder=rnd.choice((0, 0, 1, 2, 5)), kinderzuschlag=rnd.choice((0, 0, 250)), wohngeld=rnd.choice((0, 0, 180)),
+        neben=rnd.choice((0, 538)), sonst=rnd.choice((0, 200)),
+        lebenshaltung=None if rnd.random() < 0.7 else float(rnd.randrange(800, 4000, 50)),
+        bewirt=None if rnd.random() < 0.7 else float(rnd.randrange(0, 1200, 10)),
+        puffer=rnd.randrange(0, 600, 50), konsum=rnd.choice((0, 300)), bauspar=rnd.choice((0, 100)),
+        ek=rnd.randrange(0, 400_000, 1000), zins=round(rnd.uniform(0.1, 7.0), 2), tilgung=round(rnd.uniform(0.0, 5.0), 2),
+        miete_bestand=rnd.choice((0, 900)), rate_bestand=rnd.choice((0, 700)),
+        grunderwerb=rnd.choice((3.5, 6.5)), notar=rnd.choice((1.5, 2.0)), makler=rnd.choice((0.0, 3.57)),
+        wunsch_preis=rnd.choice((0, rnd.randrange(50_000, 900_000, 5000))), renovierung=rnd.choice((0, 20_000)),
+    )
+
+
+def _randfall(rnd, p):
+    fall = rnd.randrange(5)
+    if fall == 0:
+        # frei genau 0
+        p["lebenshaltung"] = 0.0
+        p["lebenshaltung"] = float(berechne(Eingaben(**p)).frei)
+    elif fall == 1:
+        # Annuität 0
+        p["zins"], p["tilgung"] = 0.0, 0.0
+    elif fall == 2:
+        # Darlehen genau 0: EK deckt die Investition
+        p["wunsch_preis"] = p["wunsch_preis"] or 300_000
+        nk = p["grunderwerb"] + p["notar"] + p["makler"]
+        p["ek"] = p["wunsch_preis"] + p["wunsch_preis"] * (nk / 100) + p["renovierung"]
+    elif fall == 3:
+        # Netto genau auf einer Zuschlags-Schwelle
+        p["lebenshaltung"] = None
+        rest = p["gehalt_p"] + p["kinder"] * 250 + p["kinderzuschlag"] + p["wohngeld"] + p["neben"] + p["sonst"]
+        p["gehalt_h"] = max(rnd.choice((4000, 6000, 8000)) - rest, 0)
+    else:
+        # Sozialleistungen drücken frei_bank ins Minus
+        p["kinderzuschlag"], p["wohngeld"] = 900, 400
+    return p
+
+
+def _profile(n, seed):
+    rnd = random.Random(seed)
+    aus = []
+    for i in range(n):
+        p = _zufall(rnd, i)
+        aus.append(Eingaben(**(_randfall(rnd, p) if i % 2 else p)))
+    return aus
+
+
+@pytest.mark.parametrize("seed", [1, 20260101])
+def test_batch_bitgleich_mit_skalar(seed):
+    eingaben = _profile(2000, seed)
+    batch = berechne_batch(spalten_aus_eingaben(eingaben))
+    skalar = [berechne(e) for e in eingaben]
+    for feld in ERGEBNIS_FELDER:
+        # None (kein Mietvergleich) entspricht NaN im Batch
+        ref = np.array([getattr(r, feld) for r in skalar], dtype=batch[feld].dtype)
+        if ref.dtype.kind == "f":
+            gleich = (batch[feld] == ref) | (np.isnan(ref) & np.isnan(batch[feld]))
+        else:
+            gleich = batch[feld] == ref
+        assert gleich.all(), f"{feld}: Abweichung in Zeile(n) {np.flatnonzero(~gleich)[:10].tolist()}"
+
+
+def test_randfaelle_getroffen():
+    eingaben = _profile(400, 7)
+    res = berechne_batch(spalten_aus_eingaben(eingaben))
+    assert (res["frei"] == 0).any()
+    assert (res["max_kredit"] == 0).any()
+    assert (res["wunsch_darlehen"] == 0).any()
+    assert (res["frei_bank"] < 0).any()
+
+
+def test_unbekannte_auswahl_ist_fehler():
+    with pytest.raises(ValueError, match="nutzung"):
+        nutzung_code(["Ferienhaus"])
+    with pytest.raises(ValueError, match="erwachsene"):
+        erwachsene_code(["Paar"])
+    with pytest.raises(ValueError, match="nutzung"):
+        nutzung_code([0, 3])
+    assert erwachsene_code(OPTIONS_ERWACHSENE).tolist() == [0, 1]
+    assert nutzung_code(OPTIONS_NUTZUNG).tolist() == [0, 1, 2]
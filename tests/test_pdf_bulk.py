@@ -0,0 +1,27 @@
+"""Sammel-Export: kaputte Profile bekommen kein Zertifikat, sondern einen Eintrag in FEHLER.txt."""
+import json
+import zipfile
+
+from pdf_bulk import export_zip
+
+
+def test_kaputte_profile_landen_in_fehler_txt(tmp_path):
+    eingabe = tmp_path / "kunden.jsonl"
+    eingabe.write_text("\n".join([
+        json.dumps({"sb_name": "Gut", "sb_gehalt_h": 4200}),
+        json.dumps({"sb_name": "Nutzung", "sb_nutzung": "Quatsch"}),
+        json.dumps({"sb_name": "Tippfehler", "sb_gehalt_haupt": "abc"}),
+        json.dumps({"sb_name": "Text", "sb_gehalt_h": "abc"}),
+        "{kein json",
+    ]) + "\n", encoding="utf-8")
+    ziel = tmp_path / "z.zip"
+
+    anzahl, fehler = export_zip(str(eingabe), str(ziel), workers=1, paket_groesse=2)
+
+    assert anzahl == 1
+    with zipfile.ZipFile(ziel) as zf:
+        assert sorted(zf.namelist()) == ["FEHLER.txt", "Gut_Finanzcheck.pdf"]
+        zeilen = zf.read("FEHLER.txt").decode().splitlines()
+    assert [z.split(":")[0] for z in zeilen] == ["Datensatz 2", "Datensatz 3", "Datensatz 4", "Datensatz 5"]
+    assert "sb_nutzung" in zeilen[0] and "sb_gehalt_haupt" in zeilen[1] and "sb_gehalt_h" in zeilen[2]
+    assert fehler == zeilen
@@ -0,0 +1,45 @@
+"""PDF-Cache: Status-Abfragen dürfen die Treffer-/Fehlgriff-Zähler nicht verfälschen."""
+import time
+
+from pdf_cache import PdfCache, PdfJobs, stable_hash
+
+
+def test_peek_zaehlt_nicht():
+    cache = PdfCache()
+    cache.put("a", b"%PDF")
+    for _ in range(5):
+        assert cache.peek("a") == b"%PDF"
+        assert cache.peek("b") is None
+        assert "a" in cache
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_download_zaehlt_einmal():
+    cache = PdfCache()
+    renders = []
+    def render(d):
+        renders.append(d)
+        return b"%PDF"
+    assert cache.get_or_render({"x": 1}, render) == b"%PDF"
+    assert cache.get_or_render({"x": 1}, render) == b"%PDF"
+    assert len(renders) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert stable_hash({"x": 1}) in cache
+
+
+def test_job_status_zaehlt_nicht():
+    cache = PdfCache()
+    jobs = PdfJobs(cache, max_workers=1)
+    key = jobs.submit({"x": 2}, lambda d: b"%PDF")
+    for _ in range(50):
+        if jobs.status(key) == "fertig":
+            break
+        time.sleep(0.01)
+    vorher = cache.stats()
+    for _ in range(10):
+        assert jobs.status(key) == "fertig"
+        assert jobs.ergebnis(key) == b"%PDF"
+    assert cache.stats()["hits"] == vorher["hits"] and cache.stats()["misses"] == vorher["misses"]
+    # Zweiter Auftrag mit gleichen Daten: kein neuer Render
+    assert jobs.submit({"x": 2}, lambda d: b"anders") == key
+    assert jobs.stats()["gestartet"] == 1
@@ -0,0 +1,38 @@
+"""Zahlen aus Angebots-CSVs: deutsche und englische Schreibweisen."""
+import math
+
+import pytest
+
+from format_de import lies_zahl
+from screener import lese_angebote
+
+
+@pytest.mark.parametrize("text, wert", [
+    ("350.000", 350_000.0),
+    ("350,000", 350_000.0),
+    ("1.234,50", 1234.5),
+    ("1,234.50", 1234.5),
+    ("1.234.567", 1_234_567.0),
+    ("1,234,567.89", 1_234_567.89),
+    ("1234.5", 1234.5),
+    ("1234,5", 1234.5),
+    ("0,500", 0.5),
+    ("-1.234,5", -1234.5),
+    ("350000 €", 350_000.0),
+    ("450.000 EUR", 450_000.0),
+    ("1 234,50", 1234.5),
+])
+def test_zahl(text, wert):
+    assert lies_zahl(text) == wert
+
+
+@pytest.mark.parametrize("text", ["", "abc", "1.234.5", "1,23,456.7", "1.234,5.6", "12,34.5", "."])
+def test_zahl_mehrdeutig_ist_nan(text):
+    assert math.isnan(lies_zahl(text))
+
+
+def test_englische_csv():
+    angebote = lese_angebote('title,price,area,rent\n"Loft","450,000",85,"1,150.00"\nFlat,"1,234,500.50",120,\n')
+    assert angebote["preis"].tolist() == [450_000.0, 1_234_500.5]
+    assert angebote["wohnflaeche"].tolist() == [85.0, 120.0]
+    assert angebote["miete"][0] == 1150.0
@@ -0,0 +1,35 @@
+"""Sicherung: Portfolio-Spalten werden beim Laden vollständig geprüft."""
+import pytest
+
+from portfolio import Portfolio
+from sicherung import Schnappschuss, lade, pruefe
+
+
+def _portfolio(**spalten):
+    p = {"bezeichnung": ["Whg. A"], "miete": [900.0], "restschuld": [150_000.0], "rate": [700.0],
+         "zins": [2.1], "zinsbindung_ende": ["06/2031"]}
+    p.update(spalten)
+    return {"sb_version": 1, "sb_portfolio": p}
+
+
+def test_gueltiges_portfolio_ueberlebt_schnappschuss():
+    s = Schnappschuss(_portfolio())
+    assert lade(s.json()) == s.daten
+    assert lade(s.archiv()) == s.daten
+    Portfolio.from_dict(s.daten["sb_portfolio"])
+
+
+@pytest.mark.parametrize("spalten", [
+    {"zinsbindung_ende": ["irgendwann"]},
+    {"zinsbindung_ende": [None]},
+    {"zinsbindung_ende": [True]},
+    {"bezeichnung": [7]},
+    {"bezeichnung": [None]},
+])
+def test_kaputtes_portfolio_wird_abgelehnt(spalten):
+    stand = _portfolio(**spalten)
+    with pytest.raises(ValueError, match="sb_portfolio"):
+        pruefe(stand)
+    with pytest.raises(ValueError, match="sb_portfolio"):
+        Schnappschuss(stand).daten
+
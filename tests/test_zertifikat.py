@@ -0,0 +1,35 @@
+"""Zertifikat: die geteilte Vorlage ändert kein Byte am PDF."""
+import re
+
+from engine import Eingaben, berechne
+from zertifikat import Vorlage, create_pdf, render_pdf, render_vergleich_pdf
+
+
+def _ohne_datum(pdf_bytes):
+    return re.sub(rb"/CreationDate \(D:\d+\)", b"", pdf_bytes)
+
+
+def _profile():
+    return [
+        Eingaben.from_state({"sb_name": "Müller", "sb_gehalt_h": 4200}),
+        Eingaben.from_state({"sb_name": "Voll", "sb_gehalt_h": 5200, "sb_gehalt_p": 2100, "sb_wunsch_preis": 420_000,
+                             "sb_wohngeld": 150, "renovierung": 20_000, "sb_akt_miete": 1300}),
+        Eingaben.from_state({"sb_name": "Knapp", "sb_gehalt_h": 1800, "sb_wunsch_preis": 600_000}),
+    ]
+
+
+def test_vorlage_gleiche_bytes():
+    vorlage = Vorlage()
+    for e in _profile():
+        r = berechne(e)
+        assert _ohne_datum(create_pdf(e, r, vorlage=vorlage)) == _ohne_datum(create_pdf(e, r))
+        assert _ohne_datum(render_pdf(e, True, vorlage)) == _ohne_datum(render_pdf(e, True))
+    szenarien = [(e.name, e) for e in _profile()]
+    assert _ohne_datum(render_vergleich_pdf(szenarien, vorlage)) == _ohne_datum(render_vergleich_pdf(szenarien))
+
+
+def test_vorlage_seitenzahl_ueber_vorrat():
+    # Mehr Seiten als vorformatiert: Fußzeile wird frisch gebaut
+    vorlage = Vorlage(max_seiten=1)
+    e = _profile()[1]
+    assert _ohne_datum(render_pdf(e, True, vorlage)) == _ohne_datum(render_pdf(e, True))
@@ -0,0 +1,232 @@
+"""Tilgungsplan (Annuitätendarlehen) in geschlossener bzw. vektorisierter Form.
+
+Für ein Annuitätendarlehen mit Monatszins ``q`` und Monatsrate ``R`` gilt
+nach ``k`` Monaten::
+
+    S_k = S_0 * (1 + q)^k - R * ((1 + q)^k - 1) / q
+
+Damit lässt sich jeder Monat direkt ausrechnen, ohne 360 Schritte in Python.
+Sondertilgungen (jeweils zum Jahresende) teilen den Plan in Abschnitte, die
+einzeln geschlossen berechnet werden.
+"""
+import numpy as np
+
+
+def monatsrate(darlehen, zins, tilgung):
+    """Anfängliche Monatsrate wie im Finanzierungscheck: Darlehen * (Zins + Tilgung) / 100 / 12."""
+    return (darlehen * (zins + tilgung)) / 100 / 12
+
+
+def restschuld(s0, q, rate, k):
+    """Restschuld nach ``k`` Monaten (numpy-Broadcasting über alle Argumente)."""
+    s0, q, rate, k = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (s0, q, rate, k)))
+    faktor = np.power(1 + q, k)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuitaeten = np.where(q > 0, rate * (faktor - 1) / q, rate * k)
+    return s0 * faktor - annuitaeten
+
+
+# ==========================================
+# 📉 EINZELNER PLAN
+# ==========================================
+class Tilgungsplan:
+    """Monatliche Zeilen eines Tilgungsplans als NumPy-Spalten."""
+
+    __slots__ = ("monat", "rate", "zinsen", "tilgung", "sondertilgung", "restschuld", "darlehen", "zinsbindung_monate")
+
+    def __init__(self, monat, rate, zinsen, tilgung, sondertilgung, restschuld, darlehen, zinsbindung_monate):
+        self.monat = monat
+        self.rate = rate
+        self.zinsen = zinsen
+        self.tilgung = tilgung
+        self.sondertilgung = sondertilgung
+        self.restschuld = restschuld
+        self.darlehen = darlehen
+        self.zinsbindung_monate = zinsbindung_monate
+
+    @property
+    def laufzeit_monate(self):
+        """Monate bis zur vollständigen Tilgung (None, falls nicht im Planungszeitraum)."""
+        if len(self.restschuld) and self.restschuld[-1] <= 0:
+            return int(self.monat[-1])
+        return None
+
+    @property
+    def zinsen_gesamt(self):
+        return float(self.zinsen.sum())
+
+    def restschuld_nach(self, monate):
+        if monate <= 0:
+            return float(self.darlehen)
+        if monate > len(self.restschuld):
+            return float(self.restschuld[-1]) if len(self.restschuld) else float(self.darlehen)
+        return float(self.restschuld[monate - 1])
+
+    def zinsen_bis(self, monate):
+        return float(self.zinsen[:monate].sum())
+
+    @property
+    def restschuld_zinsbindung(self):
+        return self.restschuld_nach(self.zinsbindung_monate)
+
+    @property
+    def zinsen_zinsbindung(self):
+        return self.zinsen_bis(self.zinsbindung_monate)
+
+    def jahresuebersicht(self):
+        """Summen pro Jahr: dict mit jahr, zinsen, tilgung, sondertilgung, restschuld."""
+        if not len(self.monat):
+            return {"jahr": np.array([], dtype=int), "zinsen": np.array([]), "tilgung": np.array([]),
+                    "sondertilgung": np.array([]), "restschuld": np.array([])}
+        starts = np.arange(0, len(self.monat), 12)
+        ends = np.minimum(starts + 12, len(self.monat)) - 1
+        return {
+            "jahr": starts // 12 + 1,
+            "zinsen": np.add.reduceat(self.zinsen, starts),
+            "tilgung": np.add.reduceat(self.tilgung, starts),
+            "sondertilgung": np.add.reduceat(self.sondertilgung, starts),
+            "restschuld": self.restschuld[ends],
+        }
+
+
+def tilgungsplan(darlehen, zins, tilgung, zinsbindung_jahre=10, sondertilgungen=None, max_jahre=50):
+    """Erstellt den Monatsplan.
+
+    ``sondertilgungen`` ist ein Dict ``{jahr: betrag}`` (Zahlung am Ende des
+    jeweiligen Jahres). Zins und Rate gelten über die gesamte Laufzeit, also
+    auch nach Ende der Zinsbindung.
+    """
+    q = zins / 100 / 12
+    rate = monatsrate(darlehen, zins, tilgung)
+    horizont = int(max_jahre * 12)
+
+    sonder = {int(j) * 12: float(b) for j, b in (sondertilgungen or {}).items() if b > 0 and 0 < int(j) * 12 <= horizont}
+    grenzen = sorted(set(sonder) | {horizont})
+
+    teile = []
+    s0 = float(darlehen)
+    start = 0
+    for ende in grenzen:
+        if s0 <= 0:
+            break
+        k = np.arange(1, ende - start + 1, dtype=np.float64)
+        s = restschuld(s0, q, rate, k)
+        s_vor = np.concatenate(([s0], s[:-1]))
+        zinsen = s_vor * q
+        raten = np.full_like(s, rate)
+
+        # Letzte Rate: nur noch Restschuld plus Zinsen
+        getilgt = np.flatnonzero(s <= 1e-9)
+        if getilgt.size:
+            i = getilgt[0]
+            s, s_vor, zinsen, raten = s[:i + 1], s_vor[:i + 1], zinsen[:i + 1], raten[:i + 1]
+            raten[i] = s_vor[i] + zinsen[i]
+            s[i] = 0.0
+
+        st = np.zeros_like(s)
+        if not getilgt.size and ende in sonder:
+            st[-1] = min(sonder[ende], s[-1])
+            s[-1] -= st[-1]
+
+        teile.append((np.arange(start + 1, start + len(s) + 1), raten, zinsen, raten - zinsen, st, s))
+        s0 = float(s[-1])
+        start = ende
+
+    if teile:
+        spalten = [np.concatenate(x) for x in zip(*teile)]
+    else:
+        spalten = [np.array([], dtype=int)] + [np.array([])] * 5
+    return Tilgungsplan(*spalten, darlehen=float(darlehen), zinsbindung_monate=int(zinsbindung_jahre * 12))
+
+
+def monatszeilen(darlehen, zins, tilgung, sondertilgungen=None, max_jahre=50, block=120):
+    """Wie ``tilgungsplan``, aber als Generator für Exporte (PDF-Anhang, Excel).
+
+    Liefert Tupel ``(monat, rate, zinsen, tilgung, sondertilgung, restschuld)``
+    mit denselben Werten wie ``tilgungsplan``. Gerechnet wird blockweise
+    (``block`` Monate); der Speicherbedarf hängt nicht von der Laufzeit ab.
+    """
+    q = zins / 100 / 12
+    rate = monatsrate(darlehen, zins, tilgung)
+    horizont = int(max_jahre * 12)
+
+    sonder = {int(j) * 12: float(b) for j, b in (sondertilgungen or {}).items() if b > 0 and 0 < int(j) * 12 <= horizont}
+    s0 = float(darlehen)
+    start = 0
+    for ende in sorted(set(sonder) | {horizont}):
+        if s0 <= 0:
+            return
+        # Innerhalb eines Abschnitts immer ab s0 rechnen (wie tilgungsplan -> bitgleiche Werte)
+        s_davor = s0
+        for von in range(0, ende - start, block):
+            bis = min(von + block, ende - start)
+            s = restschuld(s0, q, rate, np.arange(von + 1, bis + 1, dtype=np.float64))
+            s_vor = np.concatenate(([s_davor], s[:-1]))
+            zinsen = s_vor * q
+            raten = np.full_like(s, rate)
+
+            getilgt = np.flatnonzero(s <= 1e-9)
+            if getilgt.size:
+                i = getilgt[0]
+                s, s_vor, zinsen, raten = s[:i + 1], s_vor[:i + 1], zinsen[:i + 1], raten[:i + 1]
+                raten[i] = s_vor[i] + zinsen[i]
+                s[i] = 0.0
+
+            st = np.zeros_like(s)
+            if not getilgt.size and bis == ende - start and ende in sonder:
+                st[-1] = min(sonder[ende], s[-1])
+                s[-1] -= st[-1]
+
+            yield from zip(range(start + von + 1, start + von + len(s) + 1), raten.tolist(), zinsen.tolist(),
+                           (raten - zinsen).tolist(), st.tolist(), s.tolist())
+            if getilgt.size:
+                return
+            s_davor = float(s[-1])
+        s0 = s_davor
+        start = ende
+
+
+# ==========================================
+# 📊 BATCH (VIELE DARLEHEN, OHNE SONDERTILGUNG)
+# ==========================================
+def kennzahlen_batch(darlehen, zins, tilgung, zinsbindung_jahre=10):
+    """Kennzahlen vieler Darlehen auf einmal, rein geschlossen berechnet.
+
+    Liefert Arrays ``rate``, ``restschuld_zinsbindung``, ``zinsen_zinsbindung``,
+    ``laufzeit_monate`` (inf = wird nie getilgt) und ``zinsen_gesamt``.
+    """
+    d = np.asarray(darlehen, dtype=np.float64)
+    zins = np.asarray(zins, dtype=np.float64)
+    tilgung = np.asarray(tilgung, dtype=np.float64)
+    d, zins, tilgung, zb = np.broadcast_arrays(d, zins, tilgung, np.asarray(zinsbindung_jahre, dtype=np.float64) * 12)
+    q = zins / 100 / 12
+    rate = monatsrate(d, zins, tilgung)
+
+    # Laufzeit: S_n = 0  ->  n = -ln(1 - qD/R) / ln(1 + q)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_exakt = np.where(q > 0, -np.log1p(-q * d / rate) / np.log1p(q), d / rate)
+    n_exakt = np.where((rate > 0) & (rate > q * d), n_exakt, np.inf)
+    n_exakt = np.where(d <= 0, 0.0, n_exakt)
+    laufzeit = np.maximum(np.ceil(n_exakt - 1e-9), 0.0)
+
+    endlich = np.isfinite(laufzeit)
+    k_letzte = np.where(endlich, np.maximum(laufzeit - 1, 0), 0)
+    s_letzte = restschuld(d, q, rate, k_letzte)
+    zinsen_gesamt = np.where(endlich, rate * k_letzte + s_letzte * (1 + q) - d, np.inf)
+    zinsen_gesamt = np.where(d <= 0, 0.0, zinsen_gesamt)
+
+    # Bis Ende der Zinsbindung (oder früherer Volltilgung)
+    m = np.minimum(zb, np.where(endlich, laufzeit, zb))
+    rest_zb = np.where(m < laufzeit, np.maximum(restschuld(d, q, rate, m), 0.0), 0.0)
+    getilgt_zb = d - rest_zb
+    k_voll = np.where(m < laufzeit, m, k_letzte)
+    zinsen_zb = np.where(m < laufzeit, rate * m - getilgt_zb, rate * k_voll + s_letzte * (1 + q) - d)
+    zinsen_zb = np.where(d <= 0, 0.0, zinsen_zb)
+
+    return {
+        "rate": rate,
+        "restschuld_zinsbindung": rest_zb,
+        "zinsen_zinsbindung": zinsen_zb,
+        "laufzeit_monate": laufzeit,
+        "zinsen_gesamt": zinsen_gesamt,
+    }
@@ -0,0 +1,89 @@
+"""Excel-Export des Tilgungsplans (openpyxl im Write-only-Modus).
+
+Die Zeilen kommen als Generator aus ``tilgung.monatszeilen`` und werden
+einzeln geschrieben. Im Write-only-Modus hält openpyxl keine Zellen im
+Speicher, sondern streamt jede Zeile direkt in die Datei. Der Speicherbedarf
+bleibt damit gleich, egal ob 10 oder 40 Jahre Laufzeit.
+"""
+import io
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+from tilgung import monatsrate, monatszeilen
+
+FORMAT_EUR = '#,##0.00 "€"'
+KOPF = ("Monat", "Jahr", "Rate", "Zinsen", "Tilgung", "Sondertilgung", "Restschuld")
+BREITEN = (8, 6, 14, 14, 14, 15, 16)
+
+
+def schreibe_plan(ws, zeilen, zinsbindung_monate=None):
+    """Kopfzeile, alle Monatszeilen und eine Summenzeile in ein Write-only-Blatt."""
+    fett = Font(bold=True)
+    markiert = PatternFill("solid", fgColor="FFF0C8")
+
+    def zelle(wert, format=None, font=None, fill=None):
+        c = WriteOnlyCell(ws, value=wert)
+        if format:
+            c.number_format = format
+        if font:
+            c.font = font
+        if fill:
+            c.fill = fill
+        return c
+
+    ws.append([zelle(k, font=fett) for k in KOPF])
+    summe_zinsen = summe_tilgung = summe_sonder = 0.0
+    for monat, rate, zinsen, tilgung, sonder, rest in zeilen:
+        summe_zinsen += zinsen
+        summe_tilgung += tilgung
+        summe_sonder += sonder
+        if monat == zinsbindung_monate:
+            ws.append([zelle(monat, fill=markiert), zelle((monat - 1) // 12 + 1, fill=markiert)]
+                      + [zelle(w, FORMAT_EUR, fill=markiert) for w in (rate, zinsen, tilgung, sonder, rest)])
+        else:
+            ws.append([monat, (monat - 1) // 12 + 1]
+                      + [zelle(w, FORMAT_EUR) for w in (rate, zinsen, tilgung, sonder, rest)])
+    ws.append([zelle("Summe", font=fett), None, None,
+               *(zelle(w, FORMAT_EUR, fett) for w in (summe_zinsen, summe_tilgung, summe_sonder))])
+
+
+def tilgungsplan_xlsx(e, r, ziel=None, max_jahre=50):
+    """Tilgungsplan des Wunsch-Objekts als .xlsx; ``ziel`` = Pfad/Datei, sonst Rückgabe als Bytes."""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Tilgungsplan")
+    for i, breite in enumerate(BREITEN):
+        ws.column_dimensions[chr(ord("A") + i)].width = breite
+    # Kopfblock und Tabellenkopf (Zeilen 1-9) bleiben beim Scrollen stehen
+    ws.freeze_panes = "A10"
+
+    fett = Font(bold=True)
+    titel = WriteOnlyCell(ws, value=f"Tilgungsplan: {e.name}")
+    titel.font = Font(bold=True, size=14)
+    ws.append([titel])
+    for label, wert, format in (
+        ("Darlehen", r.wunsch_darlehen, FORMAT_EUR),
+        ("Sollzins (%)", e.zins, "0.00"),
+        ("Anfängliche Tilgung (%)", e.tilgung, "0.00"),
+        ("Monatsrate", monatsrate(r.wunsch_darlehen, e.zins, e.tilgung), FORMAT_EUR),
+        ("Sondertilgung p.a. (Zinsbindung)", e.sondertilgung, FORMAT_EUR),
+        ("Zinsbindung (Jahre)", e.zinsbindung, "0"),
+    ):
+        c_label = WriteOnlyCell(ws, value=label)
+        c_label.font = fett
+        c_wert = WriteOnlyCell(ws, value=wert)
+        c_wert.number_format = format
+        ws.append([c_label, None, c_wert])
+    ws.append([])
+
+    zeilen = monatszeilen(r.wunsch_darlehen, e.zins, e.tilgung,
+                          {j: e.sondertilgung for j in range(1, e.zinsbindung + 1)}, max_jahre)
+    schreibe_plan(ws, zeilen, e.zinsbindung * 12)
+
+    if ziel is not None:
+        wb.save(ziel)
+        return None
+    puffer = io.BytesIO()
+    wb.save(puffer)
+    return puffer.getvalue()
@@ -0,0 +1,454 @@
+from functools import lru_cache
+
+from fpdf import FPDF
+
+from engine import OPTIONS_NUTZUNG, berechne
+from format_de import pdf_eur, zahl_de
+
+@lru_cache(maxsize=4096)
+def txt(text):
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+ANHANG_SPALTEN = (("Monat", 16), ("Jahr", 14), ("Rate", 30), ("Zinsen", 30), ("Tilgung", 30), ("Sondertilg.", 30), ("Restschuld", 40))
+VERGLEICH_SPALTEN = (("Szenario", 52, 'L'), ("Nutzung", 28, 'L'), ("Freie Rate", 27, 'R'),
+                     ("Max. Kaufpreis", 30, 'R'), ("Wunsch-Rate", 27, 'R'), ("Ergebnis", 26, 'C'))
+
+# ==========================================
+# 🧩 VORLAGE (statischer Teil, einmal pro Prozess)
+# ==========================================
+# Alle festen Texte des Zertifikats, des Anhangs und des Vergleichs
+STATISCHE_TEXTE = (
+    "1. Monatliche Haushaltsrechnung", "Gesamteinnahmen (Netto):", "Ausgaben (Detailliert):",
+    "Lebenshaltung (Pauschale)", "Bewirtschaftung (Hauskosten)", "Aktuelle Kaltmiete", "Rate Bestandskredit",
+    "Sparrate (Pflicht)", "Konsumkredite", "Puffer / Rücklagen",
+    "  (Nahrung, Kleidung, Gesundheit)", "  (Bleibt bestehen)", "  (Tilgungsaussetzung)",
+    "Summe Ausgaben:", "Verfügbarer Betrag (Freie Rate):",
+    "2. Vergleich: Miete vs. Eigentum", "Bisherige Warmmiete:", "Neue Belastung (Rate + NK + Puffer):",
+    "3. Finanzierungsplan Wunsch-Objekt", "Kaufpreis:", "Modernisierung / Renovierung:",
+    "Gesamtkosten (Investition):", "Eigenkapital:", "Zu finanzierendes Darlehen:", "Ergebnis: MACHBAR (Im Budget)",
+    "3. Maximaler Kaufpreis (Kalkulation)", "4. Dein maximal mögliches Budget (Theoretisch)",
+    "Max. Kaufpreis der Immobilie:", "dazu Kaufnebenkosten:", "abzüglich Eigenkapital:", "Notwendiges Bankdarlehen:",
+    "Hinweis: Dies ist eine unverbindliche Modellrechnung.",
+    "Anhang: Tilgungsplan (Beträge in EUR)", "Summe",
+    "Details zu jedem Szenario auf den folgenden Seiten. Unverbindliche Modellrechnung.",
+)
+
+class Vorlage:
+    """Fertig kodierte feste Texte und Layout-Konstanten; pro Dokument kommen nur die Werte dazu.
+
+    Reine Daten, nur öffentliche FPDF-API -- kann zwischen Threads und
+    Sessions geteilt werden (app.py: ``st.cache_resource``).
+    """
+
+    __slots__ = ("titel", "fusszeile", "seiten", "texte", "anhang_spalten", "vergleich_spalten")
+
+    # Farben (R, G, B)
+    KOPF_BALKEN = (28, 58, 106)
+    UEBERSCHRIFT = (44, 62, 80)
+    TEXT = (0, 0, 0)
+    FUELLUNG = (240, 240, 240)
+    GRAU = (100, 100, 100)
+
+    def __init__(self, max_seiten=64):
+        self.titel = txt('Finanzierungs-Zertifikat')
+        self.fusszeile = txt('WA | 2026')
+        self.seiten = tuple(f'Seite {n}' for n in range(max_seiten + 1))
+        self.texte = {t: txt(t) for t in STATISCHE_TEXTE}
+        self.anhang_spalten = tuple((txt(name), breite) for name, breite in ANHANG_SPALTEN)
+        self.vergleich_spalten = tuple((txt(titel), breite, ausr) for titel, breite, ausr in VERGLEICH_SPALTEN)
+
+    def t(self, text):
+        """Fester Text aus der Vorlage, sonst frisch kodiert."""
+        return self.texte.get(text) or txt(text)
+
+    def seite(self, n):
+        return self.seiten[n] if n < len(self.seiten) else f'Seite {n}'
+
+# ==========================================
+# 📄 PDF GENERATOR
+# ==========================================
+class PDF(FPDF):
+    # Optional: wird auf jeder neuen Seite nach dem Kopf aufgerufen (z.B. Tabellenkopf im Anhang)
+    kopfzeile = None
+
+    def __init__(self, vorlage=None):
+        super().__init__()
+        self.vorlage = vorlage or Vorlage()
+
+    def header(self):
+        self.set_fill_color(*Vorlage.KOPF_BALKEN)
+        self.rect(0, 0, 210, 25, 'F')
+        self.set_font('Arial', 'B', 16)
+        self.set_text_color(255, 255, 255)
+        self.cell(0, 15, self.vorlage.titel, 0, 1, 'C')
+        self.ln(10)
+        if self.kopfzeile:
+            self.kopfzeile()
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Arial', 'I', 8)
+        self.set_text_color(128, 128, 128)
+        self.cell(0, 10, self.vorlage.seite(self.page_no()), 0, 0, 'C')
+        self.set_x(-40)
+        self.cell(30, 10, self.vorlage.fusszeile, 0, 0, 'R')
+
+def zertifikat_seite(pdf, e, r, ueberschrift=None):
+    """Schreibt das Zertifikat eines Szenarios ab einer neuen Seite in ``pdf``."""
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    # Feste Texte aus der Vorlage; Beträge (pdf_eur) sind reines ASCII und brauchen kein txt()
+    t = pdf.vorlage.t
+    
+    col_header = Vorlage.UEBERSCHRIFT
+    col_text = Vorlage.TEXT
+    col_fill = Vorlage.FUELLUNG
+
+    # KOPF
+    if ueberschrift:
+        pdf.set_text_color(100, 100, 100)
+        pdf.set_font("Arial", "", 10)
+        pdf.cell(0, 6, txt(ueberschrift), ln=True)
+    pdf.set_text_color(*col_header)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, txt(f"Analyse für: {e.name}"), ln=True)
+    pdf.set_text_color(*col_text)
+    pdf.set_font("Arial", "", 11)
+    pdf.cell(0, 6, txt(f"Szenario: {e.nutzung}"), ln=True)
+    pdf.ln(5)
+
+    # 1. HAUSHALT
+    pdf.set_fill_color(*col_fill)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(*col_header)
+    pdf.cell(0, 8, t("1. Monatliche Haushaltsrechnung"), 0, 1, 'L', True)
+    pdf.ln(4)
+
+    # EINNAHMEN
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(100, 6, t("Gesamteinnahmen (Netto):"))
+    pdf.set_text_color(0, 100, 0)
+    pdf.cell(30, 6, f"+ {pdf_eur(r.einnahmen)}", 0, 1, 'R')
+    
+    details_list = []
+    if e.gehalt_h > 0: details_list.append(f"Gehalt Haupt: {pdf_eur(e.gehalt_h)}")
+    if e.gehalt_p > 0: details_list.append(f"Gehalt Partner: {pdf_eur(e.gehalt_p)}")
+    if r.kindergeld > 0: details_list.append(f"Kindergeld: {pdf_eur(r.kindergeld)}")
+    
+    # Sozialleistungen markieren
+    if e.kinderzuschlag > 0: details_list.append(f"Kinderzuschlag*: {pdf_eur(e.kinderzuschlag)}")
+    if e.wohngeld > 0: details_list.append(f"Wohngeld*: {pdf_eur(e.wohngeld)}")
+    
+    if e.neben > 0: details_list.append(f"Nebeneinkunft: {pdf_eur(e.neben)}")
+    if e.sonst > 0: details_list.append(f"Sonstiges: {pdf_eur(e.sonst)}")
+    if r.miete_bestand_anrechenbar > 0: details_list.append(f"Miete Bestand: {pdf_eur(r.miete_bestand_anrechenbar)}")
+    if r.miete_neu_calc > 0: details_list.append(f"Miete Neu (Kalk.): {pdf_eur(r.miete_neu_calc)}")
+    
+    details_str = ", ".join(details_list)
+    pdf.set_font("Arial", "I", 8)
+    pdf.set_text_color(100, 100, 100)
+    pdf.multi_cell(0, 5, txt(f"(Zusammensetzung: {details_str})"))
+    
+    # HINWEIS SOZIALLEISTUNGEN IM PDF
+    if r.sozial_summe > 0:
+        pdf.ln(2)
+        pdf.set_text_color(180, 100, 0) # Dunkelorange
+        pdf.set_font("Arial", "B", 9)
+        warn_txt = f"* HINWEIS: In den Einnahmen sind {pdf_eur(r.sozial_summe)} Sozialleistungen (Wohngeld/Kinderzuschlag) enthalten. Diese werden von Banken oft NICHT als nachhaltiges Einkommen für den Kredit gewertet!"
+        pdf.multi_cell(0, 5, txt(warn_txt))
+    
+    pdf.ln(2)
+
+    # AUSGABEN
+    pdf.set_text_color(*col_text)
+    pdf.set_font("Arial", "B", 10)
+    pdf.cell(0, 6, t("Ausgaben (Detailliert):"), 0, 1)
+    
+    def row(label, val, note=""):
+        pdf.set_font("Arial", "", 10)
+        pdf.set_text_color(0, 0, 0)
+        pdf.cell(100, 6, t(label))
+        pdf.cell(30, 6, pdf_eur(val), 0, 0, 'R')
+        if note:
+            pdf.set_font("Arial", "I", 8)
+            pdf.set_text_color(100, 100, 100)
+            pdf.cell(60, 6, t(f"  ({note})"), 0, 0, 'L')
+        pdf.ln()
+
+    pdf.cell(100, 0, "", "T")
+    pdf.cell(30, 0, "", "T")
+    pdf.ln(2)
+
+    row("Lebenshaltung (Pauschale)", e.lebenshaltung, "Nahrung, Kleidung, Gesundheit")
+    row("Bewirtschaftung (Hauskosten)", e.bewirt, f"Heizung, Wasser ({e.wohnflaeche} qm)")
+    if r.belastung_alte_miete > 0: row("Aktuelle Kaltmiete", r.belastung_alte_miete, "Bleibt bestehen")
+    if e.rate_bestand > 0: row("Rate Bestandskredit", e.rate_bestand)
+    if e.bauspar > 0: row("Sparrate (Pflicht)", e.bauspar, "Tilgungsaussetzung")
+    if e.konsum > 0: row("Konsumkredite", e.konsum)
+    row("Puffer / Rücklagen", e.puffer)
+
+    pdf.ln(1)
+    pdf.set_font("Arial", "B", 10)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(100, 6, t("Summe Ausgaben:"))
+    pdf.set_text_color(180, 0, 0)
+    pdf.cell(30, 6, f"- {pdf_eur(r.ausgaben)}", 0, 1, 'R')
+
+    # ERGEBNIS HAUSHALT
+    pdf.ln(4)
+    pdf.set_fill_color(230, 240, 255)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(*col_header)
+    pdf.cell(120, 10, t("Verfügbarer Betrag (Freie Rate):"), 0, 0, 'L', True)
+    pdf.cell(70, 10, pdf_eur(r.frei), 0, 1, 'R', True)
+    pdf.ln(8)
+
+    # 2. VERGLEICH
+    if r.diff_miete is not None:
+         pdf.set_fill_color(*col_fill)
+         pdf.set_font("Arial", "B", 12)
+         pdf.set_text_color(*col_header)
+         pdf.cell(0, 8, t("2. Vergleich: Miete vs. Eigentum"), 0, 1, 'L', True)
+         pdf.ln(2)
+         
+         pdf.set_text_color(0,0,0)
+         pdf.set_font("Arial", "", 10)
+         pdf.cell(100, 6, t("Bisherige Warmmiete:"))
+         pdf.cell(30, 6, pdf_eur(e.akt_miete), 0, 1, 'R')
+         pdf.cell(100, 6, t("Neue Belastung (Rate + NK + Puffer):"))
+         pdf.cell(30, 6, pdf_eur(r.neu_last), 0, 1, 'R')
+         
+         diff = r.diff_miete
+         if diff > 0:
+             pdf.set_text_color(180, 0, 0)
+             pdf.set_font("Arial", "B", 10)
+             pdf.cell(0, 8, txt(f"-> Mehrbelastung: {pdf_eur(diff)}"), 0, 1)
+         else:
+             pdf.set_text_color(0, 100, 0)
+             pdf.set_font("Arial", "B", 10)
+             pdf.cell(0, 8, txt(f"-> Ersparnis: {pdf_eur(abs(diff))}"), 0, 1)
+         pdf.ln(5)
+
+    # 3. WUNSCH OBJEKT
+    next_section_num = 3
+    if e.wunsch_preis > 0:
+        pdf.set_fill_color(*col_fill)
+        pdf.set_font("Arial", "B", 12)
+        pdf.set_text_color(*col_header)
+        pdf.cell(0, 8, t(f"{next_section_num}. Finanzierungsplan Wunsch-Objekt"), 0, 1, 'L', True)
+        pdf.ln(2)
+        next_section_num += 1
+        
+        pdf.set_text_color(0,0,0)
+        pdf.set_font("Arial", "", 10)
+        
+        pdf.cell(100, 6, t("Kaufpreis:"))
+        pdf.cell(30, 6, pdf_eur(e.wunsch_preis), 0, 1, 'R')
+        pdf.cell(100, 6, txt(f"Kaufnebenkosten ({r.nk_prozent_gesamt:.2f} %):"))
+        pdf.cell(30, 6, f"+ {pdf_eur(r.wunsch_nk_euro)}", 0, 1, 'R')
+        
+        if e.renovierung > 0:
+            pdf.cell(100, 6, t("Modernisierung / Renovierung:"))
+            pdf.cell(30, 6, f"+ {pdf_eur(e.renovierung)}", 0, 1, 'R')
+            
+        pdf.set_font("Arial", "B", 10)
+        pdf.cell(100, 6, t("Gesamtkosten (Investition):"), "T")
+        pdf.cell(30, 6, f"= {pdf_eur(r.wunsch_invest)}", "T", 1, 'R')
+        pdf.set_font("Arial", "", 10)
+        pdf.cell(100, 6, t("Eigenkapital:"))
+        pdf.cell(30, 6, f"- {pdf_eur(e.ek)}", 0, 1, 'R')
+        
+        pdf.set_font("Arial", "B", 11)
+        pdf.set_fill_color(220, 220, 220)
+        pdf.cell(100, 8, t("Zu finanzierendes Darlehen:"), 0, 0, 'L', True)
+        pdf.cell(30, 8, pdf_eur(r.wunsch_darlehen), 0, 1, 'R', True)
+        
+        pdf.ln(4)
+        
+        pdf.set_font("Arial", "", 11)
+        pdf.cell(120, 8, txt(f"Notwendige Rate ({e.zins}% Zins + {e.tilgung}% Tilgung):"), 0)
+        pdf.cell(70, 8, pdf_eur(r.wunsch_rate), 0, 1, 'R')
+        
+        pdf.ln(2)
+        diff_wunsch = r.wunsch_rate - r.frei
+        
+        if r.machbar:
+            pdf.set_fill_color(200, 255, 200)
+            pdf.set_text_color(0, 100, 0)
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 10, t("Ergebnis: MACHBAR (Im Budget)"), 1, 1, 'C', True)
+        else:
+            pdf.set_fill_color(255, 200, 200)
+            pdf.set_text_color(180, 0, 0)
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 10, txt(f"Ergebnis: ÜBERSTEIGT BUDGET (Fehlt: {pdf_eur(diff_wunsch)})"), 1, 1, 'C', True)
+        
+        pdf.ln(5)
+
+    # 4. MAXIMALER PREIS
+    pdf.set_fill_color(*col_fill)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(*col_header)
+    
+    titel_max = f"{next_section_num}. Maximaler Kaufpreis (Kalkulation)"
+    if e.wunsch_preis > 0:
+        titel_max = f"{next_section_num}. Dein maximal mögliches Budget (Theoretisch)"
+        
+    pdf.cell(0, 8, t(titel_max), 0, 1, 'L', True)
+    pdf.ln(2)
+    
+    pdf.set_text_color(0,0,0)
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(120, 10, t("Max. Kaufpreis der Immobilie:"), 1)
+    pdf.cell(70, 10, pdf_eur(r.max_preis), 1, 1, 'R')
+    pdf.cell(120, 8, t("dazu Kaufnebenkosten:"), 1)
+    pdf.cell(70, 8, f"+ {pdf_eur(r.max_nk_euro)}", 1, 1, 'R')
+    pdf.cell(120, 8, t("abzüglich Eigenkapital:"), 1)
+    pdf.cell(70, 8, f"- {pdf_eur(e.ek)}", 1, 1, 'R')
+    
+    pdf.set_font("Arial", "B", 11)
+    pdf.set_fill_color(220, 220, 220)
+    pdf.cell(120, 10, t("Notwendiges Bankdarlehen:"), 1, 0, 'L', True)
+    pdf.cell(70, 10, pdf_eur(r.max_kredit), 1, 1, 'R', True)
+
+    pdf.ln(10)
+    pdf.set_text_color(100, 100, 100)
+    pdf.set_font("Arial", "I", 8)
+    pdf.multi_cell(0, 5, t("Hinweis: Dies ist eine unverbindliche Modellrechnung."))
+
+# ==========================================
+# 📉 ANHANG: TILGUNGSPLAN (Monat für Monat)
+# ==========================================
+
+def tilgungsplan_anhang(pdf, zeilen, zinsbindung_monate=None):
+    """Schreibt die Zeilen aus ``tilgung.monatszeilen`` als Tabelle über beliebig viele Seiten.
+
+    Jede Zeile geht direkt ins PDF, die Liste wird nie aufgebaut. Umbrüche
+    macht der Auto-Page-Break; den Tabellenkopf bringt ``PDF.kopfzeile`` mit.
+    """
+    v = pdf.vorlage
+
+    def kopf():
+        pdf.set_font("Arial", "B", 9)
+        pdf.set_fill_color(220, 220, 220)
+        pdf.set_text_color(0, 0, 0)
+        for name, breite in v.anhang_spalten:
+            pdf.cell(breite, 6, name, 1, 0, 'C', True)
+        pdf.ln()
+
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.set_text_color(44, 62, 80)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, v.t("Anhang: Tilgungsplan (Beträge in EUR)"), ln=True)
+    kopf()
+    pdf.kopfzeile = kopf
+
+    summe_zinsen = summe_tilgung = summe_sonder = 0.0
+    pdf.set_font("Arial", "", 8)
+    pdf.set_fill_color(255, 240, 200)
+    try:
+        for monat, rate, zinsen, tilgung, sonder, rest in zeilen:
+            summe_zinsen += zinsen
+            summe_tilgung += tilgung
+            summe_sonder += sonder
+            # Letzter Monat der Zinsbindung farbig
+            fill = monat == zinsbindung_monate
+            pdf.cell(16, 5, str(monat), 1, 0, 'R', fill)
+            pdf.cell(14, 5, str((monat - 1) // 12 + 1), 1, 0, 'R', fill)
+            pdf.cell(30, 5, zahl_de(rate), 1, 0, 'R', fill)
+            pdf.cell(30, 5, zahl_de(zinsen), 1, 0, 'R', fill)
+            pdf.cell(30, 5, zahl_de(tilgung), 1, 0, 'R', fill)
+            pdf.cell(30, 5, zahl_de(sonder) if sonder else "", 1, 0, 'R', fill)
+            pdf.cell(40, 5, zahl_de(rest), 1, 1, 'R', fill)
+    finally:
+        pdf.kopfzeile = None
+
+    pdf.set_font("Arial", "B", 8)
+    pdf.cell(60, 6, v.t("Summe"), 1, 0, 'L')
+    pdf.cell(30, 6, zahl_de(summe_zinsen), 1, 0, 'R')
+    pdf.cell(30, 6, zahl_de(summe_tilgung), 1, 0, 'R')
+    pdf.cell(30, 6, zahl_de(summe_sonder), 1, 0, 'R')
+    pdf.cell(40, 6, "", 1, 1)
+    if zinsbindung_monate:
+        pdf.ln(2)
+        pdf.set_font("Arial", "I", 8)
+        pdf.set_text_color(100, 100, 100)
+        pdf.multi_cell(0, 4, txt(f"Markiert: Ende der Zinsbindung (Monat {zinsbindung_monate}). "
+                                 "Danach gleicher Zins und gleiche Rate angenommen; keine Prognose."))
+
+def wunsch_plan_zeilen(e, r, max_jahre=50):
+    """Monatszeilen (Generator) zum Darlehen des Wunsch-Objekts, Sondertilgung während der Zinsbindung."""
+    from tilgung import monatszeilen
+    return monatszeilen(r.wunsch_darlehen, e.zins, e.tilgung,
+                        {j: e.sondertilgung for j in range(1, e.zinsbindung + 1)}, max_jahre)
+
+def create_pdf(e, r, anhang=None, vorlage=None):
+    """``anhang``: optional Zeilen (Iterable) für den Tilgungsplan-Anhang.
+
+    ``vorlage``: geteilte ``Vorlage``; ohne wird sie für dieses Dokument neu gebaut.
+    """
+    pdf = PDF(vorlage)
+    zertifikat_seite(pdf, e, r)
+    if anhang is not None:
+        tilgungsplan_anhang(pdf, anhang, e.zinsbindung * 12)
+    return pdf.output(dest='S').encode('latin-1')
+
+def render_pdf(e, mit_tilgungsplan=False, vorlage=None):
+    r = berechne(e)
+    anhang = wunsch_plan_zeilen(e, r) if mit_tilgungsplan and r.wunsch_darlehen > 0 else None
+    return create_pdf(e, r, anhang, vorlage)
+
+# ==========================================
+# ⚖️ SZENARIO-VERGLEICH (ein PDF, mehrere Abschnitte)
+# ==========================================
+NUTZUNG_KURZ = {OPTIONS_NUTZUNG[0]: "Eigenheim", OPTIONS_NUTZUNG[1]: "Eigenh.+Verm.", OPTIONS_NUTZUNG[2]: "Kapitalanlage"}
+
+def create_vergleich_pdf(szenarien, vorlage=None):
+    """``szenarien``: Liste von (Titel, Eingaben, Ergebnis). Übersicht + ein Zertifikat je Szenario."""
+    pdf = PDF(vorlage)
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=True, margin=15)
+
+    pdf.set_text_color(44, 62, 80)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, txt(f"Szenario-Vergleich ({len(szenarien)} Varianten)"), ln=True)
+    pdf.ln(2)
+
+    spalten = pdf.vorlage.vergleich_spalten
+    pdf.set_fill_color(220, 220, 220)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_font("Arial", "B", 9)
+    for titel, breite, ausr in spalten:
+        pdf.cell(breite, 7, titel, 1, 0, ausr, True)
+    pdf.ln()
+
+    pdf.set_font("Arial", "", 9)
+    for i, (titel, e, r) in enumerate(szenarien, 1):
+        if r.frei < 0:
+            ergebnis = "Unterdeckung"
+        elif e.wunsch_preis > 0:
+            ergebnis = "MACHBAR" if r.machbar else "ZU TEUER"
+        else:
+            ergebnis = "-"
+        werte = (f"{i}. {titel}"[:34], NUTZUNG_KURZ.get(e.nutzung, e.nutzung), pdf_eur(r.frei),
+                 pdf_eur(r.max_preis), pdf_eur(r.wunsch_rate) if e.wunsch_preis > 0 else "-", ergebnis)
+        for (_, breite, ausr), wert in zip(spalten, werte):
+            pdf.cell(breite, 7, txt(wert), 1, 0, ausr)
+        pdf.ln()
+
+    pdf.ln(4)
+    pdf.set_text_color(100, 100, 100)
+    pdf.set_font("Arial", "I", 8)
+    pdf.multi_cell(0, 5, pdf.vorlage.t("Details zu jedem Szenario auf den folgenden Seiten. Unverbindliche Modellrechnung."))
+
+    for i, (titel, e, r) in enumerate(szenarien, 1):
+        zertifikat_seite(pdf, e, r, ueberschrift=f"Szenario {i}: {titel}")
+    return pdf.output(dest='S').encode('latin-1')
+
+def render_vergleich_pdf(szenarien, vorlage=None):
+    """``szenarien``: Liste von (Titel, Eingaben); rechnet alle in einem Batch-Durchlauf."""
+    from batch_engine import berechne_viele
+    ergebnisse = berechne_viele([e for _, e in szenarien])
+    return create_vergleich_pdf([(titel, e, r) for (titel, e), r in zip(szenarien, ergebnisse)], vorlage)